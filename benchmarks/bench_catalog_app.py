@@ -0,0 +1,125 @@
+"""
+Scale benchmark for the catalog apps on synthetic catalogs.
+
+For each scale this measures building the grid DataFrame and the compact
+store, building the grid options, the serialized payload of the full frame
+versus one page, peak Python memory while building, and cold/warm rerun
+latency of the app script under Streamlit's headless ``AppTest``.
+
+Usage:
+    python benchmarks/bench_catalog_app.py --skus 1000 10000 --output bench.json
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+import simple_calculator_exl
+from simple_calculator_exl import catalog, image_carousel, image_carousel2
+from simple_calculator_exl.cache import catalog_cache
+from simple_calculator_exl.catalog_store import CatalogStore
+from simple_calculator_exl.synthetic import generate_catalog
+
+APPS = {"image_carousel": image_carousel, "image_carousel2": image_carousel2}
+
+
+def timed(function, *args, **kwargs):
+    started = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def build_grid_frame(columns):
+    df = pd.DataFrame(columns)
+    df["Images"] = df["Images"].apply(json.dumps)
+    return df
+
+
+def measure(app, columns, reruns, page_size):
+    tracemalloc.start()
+    frame, frame_seconds = timed(build_grid_frame, columns)
+    _, frame_peak = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    store, store_seconds = timed(CatalogStore.from_columns, columns)
+    _, store_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    options, options_seconds = timed(app.build_grid_options, frame, page_size)
+    page = store.encode_block(store.frame.head(page_size))
+
+    # Point the app at the synthetic catalog and start from a cold cache.
+    catalog_cache.clear()
+    original = catalog.load_catalog_store
+    catalog.load_catalog_store = lambda: CatalogStore.from_columns(columns)
+    try:
+        at, cold = timed(AppTest.from_file(app.__file__).run, timeout=600)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        warm = [timed(at.run, timeout=600)[1] for _ in range(max(1, reruns))]
+    finally:
+        catalog.load_catalog_store = original
+
+    return {
+        "rows": len(frame),
+        "frame_build_seconds": frame_seconds,
+        "store_build_seconds": store_seconds,
+        "grid_options_seconds": options_seconds,
+        "full_payload_bytes": len(frame.to_json(orient="records")),
+        "page_payload_bytes": len(page.to_json(orient="records")),
+        "grid_options_bytes": len(json.dumps(options, default=str)),
+        "frame_peak_memory_bytes": frame_peak,
+        "store_peak_memory_bytes": store_peak,
+        "cold_run_seconds": cold,
+        "warm_rerun_seconds": statistics.median(warm),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--attributes", type=int, default=3)
+    parser.add_argument("--images", type=int, default=3)
+    parser.add_argument("--reruns", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=12)
+    parser.add_argument("--app", choices=sorted(APPS), default="image_carousel")
+    parser.add_argument("--output", type=Path, default=Path("bench_results.json"))
+    args = parser.parse_args()
+
+    results = []
+    for skus in args.skus:
+        columns = generate_catalog(skus, args.attributes, args.images)
+        result = measure(APPS[args.app], columns, args.reruns, args.page_size)
+        result.update(skus=skus, attributes=args.attributes, images=args.images)
+        results.append(result)
+        print(
+            f"{skus:>8} SKUs  {result['rows']:>8} rows"
+            f"  frame {result['frame_build_seconds']:.3f}s"
+            f"  options {result['grid_options_seconds']:.3f}s"
+            f"  payload {result['full_payload_bytes']:,}B -> "
+            f"{result['page_payload_bytes']:,}B"
+            f"  rerun {result['warm_rerun_seconds']:.3f}s"
+        )
+
+    args.output.write_text(
+        json.dumps(
+            {
+                "app": args.app,
+                "version": simple_calculator_exl.__version__,
+                "python": platform.python_version(),
+                "results": results,
+            },
+            indent=2,
+        )
+    )
+    print(f"results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
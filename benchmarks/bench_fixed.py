@@ -0,0 +1,90 @@
+"""
+Throughput of exact fixed-point sums against ``Decimal`` and float.
+
+Sums the same amounts (two decimal places) from strings, as ``Decimal``
+values, as floats and as pre-scaled ``int64`` cents, and checks that the
+exact paths agree with ``Decimal``. Element-wise sums are timed from strings
+(parsing included) and from parsed values, and ``add_many_exact`` both as
+returned (sums kept as cents) and converted to ``Decimal``.
+
+Usage:
+    python benchmarks/bench_fixed.py --values 1000000
+"""
+
+import argparse
+import math
+import random
+import time
+from decimal import Decimal
+
+import numpy as np
+
+from simple_calculator_exl import add_many, add_many_exact, sum_exact
+from simple_calculator_exl.fixed import add_units, sum_units
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--values", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    cents = [rng.randint(-10_000_000, 10_000_000) for _ in range(args.values)]
+    texts = [f"{'-' if c < 0 else ''}{abs(c) // 100}.{abs(c) % 100:02d}" for c in cents]
+    decimals = [Decimal(t) for t in texts]
+    floats = [float(t) for t in texts]
+    units = np.array(cents, dtype=np.int64)
+
+    expected, decimal_seconds = timed(sum, decimals, Decimal(0))
+    runs = {
+        "Decimal sum": (expected, decimal_seconds),
+        "Decimal(str) sum": timed(lambda: sum(map(Decimal, texts), Decimal(0))),
+        "float sum": timed(sum, floats),
+        "math.fsum": timed(math.fsum, floats),
+        "sum_exact(str)": timed(sum_exact, texts),
+        "sum_exact(Decimal)": timed(sum_exact, decimals),
+        "sum_units(int64)": timed(sum_units, units),
+    }
+
+    print(f"values: {args.values:,}")
+    for name, (total, seconds) in runs.items():
+        if isinstance(total, int):
+            total = Decimal(total).scaleb(-2)
+        exact = "exact" if Decimal(str(total)) == expected else "inexact"
+        print(
+            f"{name:<22} {args.values / seconds:>14,.0f} values/s"
+            f"  {seconds:8.4f}s  {exact}"
+        )
+
+    half = args.values // 2
+    left, right = texts[:half], texts[half:]
+    pairs = {
+        "Decimal(str) +": timed(
+            lambda: [Decimal(x) + Decimal(y) for x, y in zip(left, right)]
+        ),
+        "add_many_exact(str)": timed(add_many_exact, left, right),
+        "... .tolist()": timed(lambda: add_many_exact(left, right).tolist()),
+        "Decimal +": timed(
+            lambda: [x + y for x, y in zip(decimals[:half], decimals[half:])]
+        ),
+        "add_many(float)": timed(add_many, floats[:half], floats[half:]),
+        "add_units(int64)": timed(add_units, units[:half], units[half:]),
+    }
+    expected = pairs["Decimal(str) +"][0]
+    print(f"\nelement-wise pairs: {half:,}")
+    for name, (result, seconds) in pairs.items():
+        exact = ""
+        if name.startswith(("add_many_exact", "...")):
+            exact = "  exact" if result == expected else "  inexact"
+        print(f"{name:<22} {half / seconds:>14,.0f} pairs/s  {seconds:8.4f}s{exact}")
+
+
+if __name__ == "__main__":
+    main()
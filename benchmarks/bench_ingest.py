@@ -0,0 +1,63 @@
+"""
+Catalog start-up: ingesting a raw export against opening its snapshot.
+
+Writes a synthetic export in each format, ingests it chunk by chunk into a
+snapshot, and times opening that snapshot the way the app does at start-up.
+
+Usage:
+    python benchmarks/bench_ingest.py --skus 100000 --formats csv parquet jsonl
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from simple_calculator_exl.catalog_store import CatalogStore
+from simple_calculator_exl.ingest import FORMATS, ingest_catalog
+from simple_calculator_exl.synthetic import generate_catalog
+
+
+def write_export(frame, path, fmt):
+    if fmt == "csv":
+        frame.assign(Images=frame["Images"].map("|".join)).to_csv(path, index=False)
+    elif fmt == "parquet":
+        frame.to_parquet(path, index=False)
+    else:
+        frame.to_json(path, orient="records", lines=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    frame = pd.DataFrame(generate_catalog(args.skus))
+    with tempfile.TemporaryDirectory() as scratch:
+        for fmt in args.formats:
+            export = Path(scratch) / f"export.{fmt}"
+            snapshot = Path(scratch) / f"snapshot-{fmt}"
+            write_export(frame, export, fmt)
+
+            started = time.perf_counter()
+            store = ingest_catalog(export, fmt, args.chunk_size, snapshot)
+            ingest_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            CatalogStore.open(snapshot)
+            open_seconds = time.perf_counter() - started
+
+            megabytes = export.stat().st_size / 1e6
+            print(
+                f"{fmt:<8} {megabytes:8.1f} MB  {len(store):>10,} rows"
+                f"  ingest {ingest_seconds:7.2f}s"
+                f" ({len(store) / ingest_seconds:>9,.0f} rows/s)"
+                f"  open snapshot {open_seconds * 1000:7.1f} ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
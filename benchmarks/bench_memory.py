@@ -0,0 +1,40 @@
+"""
+Memory footprint of the compact catalog store versus the grid DataFrame.
+
+Usage:
+    python benchmarks/bench_memory.py --skus 100000
+"""
+
+import argparse
+import json
+
+import pandas as pd
+
+from simple_calculator_exl.catalog_store import CatalogStore, memory_report
+from simple_calculator_exl.synthetic import generate_catalog
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--attributes", type=int, default=3)
+    parser.add_argument("--images", type=int, default=3)
+    args = parser.parse_args()
+
+    columns = generate_catalog(args.skus, args.attributes, args.images)
+    # Today's layout: object columns and one JSON string of images per row.
+    legacy = pd.DataFrame(columns)
+    legacy["Images"] = legacy["Images"].map(json.dumps)
+    legacy = legacy.astype({name: object for name in legacy if name != "Scoring"})
+    report = memory_report(CatalogStore.from_columns(columns), legacy)
+
+    print(f"rows: {len(legacy)}")
+    print(f"{'column':<20}{'legacy':>14}{'compact':>14}")
+    for name, (before, after) in report["columns"].items():
+        print(f"{name:<20}{before:>14,}{after:>14,}")
+    print(f"{'total':<20}{report['legacy_bytes']:>14,}{report['compact_bytes']:>14,}")
+    print(f"ratio: {report['ratio']:.2%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Running totals under corrections: ``RunningSum`` against re-summation.
+
+Builds a series, then applies random point corrections, each followed by a
+random range query. The naive side recomputes the range with ``core.add``
+(and with the builtin ``sum``) after every correction; ``RunningSum``
+updates its tree in O(log n). Both sides are checked to agree.
+
+Usage:
+    python benchmarks/bench_running.py --sizes 1000 100000 1000000 --updates 2000
+"""
+
+import argparse
+import random
+import time
+from functools import reduce
+
+import numpy as np
+
+from simple_calculator_exl import RunningSum, add
+
+
+def timed(function, *args):
+    started = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - started
+
+
+def naive_add(values, operations):
+    results = []
+    for index, value, start, stop in operations:
+        values[index] = value
+        results.append(reduce(add, values[start:stop], 0))
+    return results
+
+
+def naive_sum(values, operations):
+    results = []
+    for index, value, start, stop in operations:
+        values[index] = value
+        results.append(sum(values[start:stop]))
+    return results
+
+
+def fenwick(sums, operations):
+    results = []
+    for index, value, start, stop in operations:
+        sums[index] = value
+        results.append(sums.range_sum(start, stop))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--updates", type=int, default=2_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    for size in args.sizes:
+        values = [rng.randint(-10_000, 10_000) for _ in range(size)]
+        operations = []
+        for _ in range(args.updates):
+            start, stop = sorted(rng.randrange(size + 1) for _ in range(2))
+            operations.append(
+                (rng.randrange(size), rng.randint(-10_000, 10_000), start, stop)
+            )
+
+        packed = np.array(values, dtype=np.int64)
+        sums, build_seconds = timed(RunningSum, packed)
+        _, list_build_seconds = timed(RunningSum, values, "q")
+        expected, add_seconds = timed(naive_add, list(values), operations)
+        summed, sum_seconds = timed(naive_sum, list(values), operations)
+        got, fenwick_seconds = timed(fenwick, sums, operations)
+        assert got == expected == summed
+
+        print(f"size: {size:,}  updates: {args.updates:,}")
+        print(f"  build from int64 array  {build_seconds:10.4f}s")
+        print(f"  build from list         {list_build_seconds:10.4f}s")
+        for name, seconds in (
+            ("re-sum with core.add", add_seconds),
+            ("re-sum with sum()", sum_seconds),
+            ("RunningSum", fenwick_seconds),
+        ):
+            print(
+                f"  {name:<22} {args.updates / seconds:>12,.0f} updates/s"
+                f"  {seconds:10.4f}s"
+            )
+
+
+if __name__ == "__main__":
+    main()
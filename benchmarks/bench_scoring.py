@@ -0,0 +1,67 @@
+"""
+Throughput benchmark for ``simple_calculator_exl.scoring``.
+
+Usage:
+    python benchmarks/bench_scoring.py --rows 200000 --workers 4
+"""
+
+import argparse
+import random
+import time
+
+import pandas as pd
+
+from simple_calculator_exl.catalog import CATALOG
+from simple_calculator_exl.scoring import SimilarityScorer, score_frame, tokenize
+
+# Vocabulary of the sample catalog, so synthetic texts look like real ones.
+WORDS = sorted(
+    {
+        token
+        for text in CATALOG["STIBO_Data"] + CATALOG["Recommended_Value"]
+        for token in tokenize(text)
+    }
+)
+
+
+def synthetic_frame(rows, seed=0):
+    rng = random.Random(seed)
+
+    def text():
+        return " ".join(rng.choices(WORDS, k=rng.randint(3, 12)))
+
+    return pd.DataFrame(
+        {
+            "STIBO_Data": [text() for _ in range(rows)],
+            "Recommended_Value": [text() for _ in range(rows)],
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--chunk-size", type=int, default=20_000)
+    args = parser.parse_args()
+
+    df = synthetic_frame(args.rows)
+    started = time.perf_counter()
+    scorer = SimilarityScorer(max_cached=2 * args.rows).fit(
+        pd.concat([df["STIBO_Data"], df["Recommended_Value"]])
+    )
+    fitted = time.perf_counter()
+    score_frame(df, scorer=scorer, chunk_size=args.chunk_size, workers=args.workers)
+    scored = time.perf_counter()
+    score_frame(df, scorer=scorer, chunk_size=args.chunk_size, workers=args.workers)
+    rescored = time.perf_counter()
+
+    print(f"rows:            {args.rows}")
+    print(f"workers:         {args.workers}")
+    print(f"fit:             {fitted - started:.3f}s")
+    print(f"score (cold):    {args.rows / (scored - fitted):,.0f} rows/s")
+    print(f"rescore (warm):  {args.rows / (rescored - scored):,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Quick-filter search: the word index against scanning the text columns.
+
+Builds a ``QuickFilterIndex`` over a synthetic catalog and times prefix
+queries against the case-insensitive column scan the row model falls back to
+without an index.
+
+Usage:
+    python benchmarks/bench_search.py --skus 334000 --queries lamp "eco bott" "nyx conc"
+"""
+
+import argparse
+import time
+
+from simple_calculator_exl.catalog_store import CatalogStore
+from simple_calculator_exl.row_model import ServerSideRowModel
+from simple_calculator_exl.search import QuickFilterIndex
+from simple_calculator_exl.synthetic import generate_catalog
+
+
+def timed(function, *args, repeat=1):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = function(*args)
+    return result, (time.perf_counter() - started) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skus", type=int, default=334_000)
+    parser.add_argument(
+        "--queries", nargs="+", default=["lamp", "eco bott", "nyx conc", "compact"]
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = CatalogStore.from_columns(generate_catalog(args.skus)).frame
+    index, build_seconds = timed(QuickFilterIndex, frame)
+    print(f"rows: {len(frame):,}  index build: {build_seconds:.2f}s")
+
+    scan = ServerSideRowModel(frame, max_cached_views=0)
+    for query in args.queries:
+        rows, index_seconds = timed(index.search, query, repeat=args.repeat)
+        skus, sku_seconds = timed(index.search_skus, query, repeat=args.repeat)
+        scanned, scan_seconds = timed(scan.row_count, None, query)
+        print(
+            f"{query!r:<14} {len(rows):>9,} rows {len(skus):>8,} SKUs"
+            f"  index {index_seconds * 1000:7.2f} ms"
+            f"  by SKU {sku_seconds * 1000:7.2f} ms"
+            f"  scan {scan_seconds * 1000:9.1f} ms ({scanned:,} rows)"
+        )
+
+
+if __name__ == "__main__":
+    main()
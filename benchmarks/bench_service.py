@@ -0,0 +1,72 @@
+"""
+Load test for the local calculation service.
+
+Starts the service in-process (or targets a running one with ``--port`` /
+``--unix-socket``) and reports p50/p99 latency and throughput for scalar
+``add``, scalar ``evaluate`` and batch ``add_many`` requests.
+
+Usage:
+    python benchmarks/bench_service.py --requests 50000 --connections 8
+"""
+
+import argparse
+import asyncio
+
+from simple_calculator_exl.service import CalcService, load_test
+
+WORKLOADS = {
+    "add": lambda n: ("add", {"a": n, "b": 0.5}),
+    "evaluate": lambda n: (
+        "evaluate",
+        {
+            "expression": "price * qty - discount",
+            "bindings": {"price": n % 100, "qty": 3, "discount": 1.5},
+        },
+    ),
+    "add_many": lambda n: ("add_many", {"a": list(range(64)), "b": n}),
+}
+
+
+async def run(args):
+    service = None
+    port = args.port
+    if port is None and args.unix_socket is None:
+        service = CalcService(window=args.window)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+
+    print(f"{'workload':<10} {'req/s':>12} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name in args.workloads:
+        stats = await load_test(
+            port=port,
+            path=args.unix_socket,
+            connections=args.connections,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            make_request=WORKLOADS[name],
+        )
+        print(
+            f"{name:<10} {stats['throughput']:>12,.0f} {stats['p50_ms']:>9.3f}"
+            f" {stats['p99_ms']:>9.3f} {stats['errors']:>7}"
+        )
+    if service is not None:
+        print(f"coalesced batches: {service.coalescer.batches:,}")
+        await service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--connections", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--window", type=float, default=0.002)
+    parser.add_argument("--port", type=int, help="target a running service")
+    parser.add_argument("--unix-socket", help="target a running service")
+    parser.add_argument(
+        "--workloads", nargs="+", choices=sorted(WORKLOADS), default=sorted(WORKLOADS)
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,27 @@
 """
 simplemath package
 
-Expose a tiny add function for demonstration.
+Expose a tiny add function for demonstration, plus batch and streaming variants,
+an arithmetic expression engine, exact fixed-point addition and running
+totals with O(log n) updates.
 """
 
-from .core import add
+from .core import add, add_many
+from .expression import ExpressionError, compile_expression, evaluate
+from .fixed import add_exact, add_many_exact, sum_exact
+from .running import RunningSum
+from .stream import sum_stream
 
-__all__ = ["add"]
+__all__ = [
+    "ExpressionError",
+    "RunningSum",
+    "add",
+    "add_exact",
+    "add_many",
+    "add_many_exact",
+    "compile_expression",
+    "evaluate",
+    "sum_exact",
+    "sum_stream",
+]
 __version__ = "0.0.1"
@@ -0,0 +1,183 @@
+"""
+Versioned static assets for the catalog grid.
+
+The image slider renderer and its styles live as plain files in the
+package's ``assets`` folder. Their URLs carry a hash of the content,
+``<name>?v=<version>``, so a browser keeps its cached copy until a file
+changes and then gets a new URL instead of a stale copy.
+
+By default Streamlit serves the folder itself, as the files of a custom
+component, under the app's own origin and base path, so the URLs hold under
+HTTPS and behind a proxy. Set ``CATALOG_ASSET_URL`` to load them from a CDN
+or reverse proxy that publishes the folder under that URL instead.
+
+Streamlit's serving only allows heuristic caching. For year-long
+``immutable`` cache headers, opt in to a small built-in server by setting
+``CATALOG_ASSET_PORT``; it listens on ``CATALOG_ASSET_HOST`` (``127.0.0.1``
+by default), normally behind a proxy named in ``CATALOG_ASSET_URL``. If the
+port is taken the app falls back to Streamlit's serving rather than trust
+whatever holds it.
+"""
+
+import hashlib
+import mimetypes
+import os
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ASSET_DIR = Path(__file__).parent / "assets"
+ASSET_URL_ENV = "CATALOG_ASSET_URL"
+ASSET_PORT_ENV = "CATALOG_ASSET_PORT"
+ASSET_HOST_ENV = "CATALOG_ASSET_HOST"
+DEFAULT_HOST = "127.0.0.1"
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Streamlit names a component after the declaring module.
+COMPONENT_NAME = f"{__name__}.files"
+
+_VERSION = None
+_SERVER = None
+_SERVER_FAILED = False
+_SERVER_LOCK = threading.Lock()
+
+
+def asset_version():
+    """Return the content hash every asset URL is versioned with."""
+    global _VERSION
+    if _VERSION is None:
+        digest = hashlib.sha256()
+        for path in sorted(ASSET_DIR.iterdir()):
+            if path.is_file():
+                digest.update(path.name.encode())
+                digest.update(path.read_bytes())
+        _VERSION = digest.hexdigest()[:12]
+    return _VERSION
+
+
+def asset_base_url():
+    """
+    Return the URL the assets folder is served under, ending in ``/``.
+
+    ``CATALOG_ASSET_URL`` when set, else the built-in server when this
+    process runs one, else Streamlit's component route as an absolute path
+    below the app's ``server.baseUrlPath``.
+    """
+    base = os.environ.get(ASSET_URL_ENV)
+    if base is None and _SERVER is not None:
+        base = _SERVER.url
+    if base is None:
+        from streamlit import config
+
+        prefix = config.get_option("server.baseUrlPath").strip("/")
+        base = f"/{prefix}/" if prefix else "/"
+        base += f"component/{COMPONENT_NAME}/"
+    return base if base.endswith("/") else base + "/"
+
+
+def asset_url(name):
+    """
+    Return the versioned URL of an asset file.
+
+    Args:
+        name (str): file name in the assets folder, e.g. ``"image_slider.js"``
+
+    Returns:
+        str: URL of the file, changing whenever any asset changes
+    """
+    return f"{asset_base_url()}{name}?v={asset_version()}"
+
+
+class _AssetHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self._send(body=True)
+
+    def do_HEAD(self):
+        self._send(body=False)
+
+    def _send(self, body):
+        name = self.path.split("?", 1)[0].lstrip("/")
+        path = ASSET_DIR / name
+        if not name or "/" in name or name.startswith(".") or not path.is_file():
+            self.send_error(404)
+            return
+        etag = f'"{asset_version()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", CACHE_CONTROL)
+            self.end_headers()
+            return
+        data = path.read_bytes()
+        content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+        self.send_response(200)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("Cache-Control", CACHE_CONTROL)
+        self.send_header("ETag", etag)
+        self.send_header("Last-Modified", formatdate(path.stat().st_mtime, usegmt=True))
+        self.end_headers()
+        if body:
+            self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class AssetServer:
+    """
+    Serve the assets folder from a background thread.
+
+    Args:
+        host (str): interface to bind
+        port (int): port to listen on; 0 picks a free one
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=0):
+        self._server = ThreadingHTTPServer((host, port), _AssetHandler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        # A wildcard bind has no address to link to; use loopback.
+        address = DEFAULT_HOST if host in ("", "0.0.0.0") else host
+        self.url = f"http://{address}:{self.port}/"
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="catalog-assets", daemon=True
+        )
+        self._thread.start()
+
+    def close(self):
+        """Stop serving and release the port."""
+        self._server.shutdown()
+        self._server.server_close()
+
+
+def serve_assets():
+    """
+    Make sure the asset files are being served; call it on every app run.
+
+    Registers the folder with Streamlit, which serves it unless
+    ``CATALOG_ASSET_URL`` points elsewhere, and starts the built-in server
+    once per process when ``CATALOG_ASSET_PORT`` is set. A taken port is not
+    assumed to be another app process's server: this process then keeps
+    using Streamlit's serving.
+
+    Returns:
+        AssetServer|None: the server started by this process, if any
+    """
+    global _SERVER, _SERVER_FAILED
+    from streamlit.components.v1 import declare_component
+
+    # Registering is a dictionary update; the registry belongs to the
+    # running Streamlit server, so it is repeated rather than cached.
+    declare_component("files", path=ASSET_DIR)
+    port = os.environ.get(ASSET_PORT_ENV)
+    if not port:
+        return None
+    with _SERVER_LOCK:
+        if _SERVER is None and not _SERVER_FAILED:
+            host = os.environ.get(ASSET_HOST_ENV, DEFAULT_HOST)
+            try:
+                _SERVER = AssetServer(host, int(port))
+            except OSError:
+                _SERVER_FAILED = True
+        return _SERVER
@@ -0,0 +1,220 @@
+/*
+ * Image slider cell renderer shared by the catalog apps.
+ *
+ * Loaded once per page by the small loader in renderers.py and cached by the
+ * browser under a versioned URL. Cell values are the grid's JSON image
+ * lists; entries are plain URLs or {thumb, src} pairs from the thumbnail
+ * cache. Renderer params:
+ *   variant      "classic" or "portrait" (see image_slider.css)
+ *   fade         fade between images; off for the fixed-height "fast" mode
+ *   prefetch     neighbours on each side to fetch ahead; 0 turns it off
+ *   concurrency  prefetches in flight at once, per grid
+ *   cacheSize    decoded images kept per grid, shared by all its cells
+ *
+ * Each cell uses one delegated click listener, lazy-loads its image, reuses
+ * its DOM through refresh() when AG Grid recycles the row and releases
+ * everything in destroy(). An image is decoded before it is swapped in, so
+ * navigation never shows a half-loaded picture; its neighbours are
+ * prefetched when the pointer enters the cell and after every move.
+ */
+(function () {
+    // Fetches and decodes images for one grid. Images a cell is about to
+    // show start at once; prefetches wait in a queue, newest first, while
+    // `concurrency` of them are in flight. Decoded images are kept in a
+    // least-recently-used map so cells showing the same URL share them.
+    class ImagePreloader {
+        constructor(concurrency, cacheSize) {
+            this.concurrency = Math.max(1, concurrency);
+            this.cacheSize = Math.max(1, cacheSize);
+            this.images = new Map();
+            this.queue = [];
+            this.active = 0;
+        }
+
+        static forGrid(params) {
+            const grids = ImagePreloader.grids = ImagePreloader.grids || new WeakMap();
+            const key = params.api || window;
+            let preloader = grids.get(key);
+            if (!preloader) {
+                preloader = new ImagePreloader(params.concurrency || 4, params.cacheSize || 48);
+                grids.set(key, preloader);
+            }
+            return preloader;
+        }
+
+        get(url) {
+            let entry = this.images.get(url);
+            if (entry) {
+                this.images.delete(url);
+            } else {
+                entry = {promise: null, start: null};
+                entry.promise = new Promise((resolve) => { entry.start = resolve; });
+                this.evict();
+            }
+            this.images.set(url, entry);
+            if (entry.start) this.fetch(url, entry);
+            return entry.promise;
+        }
+
+        prefetch(url) {
+            if (this.images.has(url) || this.queue.includes(url)) return;
+            this.queue.unshift(url);
+            this.queue.length = Math.min(this.queue.length, this.cacheSize);
+            this.pump();
+        }
+
+        pump() {
+            while (this.active < this.concurrency && this.queue.length) {
+                const url = this.queue.shift();
+                if (this.images.has(url)) continue;
+                this.active += 1;
+                this.get(url).then(() => {
+                    this.active -= 1;
+                    this.pump();
+                });
+            }
+        }
+
+        fetch(url, entry) {
+            const start = entry.start;
+            entry.start = null;
+            const img = new Image();
+            img.decoding = 'async';
+            img.src = url;
+            // A failed decode still resolves: the <img> then shows the
+            // browser's own broken-image state.
+            start(img.decode().then(() => img, () => null));
+        }
+
+        evict() {
+            while (this.images.size >= this.cacheSize) {
+                this.images.delete(this.images.keys().next().value);
+            }
+        }
+    }
+
+    class CatalogImageSlider {
+        init(params) {
+            this.fade = Boolean(params.fade);
+            this.prefetchCount = Math.max(0, params.prefetch || 0);
+            this.preloader = ImagePreloader.forGrid(params);
+            this.baseClass = 'isr-cell isr-' + (params.variant || 'classic') +
+                (this.fade ? ' isr-fade' : '');
+            this.eGui = document.createElement('div');
+            this.eGui.className = this.baseClass;
+            this.eGui.innerHTML =
+                '<img loading="lazy" decoding="async" alt="">' +
+                '<button type="button" class="isr-btn isr-prev">◀</button>' +
+                '<button type="button" class="isr-btn isr-next">▶</button>' +
+                '<span class="isr-text"></span>';
+            this.img = this.eGui.querySelector('img');
+            this.text = this.eGui.querySelector('.isr-text');
+            this.images = [];
+            this.index = 0;
+            this.timer = null;
+            this.shown = 0;
+
+            this.onClick = (event) => {
+                if (!this.images.length) return;
+                const target = event.target;
+                if (target.classList.contains('isr-prev')) {
+                    this.show(this.index - 1);
+                } else if (target.classList.contains('isr-next')) {
+                    this.show(this.index + 1);
+                } else if (target === this.img) {
+                    const item = this.images[this.index];
+                    window.open(typeof item === 'string' ? item : item.src, '_blank');
+                }
+            };
+            this.onEnter = () => this.prefetchAround();
+            this.eGui.addEventListener('click', this.onClick);
+            this.eGui.addEventListener('pointerenter', this.onEnter);
+            this.setValue(params.value);
+        }
+
+        setValue(value) {
+            if (value === this.value) return;
+            this.value = value;
+            let images = null;
+            try {
+                images = JSON.parse(value);
+            } catch (e) {
+                images = null;
+            }
+            if (!Array.isArray(images) || images.length === 0) {
+                this.images = [];
+                this.img.removeAttribute('src');
+                this.text.textContent = Array.isArray(images) ? 'No images' : 'Invalid data';
+                this.eGui.className = this.baseClass + ' isr-message';
+                return;
+            }
+            this.images = images;
+            this.eGui.className = this.baseClass + (images.length > 1 ? '' : ' isr-single');
+            this.index = 0;
+            this.shown += 1;
+            clearTimeout(this.timer);
+            this.img.classList.remove('isr-hidden');
+            this.img.src = this.thumb(0);
+        }
+
+        thumb(index) {
+            const item = this.images[index];
+            return typeof item === 'string' ? item : item.thumb;
+        }
+
+        show(index) {
+            const count = this.images.length;
+            this.index = (index + count) % count;
+            const url = this.thumb(this.index);
+            const shown = this.shown += 1;
+            const decoded = this.preloader.get(url);
+            const swap = () => {
+                if (shown !== this.shown) return;
+                this.img.src = url;
+                this.img.classList.remove('isr-hidden');
+            };
+            clearTimeout(this.timer);
+            if (this.fade) {
+                // Fade out while the next image downloads and decodes.
+                this.img.classList.add('isr-hidden');
+                const faded = new Promise((resolve) => {
+                    this.timer = setTimeout(resolve, 200);
+                });
+                Promise.all([decoded, faded]).then(swap);
+            } else {
+                decoded.then(swap);
+            }
+            this.prefetchAround();
+        }
+
+        prefetchAround() {
+            const count = this.images.length;
+            if (count < 2) return;
+            const steps = Math.min(this.prefetchCount, Math.floor(count / 2));
+            for (let step = 1; step <= steps; step++) {
+                this.preloader.prefetch(this.thumb((this.index + step) % count));
+                this.preloader.prefetch(this.thumb((this.index - step + count) % count));
+            }
+        }
+
+        getGui() {
+            return this.eGui;
+        }
+
+        refresh(params) {
+            this.setValue(params.value);
+            return true;
+        }
+
+        destroy() {
+            clearTimeout(this.timer);
+            this.shown += 1;
+            this.eGui.removeEventListener('click', this.onClick);
+            this.eGui.removeEventListener('pointerenter', this.onEnter);
+            this.img.removeAttribute('src');
+            this.images = [];
+        }
+    }
+
+    window.CatalogImageSlider = CatalogImageSlider;
+})();
@@ -0,0 +1,189 @@
+"""
+Process-wide cache for catalog data and grid configuration.
+
+Streamlit re-executes the app script on every widget interaction, but the
+modules it imports stay loaded, so a cache held here survives reruns (and is
+shared by every session in the server process). Entries are keyed on the
+data version and column schema, evicted least-recently-used once their
+estimated size exceeds a memory cap, and can be invalidated explicitly.
+Entries of a catalog version other than the current one are dropped with
+``invalidate_stale``.
+
+The cap is ``CATALOG_CACHE_MAX_BYTES`` when set. Entries a script run has
+built or used since ``begin_run`` are never evicted by that run, so a
+catalog larger than the cap stays cached instead of being rebuilt on every
+rerun.
+"""
+
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+MAX_BYTES_ENV = "CATALOG_CACHE_MAX_BYTES"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class MemoryCappedCache:
+    """
+    LRU cache bounded by the estimated size of its values.
+
+    Args:
+        max_bytes (int, optional): evict least recently used entries beyond
+            this size; ``CATALOG_CACHE_MAX_BYTES`` or ``DEFAULT_MAX_BYTES`` by
+            default
+    """
+
+    def __init__(self, max_bytes=None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get(MAX_BYTES_ENV) or DEFAULT_MAX_BYTES)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        # Keys the current script run on each thread depends on.
+        self._run = threading.local()
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def nbytes(self):
+        """Estimated size of all cached values."""
+        return self._bytes
+
+    def begin_run(self):
+        """
+        Start pinning the entries this thread builds or uses.
+
+        Streamlit runs each session's script on its own thread; call this at
+        the top of the script so eviction never drops what the run relies on.
+        """
+        self._run.keys = set()
+
+    def get_or_build(self, key, build, size=None):
+        """
+        Return the value cached under ``key``, building it on a miss.
+
+        Args:
+            key (hashable): cache key, e.g. ``("catalog", version)``
+            build (callable): zero-argument function producing the value
+            size (int|callable, optional): size of the value in bytes, or a
+                function of the built value returning it; estimated with
+                ``estimate_size`` when omitted
+
+        Returns:
+            object: the cached or freshly built value
+        """
+        pinned = getattr(self._run, "keys", None)
+        if pinned is not None:
+            pinned.add(key)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+            value = build()
+            if size is None:
+                nbytes = estimate_size(value)
+            else:
+                nbytes = size(value) if callable(size) else size
+            self._entries[key] = (value, nbytes)
+            self._bytes += nbytes
+            self._evict(pinned or {key})
+            return value
+
+    def _evict(self, pinned):
+        # Least recently used first, skipping what the current run holds; the
+        # cache may stay over the cap when only pinned entries are left.
+        for key in list(self._entries):
+            if self._bytes <= self.max_bytes:
+                break
+            if key not in pinned:
+                self._bytes -= self._entries.pop(key)[1]
+
+    def invalidate(self, name=None, version=None):
+        """
+        Drop entries whose key starts with ``name`` and/or ``version``.
+
+        Args:
+            name (str, optional): first key element to match, e.g. "catalog"
+            version (object, optional): second key element to match
+
+        Returns:
+            int: number of entries dropped
+        """
+        with self._lock:
+            stale = [
+                key
+                for key in self._entries
+                if (name is None or key[0] == name)
+                and (version is None or key[1:2] == (version,))
+            ]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(stale)
+
+    def invalidate_stale(self, version):
+        """
+        Drop entries keyed by a catalog version other than ``version``.
+
+        Keys are ``(name, version, ...)`` for per-version entries and
+        ``(name,)`` for the rest, which are kept.
+
+        Returns:
+            int: number of entries dropped
+        """
+        with self._lock:
+            stale = [key for key in self._entries if len(key) > 1 and key[1] != version]
+            for key in stale:
+                self._bytes -= self._entries.pop(key)[1]
+            return len(stale)
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+def frame_schema(df):
+    """
+    Return a hashable description of a DataFrame's columns.
+
+    Args:
+        df (pandas.DataFrame): frame to describe
+
+    Returns:
+        tuple[tuple[str, str]]: ``(column, dtype)`` pairs in column order
+    """
+    return tuple((str(column), str(dtype)) for column, dtype in df.dtypes.items())
+
+
+def estimate_size(value):
+    """
+    Estimate the memory held by a cached value in bytes.
+
+    DataFrames report their deep memory usage, objects that track their own
+    footprint (indexes, row models) their ``nbytes``, JSON-like values their
+    encoded length and anything else falls back to ``sys.getsizeof``.
+    """
+    if hasattr(value, "memory_usage"):
+        return int(value.memory_usage(deep=True).sum())
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return sys.getsizeof(value)
+
+
+catalog_cache = MemoryCappedCache()
@@ -0,0 +1,207 @@
+"""
+Sample product catalog shared by the catalog apps.
+
+The raw data is kept as plain Python literals. ``build_catalog`` turns it
+into the DataFrame the grid shows and ``load_catalog_store`` into the compact
+store the apps page through. ``open_catalog_store`` shares that store between
+processes when ``CATALOG_SNAPSHOT_DIR`` is set.
+
+Bump ``CATALOG_VERSION`` whenever the data or its layout changes so cached
+copies are rebuilt.
+
+With ``CATALOG_SOURCE`` set, the apps load a real export (or a snapshot
+written by ``ingest``) instead of the sample.
+"""
+
+import json
+import os
+
+CATALOG_VERSION = 1
+SNAPSHOT_ENV = "CATALOG_SNAPSHOT_DIR"
+SOURCE_ENV = "CATALOG_SOURCE"
+
+IMAGE_URLS = [
+    ["https://picsum.photos/id/10/800/600", "https://picsum.photos/id/20/800/600"],
+    ["https://picsum.photos/id/60/800/600"],
+    [
+        "https://picsum.photos/id/90/800/600",
+        "https://picsum.photos/id/91/800/600",
+        "https://picsum.photos/id/92/800/600",
+    ],
+    ["https://picsum.photos/id/120/800/600", "https://picsum.photos/id/121/800/600"],
+    ["https://picsum.photos/id/30/800/600"],
+    ["https://picsum.photos/id/40/800/600"],
+    ["https://picsum.photos/id/50/800/600", "https://picsum.photos/id/51/800/600"],
+    ["https://picsum.photos/id/70/800/600"],
+    ["https://picsum.photos/id/80/800/600", "https://picsum.photos/id/81/800/600"],
+    ["https://picsum.photos/id/90/800/600"],
+    ["https://picsum.photos/id/100/800/600", "https://picsum.photos/id/101/800/600"],
+    ["https://picsum.photos/id/110/800/600"],
+]
+
+CATALOG = {
+    "SKU_NBR": [
+        "S08231",
+        "S08231",
+        "S08231",
+        "621158",
+        "621158",
+        "621158",
+        "812450",
+        "812450",
+        "812450",
+        "700321",
+        "700321",
+        "700321",
+    ],
+    "Product_Name": [
+        "NYX Concealer",
+        "NYX Concealer",
+        "NYX Concealer",
+        "EcoFresh Bottle",
+        "EcoFresh Bottle",
+        "EcoFresh Bottle",
+        "GlowTech Lamp",
+        "GlowTech Lamp",
+        "GlowTech Lamp",
+        "Sun&Sky Flip Flop",
+        "Sun&Sky Flip Flop",
+        "Sun&Sky Flip Flop",
+    ],
+    "Attributes": [
+        "Headline",
+        "Manufacturer",
+        "Description",
+        "Headline",
+        "Manufacturer",
+        "Description",
+        "Headline",
+        "Manufacturer",
+        "Description",
+        "Headline",
+        "Manufacturer",
+        "Description",
+    ],
+    "STIBO_Data": [
+        "NYX Concealer Palette - Advanced Formula",
+        "Advanced Color Correcting Concealer Palette with enhanced coverage",
+        "Premium concealer for professional use",
+        "EcoFresh Stainless Steel Water Bottle",
+        "Durable and insulated bottle for hot and cold beverages",
+        "Environmentally friendly reusable design",
+        "GlowTech LED Desk Lamp",
+        "Adjustable LED Lamp with touch control and brightness",
+        "Smart desk accessory for modern workspaces",
+        "Sun&Sky Women's Flip Flop",
+        "Comfortable Flip Flops for beach and casual wear",
+        "Soft cushioned sole and durable straps",
+    ],
+    "Recommended_Value": [
+        "NYX Professional Makeup Color Correcting Concealer",
+        "Color Correcting Concealer Palette",
+        "Advanced Concealer Formula",
+        "EcoFresh Thermal Bottle",
+        "Insulated Stainless Steel Bottle",
+        "Reusable Water Bottle",
+        "GlowTech Smart LED Lamp",
+        "LED Desk Lamp with Adjustable Brightness",
+        "Smart Touch LED Lamp",
+        "Sun&Sky Women's Flip Flop",
+        "Comfort Beach Footwear",
+        "Flip Flop - Premium Quality",
+    ],
+    "Scoring": [
+        0.92,
+        0.87,
+        0.78,
+        0.65,
+        0.9,
+        0.3,
+        0.88,
+        0.85,
+        0.80,
+        0.98,
+        0.86,
+        0.82,
+    ],
+    "Images": IMAGE_URLS * 1,  # repeat pattern
+    "Comment": [""] * 12,
+}
+
+SEARCHABLE_COLUMNS = [
+    "SKU_NBR",
+    "Product_Name",
+    "Attributes",
+    "STIBO_Data",
+    "Recommended_Value",
+    "Scoring",
+]
+
+
+def build_catalog():
+    """
+    Build the catalog DataFrame shown in the grid.
+
+    Returns:
+        pandas.DataFrame: one row per SKU attribute, images as JSON strings
+    """
+    import pandas as pd
+
+    df = pd.DataFrame(CATALOG)
+    df["Images"] = df["Images"].apply(json.dumps)
+    return df
+
+
+def catalog_version():
+    """
+    Return the version cached copies of the catalog are keyed by.
+
+    This is ``CATALOG_VERSION``, plus a fingerprint of the file or snapshot
+    ``CATALOG_SOURCE`` points at, so a new export is picked up on reload.
+    """
+    source = os.environ.get(SOURCE_ENV)
+    if not source:
+        return CATALOG_VERSION
+    from .ingest import source_fingerprint
+
+    return f"{CATALOG_VERSION}-{source_fingerprint(source)}"
+
+
+def load_catalog_store():
+    """
+    Build the compact columnar store the apps serve rows from.
+
+    Reads ``CATALOG_SOURCE`` when it is set and the sample catalog otherwise.
+
+    Returns:
+        catalog_store.CatalogStore: dictionary-encoded catalog
+    """
+    source = os.environ.get(SOURCE_ENV)
+    if source:
+        from .ingest import load_source
+
+        return load_source(source)
+    from .catalog_store import CatalogStore
+
+    return CatalogStore.from_columns(CATALOG)
+
+
+def open_catalog_store():
+    """
+    Return the store the apps serve rows from.
+
+    With ``CATALOG_SNAPSHOT_DIR`` set, the store is memory-mapped from a
+    snapshot in that directory, shared by every server process on the host;
+    otherwise it is built in memory by ``load_catalog_store``.
+
+    Returns:
+        catalog_store.CatalogStore: the catalog
+    """
+    directory = os.environ.get(SNAPSHOT_ENV)
+    source = os.environ.get(SOURCE_ENV)
+    if not directory or (source and os.path.isdir(source)):
+        # A snapshot source is already memory-mapped by every process.
+        return load_catalog_store()
+    from .catalog_store import shared_snapshot
+
+    return shared_snapshot(load_catalog_store, directory, catalog_version())
@@ -0,0 +1,351 @@
+"""
+The catalog page shared by both image-carousel apps.
+
+``image_carousel`` and ``image_carousel2`` differ only in their grid
+options; ``render_page`` is the rest of the Streamlit script.
+"""
+
+LAYOUTS = ("Attribute rows", "One row per SKU")
+# Text shown in the attribute columns of the one-row-per-SKU layout.
+PIVOT_VALUES = ("STIBO_Data", "Comment")
+
+
+def render_page(build_grid_options, grid_name):
+    """
+    Render the product catalog page.
+
+    Args:
+        build_grid_options (callable): ``(df, page_size, renderer, prefetch)``
+            to AgGrid options
+        grid_name (str): cache namespace of the app's grid options
+    """
+    import json
+
+    import streamlit as st
+    from st_aggrid import AgGrid
+
+    from . import catalog
+    from .assets import serve_assets
+    from .cache import catalog_cache, estimate_size, frame_schema
+    from .comments import ChangeTracker, CommentStore, apply_saved
+    from .details import DetailCache, detail_panel, preview_block, preview_grid_options
+    from .export import export_panel, selection_keys
+    from .image_health import ImageValidator, drop_broken, health_flags
+    from .instrumentation import PhaseTimer, instrumentation_panel
+    from .pivot import PivotView, SkuIndex, pivot_grid_options
+    from .renderers import PREFETCH_NEIGHBOURS, RENDERER_MODES
+    from .row_model import ServerSideRowModel, paging_sidebar
+    from .search import QuickFilterIndex, SkuSearch
+    from .thumbnails import ThumbnailCache
+
+    # Nothing this run builds or uses is evicted before the run ends.
+    catalog_cache.begin_run()
+    version = catalog.catalog_version()
+    # A new export or snapshot changes the version; drop what the old one
+    # left behind instead of waiting for the memory cap.
+    catalog_cache.invalidate_stale(version)
+
+    # -------------------------
+    # ⏱️ INSTRUMENTATION
+    # -------------------------
+    # Off by default; a disabled timer costs one call per phase.
+    instrument = st.sidebar.checkbox("⏱️ Instrument reruns")
+    timer = PhaseTimer(
+        enabled=instrument,
+        track_memory=instrument and st.sidebar.checkbox("Track peak memory"),
+        profile=instrument and st.sidebar.checkbox("Profile with cProfile"),
+        rerun=st.session_state.get("rerun_count", 0),
+    )
+    st.session_state.rerun_count = timer.rerun + 1
+    timer.start()
+    try:
+        # -------------------------
+        # 🗄️ CACHED CATALOG
+        # -------------------------
+        # The frame, row model and grid options live in a process-wide cache, so
+        # reruns triggered by theme changes or comment edits skip rebuilding them.
+        if st.sidebar.button("🔄 Reload catalog"):
+            catalog_cache.invalidate(version=version)
+        # One editable row per SKU attribute, or a read-only row per SKU.
+        pivot = st.sidebar.radio("Layout", LAYOUTS) == LAYOUTS[1]
+        pivot_values = pivot and st.sidebar.radio(
+            "Attribute cells",
+            PIVOT_VALUES,
+            help="Show the attribute text or the reviewers' comments per SKU.",
+        )
+        # Long text is cut to a one-line preview; full text is read on demand.
+        previews = not pivot and st.sidebar.checkbox(
+            "✂️ Preview long text",
+            help="Send truncated descriptions and show the full text of selected rows.",
+        )
+        with timer.phase("load catalog"):
+            # Rows stay in the compact store, one read-only copy per process (or
+            # per host with CATALOG_SNAPSHOT_DIR); sessions keep only their edits
+            # and selections, and only the served block is converted to the
+            # grid's JSON layout.
+            store = catalog_cache.get_or_build(
+                ("catalog", version),
+                catalog.open_catalog_store,
+                size=lambda store: store.nbytes,
+            )
+            skus = catalog_cache.get_or_build(
+                ("sku_index", version), lambda: SkuIndex(store.frame["SKU_NBR"])
+            )
+            indexes = {"SKU_NBR": skus}
+            comments = catalog_cache.get_or_build(("comments",), CommentStore)
+            # Word index behind the search box, built once per catalog version.
+            words = catalog_cache.get_or_build(
+                ("search_index", version), lambda: QuickFilterIndex(store.frame)
+            )
+            if pivot:
+
+                def pivot_view():
+                    rows = store.frame
+                    if pivot_values == "Comment":
+                        rows = apply_saved(rows, comments)
+                    return PivotView(rows, value_column=pivot_values)
+
+                # The pivot is built once; comment edits are folded into it
+                # below and only the cheap row model over it is rebuilt.
+                view = catalog_cache.get_or_build(
+                    ("pivot_view", version, pivot_values), pivot_view
+                )
+
+                def pivot_model():
+                    frame = view.grid_frame()
+                    return ServerSideRowModel(
+                        frame, search=SkuSearch(words, frame["SKU_NBR"])
+                    )
+
+                model = catalog_cache.get_or_build(
+                    ("pivot_model", version, pivot_values),
+                    pivot_model,
+                    # The pivot frame belongs to the model, unlike the store's.
+                    size=lambda model: model.nbytes + estimate_size(model.df),
+                )
+                columns = model.df.head(0)
+            elif previews:
+                model = catalog_cache.get_or_build(
+                    ("row_model", version, "preview"),
+                    lambda: ServerSideRowModel(
+                        store.frame,
+                        encode_block=lambda rows: preview_block(
+                            store.encode_block(rows)
+                        ),
+                        indexes=indexes,
+                        search=words,
+                    ),
+                )
+            else:
+                model = catalog_cache.get_or_build(
+                    ("row_model", version),
+                    lambda: ServerSideRowModel(
+                        store.frame,
+                        encode_block=store.encode_block,
+                        indexes=indexes,
+                        search=words,
+                    ),
+                )
+            if not pivot:
+                columns = store.encode_block(store.frame.head(0))
+        if "comment_tracker" not in st.session_state:
+            st.session_state.comment_tracker = ChangeTracker(comments)
+
+        # -------------------------
+        # 🌈 THEME SWITCHER
+        # -------------------------
+        st.sidebar.markdown("🎨 **Choose AgGrid Theme**")
+        theme_choice = st.sidebar.selectbox(
+            "Theme",
+            ["alpine", "alpine-dark", "balham", "balham-dark", "streamlit", "material"],
+            index=0,
+        )
+
+        # -------------------------
+        # 📄 SERVER-SIDE PAGING
+        # -------------------------
+        # Only the requested block of rows is sent to the grid; sorting and
+        # filtering run against the full frame in Python.
+        searchable = list(columns.columns) if pivot else catalog.SEARCHABLE_COLUMNS
+        request = paging_sidebar(model, searchable)
+        with timer.phase("serve rows"):
+            page, matching_rows = model.get_block(
+                request["startRow"],
+                request["endRow"],
+                request["sortModel"],
+                request["filterModel"],
+                request["quickFilterText"],
+            )
+            if not pivot:
+                page = apply_saved(page, comments)
+
+        # -------------------------
+        # 🩺 IMAGE HEALTH
+        # -------------------------
+        # The page's image URLs are checked before the grid is built; broken ones
+        # are dropped from the slider and each row gets a health flag.
+        check_images = not pivot and st.sidebar.checkbox(
+            "🩺 Check image URLs",
+            help="Flags rows whose images fail to load; results are cached for an hour.",
+        )
+        if check_images:
+            with timer.phase("image health"):
+                validator = catalog_cache.get_or_build(
+                    ("image_validator",), ImageValidator
+                )
+                urls = [url for images in page["Images"] for url in json.loads(images)]
+                results = validator.validate(urls)
+                page = page.assign(
+                    Image_Health=health_flags(page["Images"], results),
+                    Images=[drop_broken(images, results) for images in page["Images"]],
+                )
+                columns = columns.assign(Image_Health=[])
+
+        # -------------------------
+        # 🖼️ THUMBNAILS
+        # -------------------------
+        # Cells get downsized local copies; clicking still opens the original.
+        use_thumbnails = not pivot and st.sidebar.checkbox(
+            "🖼️ Serve thumbnails",
+            help="Requires `streamlit run ... --server.enableStaticServing true`.",
+        )
+        if use_thumbnails:
+            with timer.phase("thumbnails"):
+                thumbnails = catalog_cache.get_or_build(("thumbnails",), ThumbnailCache)
+                if not thumbnails.writable:
+                    st.sidebar.warning(
+                        f"Cannot write thumbnails to `{thumbnails.directory}`; set "
+                        "`CATALOG_THUMBNAIL_DIR` and `CATALOG_THUMBNAIL_URL`."
+                    )
+                page = page.assign(Images=thumbnails.rewrite_many(page["Images"]))
+
+        # -------------------------
+        # ⚡ RENDERER MODE
+        # -------------------------
+        renderer = prefetch = None
+        if not pivot:
+            renderer = st.sidebar.radio(
+                "Image renderer",
+                RENDERER_MODES,
+                help="`fast` keeps fixed row heights so large grids stay virtualized.",
+            )
+            prefetch = st.sidebar.number_input(
+                "Prefetch images",
+                min_value=0,
+                max_value=3,
+                value=PREFETCH_NEIGHBOURS,
+                help="Images loaded ahead on each side of the shown one. "
+                "Set 0 on slow connections.",
+            )
+            # The slider's script and styles are cached files the browser loads
+            # once; only a small loader travels with the grid options.
+            serve_assets()
+
+        page_size = request["endRow"] - request["startRow"]
+        grid_key = (
+            "grid_options",
+            version,
+            grid_name,
+            frame_schema(columns),
+            page_size,
+            renderer,
+            prefetch,
+            previews,
+            pivot,
+        )
+        with timer.phase("grid options"):
+            # AgGrid adds keys to the options it is given, so hand it a copy.
+            def grid_options():
+                if pivot:
+                    return pivot_grid_options(columns, page_size=page_size)
+                options = build_grid_options(
+                    columns, page_size=page_size, renderer=renderer, prefetch=prefetch
+                )
+                return preview_grid_options(options) if previews else options
+
+            gridOptions = dict(catalog_cache.get_or_build(grid_key, grid_options))
+
+        # -------------------------
+        # 🚀 DISPLAY GRID
+        # -------------------------
+        st.markdown("## 🧩 Product Catalog with Image Slider & Attributes")
+
+        with timer.phase("grid round trip"):
+            grid_response = AgGrid(
+                page,
+                gridOptions=gridOptions,
+                theme=theme_choice,
+                allow_unsafe_jscode=True,
+                enable_enterprise_modules=True,
+                fit_columns_on_grid_load=False,
+            )
+
+        # -------------------------
+        # 💬 COMMENT CAPTURE
+        # -------------------------
+        # Only cells that changed on this page are captured and written, so an
+        # edit costs the same however large the catalog is.
+        edits = []
+        if not pivot:
+            with timer.phase("comment capture"):
+                tracker = st.session_state.comment_tracker
+                edits = tracker.capture(page, grid_response["data"])
+                tracker.flush()
+        if edits:
+            st.sidebar.caption(f"💾 Saved {len(edits)} comment edit(s)")
+            # Fold the edited rows into the comment pivot, if one was built,
+            # instead of pivoting the whole catalog again.
+            view_key = ("pivot_view", version, "Comment")
+            if view_key in catalog_cache:
+                rows = store.frame.take(store.positions([e.row_key for e in edits]))
+                catalog_cache.get_or_build(view_key, None).update(
+                    apply_saved(rows, comments)
+                )
+                catalog_cache.invalidate(name="pivot_model", version=version)
+
+        # -------------------------
+        # 📖 FULL TEXT
+        # -------------------------
+        if previews:
+            with timer.phase("details"):
+                details = catalog_cache.get_or_build(
+                    ("details", version), lambda: DetailCache(store)
+                )
+                detail_panel(details, selection_keys(grid_response["selected_rows"]))
+
+        # -------------------------
+        # 📤 SELECTION EXPORT
+        # -------------------------
+        # Selected rows are looked up by key in the store and exported in chunks;
+        # only a count and a short preview are rendered on the page. In the SKU
+        # layout every attribute row of the chosen SKUs is exported.
+        scope = st.sidebar.radio("Export", ["Selected rows", "All matching rows"])
+        with timer.phase("selection"):
+            if scope == "Selected rows" and pivot:
+                selected = grid_response["selected_rows"]
+                positions = skus.positions(selection_keys(selected, ("SKU_NBR",)))
+            elif scope == "Selected rows":
+                keys = selection_keys(grid_response["selected_rows"])
+                positions = store.positions(keys)
+            else:
+                positions = model.positions(
+                    request["sortModel"],
+                    request["filterModel"],
+                    request["quickFilterText"],
+                )
+                if pivot:
+                    positions = skus.positions(model.df["SKU_NBR"].take(positions))
+            export_panel(
+                store, positions, overlay=lambda rows: apply_saved(rows, comments)
+            )
+            st.write("📦 Total Rows Displayed:", len(grid_response["data"]))
+            st.write("🔎 Matching Rows:", matching_rows)
+            if request["quickFilterText"] and not pivot:
+                found = model.positions(
+                    None, request["filterModel"], request["quickFilterText"]
+                )
+                st.write("🏷️ Matching SKUs:", words.sku_count(found))
+    finally:
+        timer.stop()
+    if timer.enabled:
+        instrumentation_panel(timer, st.session_state.setdefault("timings", []))
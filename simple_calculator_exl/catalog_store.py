@@ -0,0 +1,297 @@
+"""
+Compact columnar storage for the product catalog.
+
+The grid layout repeats ``SKU_NBR``, ``Product_Name`` and ``Attributes`` on
+every attribute row and keeps each row's images as a JSON string. Here the
+repeated keys are dictionary-encoded (pandas categoricals), free text uses
+Arrow-backed strings, and image URLs live in one normalized table: a
+dictionary-encoded ``values`` column plus an ``offsets`` array, so row ``i``
+owns ``values[offsets[i]:offsets[i + 1]]``. Rows are turned back into the
+grid's JSON format only when a block is sent to the grid.
+
+A store can be saved as a snapshot of Arrow IPC and ``.npy`` files and
+opened memory-mapped, so every process on a host shares one copy of the
+text columns through the page cache instead of holding its own.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from .comments import row_keys
+
+KEY_COLUMNS = ("SKU_NBR", "Product_Name", "Attributes")
+TEXT_COLUMNS = ("STIBO_Data", "Recommended_Value", "Comment")
+IMAGES_COLUMN = "Images"
+
+_FRAME_FILE = "frame.arrow"
+_IMAGES_FILE = "image_values.arrow"
+_OFFSETS_FILE = "image_offsets.npy"
+_META_FILE = "meta.json"
+
+
+class CatalogStore:
+    """
+    Catalog rows with dictionary-encoded keys and a normalized image table.
+
+    Args:
+        frame (pandas.DataFrame): every column but the images, RangeIndex
+        image_offsets (numpy.ndarray): ``len(frame) + 1`` int64 offsets
+        image_values (pandas.Categorical): all image URLs, row after row
+        columns (list[str]): grid column order, including ``Images``
+        mapped (bool): whether the text columns, numbers and image table are
+            views of memory-mapped snapshot files
+    """
+
+    def __init__(self, frame, image_offsets, image_values, columns, mapped=False):
+        self.frame = frame
+        self.image_offsets = image_offsets
+        self.image_values = image_values
+        self.columns = list(columns)
+        self.mapped = mapped
+        self._key_index = None
+
+    def __len__(self):
+        return len(self.frame)
+
+    @classmethod
+    def from_columns(cls, columns):
+        """
+        Build a store from column lists, e.g. ``catalog.CATALOG``.
+
+        Args:
+            columns (dict[str, list]): column name to values; ``Images``
+                holds a list of URLs (or a JSON string of one) per row
+
+        Returns:
+            CatalogStore: the compact store
+        """
+        import numpy as np
+        import pandas as pd
+
+        images = [
+            json.loads(cell) if isinstance(cell, str) else list(cell)
+            for cell in columns.get(IMAGES_COLUMN, [])
+        ]
+        data = {}
+        for name, values in columns.items():
+            if name == IMAGES_COLUMN:
+                continue
+            if name in KEY_COLUMNS:
+                data[name] = pd.Categorical(values)
+            elif name in TEXT_COLUMNS:
+                data[name] = pd.array(values, dtype="string[pyarrow]")
+            else:
+                data[name] = values
+        frame = pd.DataFrame(data)
+
+        if not images:
+            images = [[] for _ in range(len(frame))]
+        offsets = np.zeros(len(images) + 1, dtype=np.int64)
+        np.cumsum([len(urls) for urls in images], out=offsets[1:])
+        values = pd.Categorical([url for urls in images for url in urls])
+        return cls(frame, offsets, values, columns)
+
+    @classmethod
+    def from_frame(cls, df):
+        """Build a store from a grid-layout DataFrame."""
+        return cls.from_columns({name: df[name].tolist() for name in df.columns})
+
+    def save(self, directory):
+        """
+        Write the store as a snapshot that ``open`` can memory-map.
+
+        Args:
+            directory (str|os.PathLike): destination, created if missing
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        images = pa.table({IMAGES_COLUMN: pa.array(self.image_values)})
+        for name, table in (
+            (_FRAME_FILE, pa.Table.from_pandas(self.frame, preserve_index=False)),
+            (_IMAGES_FILE, images),
+        ):
+            with (
+                pa.OSFile(str(directory / name), "wb") as sink,
+                pa.ipc.new_file(sink, table.schema) as writer,
+            ):
+                writer.write_table(table)
+        np.save(directory / _OFFSETS_FILE, self.image_offsets)
+        # Written last: its presence marks a complete snapshot.
+        (directory / _META_FILE).write_text(json.dumps({"columns": self.columns}))
+
+    @classmethod
+    def open(cls, directory):
+        """
+        Open a snapshot written by ``save`` without reading it into memory.
+
+        Text and numeric columns are read-only views of the memory-mapped
+        files; only the dictionary codes of the key columns are copied.
+
+        Args:
+            directory (str|os.PathLike): snapshot directory
+
+        Returns:
+            CatalogStore: a read-only store
+        """
+        import numpy as np
+        import pyarrow as pa
+
+        directory = Path(directory)
+        meta = json.loads((directory / _META_FILE).read_text())
+
+        def read(name):
+            source = pa.memory_map(str(directory / name))
+            return pa.ipc.open_file(source).read_all()
+
+        frame = read(_FRAME_FILE).to_pandas(split_blocks=True)
+        values = read(_IMAGES_FILE).column(IMAGES_COLUMN).to_pandas().array
+        offsets = np.load(directory / _OFFSETS_FILE, mmap_mode="r")
+        return cls(frame, offsets, values, meta["columns"], mapped=True)
+
+    def images(self, position):
+        """Return the image URLs of the row at ``position``."""
+        start, end = self.image_offsets[position], self.image_offsets[position + 1]
+        return list(self.image_values[start:end])
+
+    def positions(self, keys):
+        """
+        Return the row positions of ``comments.row_keys``-style keys.
+
+        Unknown keys are skipped; the key index is built on first use.
+
+        Args:
+            keys (iterable[str]): keys such as ``"S08231|Headline"``
+
+        Returns:
+            numpy.ndarray: int64 row positions, in the order of ``keys``
+        """
+        import pandas as pd
+
+        if self._key_index is None:
+            self._key_index = pd.Index(row_keys(self.frame))
+        found = self._key_index.get_indexer_for(list(keys))
+        return found[found >= 0]
+
+    def encode_block(self, block):
+        """
+        Add the grid's JSON ``Images`` column to a block of ``frame`` rows.
+
+        Args:
+            block (pandas.DataFrame): rows taken from ``frame`` (its index
+                holds the row positions)
+
+        Returns:
+            pandas.DataFrame: the block in grid column order with plain
+            object columns, ready to be serialized for the grid
+        """
+        block = block.astype(
+            {
+                name: object
+                for name in block.columns
+                if name in KEY_COLUMNS or name in TEXT_COLUMNS
+            }
+        )
+        block[IMAGES_COLUMN] = [json.dumps(self.images(i)) for i in block.index]
+        return block[[c for c in self.columns if c in block.columns]]
+
+    def grid_frame(self):
+        """Return the whole catalog in the grid layout."""
+        return self.encode_block(self.frame)
+
+    @property
+    def nbytes(self):
+        """
+        Memory the store holds itself, for the process cache.
+
+        A memory-mapped store only owns the copied key columns; the rest is
+        in the page cache, shared with every process on the host.
+        """
+        if not self.mapped:
+            return int(self.memory_usage().sum())
+        keys = [name for name in self.frame.columns if name in KEY_COLUMNS]
+        return int(self.frame[keys].memory_usage(deep=True, index=False).sum())
+
+    def memory_usage(self, deep=True):
+        """
+        Bytes held by each part of the store.
+
+        Returns:
+            pandas.Series: per-column usage plus the image offsets and values
+        """
+        import pandas as pd
+
+        usage = self.frame.memory_usage(deep=deep, index=False)
+        extra = pd.Series(
+            {
+                "Images.offsets": self.image_offsets.nbytes,
+                "Images.values": self.image_values.memory_usage(deep=deep),
+            }
+        )
+        return pd.concat([usage, extra])
+
+
+def memory_report(store, legacy):
+    """
+    Compare the store's footprint with the grid-layout DataFrame.
+
+    Args:
+        store (CatalogStore): compact store
+        legacy (pandas.DataFrame): same catalog in today's object layout
+
+    Returns:
+        dict: ``legacy_bytes``, ``compact_bytes``, ``ratio`` and a per-column
+        ``columns`` breakdown of ``(legacy, compact)`` bytes
+    """
+    legacy_usage = legacy.memory_usage(deep=True, index=False)
+    compact_usage = store.memory_usage()
+    columns = {}
+    for name in legacy_usage.index:
+        compact = compact_usage.get(name)
+        if name == IMAGES_COLUMN:
+            compact = compact_usage["Images.offsets"] + compact_usage["Images.values"]
+        columns[name] = (int(legacy_usage[name]), int(compact or 0))
+    legacy_bytes, compact_bytes = int(legacy_usage.sum()), int(compact_usage.sum())
+    return {
+        "legacy_bytes": legacy_bytes,
+        "compact_bytes": compact_bytes,
+        "ratio": compact_bytes / legacy_bytes if legacy_bytes else 0.0,
+        "columns": columns,
+    }
+
+
+def shared_snapshot(build, directory, version):
+    """
+    Open the host-wide snapshot of a catalog version, writing it if needed.
+
+    The first process to get here builds the store and publishes it with an
+    atomic rename; every other process memory-maps the same files.
+
+    Args:
+        build (callable): returns the ``CatalogStore`` to snapshot
+        directory (str|os.PathLike): where snapshots are kept
+        version (object): catalog version, part of the snapshot name
+
+    Returns:
+        CatalogStore: the memory-mapped store
+    """
+    directory = Path(directory)
+    path = directory / f"catalog-v{version}"
+    if not (path / _META_FILE).exists():
+        directory.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".catalog-", dir=directory))
+        try:
+            build().save(staging)
+            os.rename(staging, path)
+        except OSError:
+            # Another process published the snapshot first.
+            if not (path / _META_FILE).exists():
+                raise
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+    return CatalogStore.open(path)
@@ -0,0 +1,239 @@
+"""
+Reviewer comment capture and persistence.
+
+Instead of reconciling the whole grid frame on every rerun, ``diff_cells``
+compares only the rows that were sent to the grid with what came back and
+returns the cells that changed. Edits are buffered by ``ChangeTracker`` and
+written in batches to a local SQLite file in WAL mode, which keeps both the
+edit history and the current value per row, indexed by SKU. The file is
+``CATALOG_COMMENTS_DB`` when set and ``DEFAULT_PATH`` otherwise.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from pathlib import Path
+
+PATH_ENV = "CATALOG_COMMENTS_DB"
+# SKUs per lookup query, below SQLite's limit on bound parameters.
+_QUERY_SKUS = 900
+DEFAULT_PATH = Path.home() / ".cache" / "simple_calculator_exl" / "comments.sqlite3"
+
+Edit = namedtuple("Edit", "row_key sku column old new")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cell_values (
+    row_key TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    sku TEXT NOT NULL,
+    value TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (row_key, column_name)
+);
+CREATE INDEX IF NOT EXISTS cell_values_sku ON cell_values (sku);
+CREATE TABLE IF NOT EXISTS cell_edits (
+    id INTEGER PRIMARY KEY,
+    row_key TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    sku TEXT NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    edited_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cell_edits_row ON cell_edits (row_key, column_name);
+"""
+
+
+def row_keys(df, key_columns=("SKU_NBR", "Attributes")):
+    """
+    Return a stable string key per row, e.g. ``"S08231|Headline"``.
+
+    Args:
+        df (pandas.DataFrame): catalog rows
+        key_columns (tuple[str]): columns that identify a row
+
+    Returns:
+        pandas.Series: keys aligned with ``df.index``
+    """
+    keys = df[key_columns[0]].astype(str)
+    for column in key_columns[1:]:
+        keys = keys + "|" + df[column].astype(str)
+    return keys
+
+
+def diff_cells(before, after, columns=("Comment",), sku_column="SKU_NBR"):
+    """
+    Return the edited cells between two versions of the same rows.
+
+    Rows are matched by ``row_keys``, so the grid may hand them back in a
+    different order. Only rows present in both frames are compared.
+
+    Args:
+        before (pandas.DataFrame): rows as sent to the grid
+        after (pandas.DataFrame): rows as returned by the grid
+        columns (tuple[str]): editable columns to compare
+
+    Returns:
+        list[Edit]: one entry per changed cell
+    """
+    old = before.set_index(row_keys(before))
+    new = after.set_index(row_keys(after))
+    new = new[new.index.isin(old.index)]
+    old = old.loc[new.index]
+
+    edits = []
+    for column in columns:
+        old_values = old[column].fillna("").astype(str)
+        new_values = new[column].fillna("").astype(str)
+        changed = old_values.to_numpy() != new_values.to_numpy()
+        for key in new.index[changed]:
+            edits.append(
+                Edit(
+                    key,
+                    str(new.at[key, sku_column]),
+                    column,
+                    old_values.at[key],
+                    new_values.at[key],
+                )
+            )
+    return edits
+
+
+class CommentStore:
+    """
+    SQLite-backed store of edited cell values and their history.
+
+    Args:
+        path (str|os.PathLike, optional): database file, created if
+            missing; ``CATALOG_COMMENTS_DB`` or ``DEFAULT_PATH`` by default
+    """
+
+    def __init__(self, path=None):
+        if path is None:
+            path = os.environ.get(PATH_ENV) or DEFAULT_PATH
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
+
+    def write(self, edits):
+        """
+        Persist a batch of edits in a single transaction.
+
+        Args:
+            edits (list[Edit]): cells to store
+        """
+        if not edits:
+            return
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO cell_edits"
+                " (row_key, column_name, sku, old_value, new_value, edited_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(e.row_key, e.column, e.sku, e.old, e.new, now) for e in edits],
+            )
+            self._connection.executemany(
+                "INSERT INTO cell_values"
+                " (row_key, column_name, sku, value, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (row_key, column_name) DO UPDATE"
+                " SET value = excluded.value, updated_at = excluded.updated_at",
+                [(e.row_key, e.column, e.sku, e.new, now) for e in edits],
+            )
+
+    def values_for_skus(self, skus, column="Comment"):
+        """
+        Return the stored values of ``column`` for rows of the given SKUs.
+
+        Args:
+            skus (iterable[str]): SKUs to look up (served by the SKU index)
+            column (str): edited column
+
+        Returns:
+            dict[str, str]: row key to current value
+        """
+        skus = sorted(set(map(str, skus)))
+        found = {}
+        for start in range(0, len(skus), _QUERY_SKUS):
+            batch = skus[start : start + _QUERY_SKUS]
+            placeholders = ", ".join("?" * len(batch))
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT row_key, value FROM cell_values"
+                    f" WHERE column_name = ? AND sku IN ({placeholders})",
+                    [column, *batch],
+                ).fetchall()
+            found.update(rows)
+        return found
+
+    def history(self, row_key, column="Comment"):
+        """Return ``(old, new, edited_at)`` tuples for one cell, oldest first."""
+        with self._lock:
+            return self._connection.execute(
+                "SELECT old_value, new_value, edited_at FROM cell_edits"
+                " WHERE row_key = ? AND column_name = ? ORDER BY id",
+                (row_key, column),
+            ).fetchall()
+
+
+class ChangeTracker:
+    """
+    Buffer cell edits and write them to a ``CommentStore`` in batches.
+
+    Args:
+        store (CommentStore): destination of the edits
+        batch_size (int): pending edits that trigger a write
+    """
+
+    def __init__(self, store, batch_size=100):
+        self.store = store
+        self.batch_size = batch_size
+        self.pending = []
+
+    def capture(self, before, after, columns=("Comment",)):
+        """
+        Record the cells edited between ``before`` and ``after``.
+
+        Returns:
+            list[Edit]: the newly captured edits
+        """
+        edits = diff_cells(before, after, columns)
+        self.pending.extend(edits)
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return edits
+
+    def flush(self):
+        """Write all pending edits and return how many were written."""
+        batch, self.pending = self.pending, []
+        self.store.write(batch)
+        return len(batch)
+
+
+def apply_saved(df, store, column="Comment"):
+    """
+    Overlay stored values of ``column`` onto a block of catalog rows.
+
+    Args:
+        df (pandas.DataFrame): rows about to be shown
+        store (CommentStore): saved edits
+
+    Returns:
+        pandas.DataFrame: a copy of ``df`` with saved values filled in
+    """
+    saved = store.values_for_skus(df["SKU_NBR"], column)
+    if not saved:
+        return df
+    keys = row_keys(df)
+    values = keys.map(saved).fillna(df[column])
+    return df.assign(**{column: values.to_numpy()})
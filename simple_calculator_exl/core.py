@@ -1,3 +1,9 @@
+import array
+import numbers
+import operator
+from itertools import repeat
+
+
 def add(a, b):
     """
     Return the sum of a and b.
@@ -10,3 +16,197 @@ def add(a, b):
         int|float: a + b
     """
     return a + b
+
+
+def add_many(a, b, out=None):
+    """
+    Return the element-wise sum of a and b.
+
+    Either operand may be a scalar, a list/tuple, an ``array.array``, a
+    ``memoryview`` or a NumPy array; scalars are broadcast against the other
+    operand. Contiguous buffers are summed in bulk through NumPy when it is
+    installed, without building per-element Python objects.
+
+    Args:
+        a (number|sequence|buffer): first addend
+        b (number|sequence|buffer): second addend
+        out (list|array.array|memoryview|numpy.ndarray, optional): preallocated
+            destination of matching length; filled in place and returned
+
+    Returns:
+        number|list|array.array|numpy.ndarray: ``out`` when given, otherwise a
+        NumPy array for NumPy input, an ``array.array`` for buffer input, a
+        list for list/tuple input and a scalar when both operands are scalars
+
+    Raises:
+        ValueError: if the operand and ``out`` lengths do not match, or an
+            array operand is not one-dimensional
+        OverflowError: if an integer sum does not fit the result type
+    """
+    a_scalar = isinstance(a, numbers.Number)
+    b_scalar = isinstance(b, numbers.Number)
+    if a_scalar and b_scalar and out is None:
+        return a + b
+
+    np = _numpy() if _has_buffer(a, b, out) else None
+    if np is not None:
+        return _add_numpy(np, a, b, out)
+
+    length = _broadcast_length(a, b, a_scalar, b_scalar)
+    left = repeat(a, length) if a_scalar else a
+    right = repeat(b, length) if b_scalar else b
+    values = map(operator.add, left, right)
+
+    if out is not None:
+        if len(out) != length:
+            raise ValueError(
+                f"output length {len(out)} does not match operand length {length}"
+            )
+        if isinstance(out, list):
+            out[:] = list(values)
+        else:
+            out[:] = array.array(_typecode(out), values)
+        return out
+    if _is_buffer(a) or _is_buffer(b):
+        return array.array(_result_typecode(a, b), values)
+    return list(values)
+
+
+_NUMPY = None
+
+
+def _numpy():
+    """Import NumPy on first use so the package itself stays light."""
+    global _NUMPY
+    if _NUMPY is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _NUMPY = numpy
+    return _NUMPY or None
+
+
+def _is_array(x):
+    return isinstance(x, array.array)
+
+
+def _is_buffer(x):
+    return isinstance(x, (array.array, memoryview)) or type(x).__module__ == "numpy"
+
+
+def _typecode(x):
+    return x.typecode if _is_array(x) else x.format
+
+
+def _has_buffer(*operands):
+    return any(_is_buffer(x) for x in operands if x is not None)
+
+
+def _broadcast_length(a, b, a_scalar, b_scalar):
+    if a_scalar:
+        return len(b)
+    if b_scalar or len(a) == len(b):
+        return len(a)
+    raise ValueError(
+        f"operands could not be broadcast together: lengths {len(a)} and {len(b)}"
+    )
+
+
+def _result_typecode(a, b):
+    codes = [_typecode(x) for x in (a, b) if _is_buffer(x)]
+    if (
+        any(code in "fd" for code in codes)
+        or isinstance(a, float)
+        or isinstance(b, float)
+    ):
+        return "d"
+    return codes[0]
+
+
+def _add_numpy(np, a, b, out):
+    a_scalar = isinstance(a, numbers.Number)
+    b_scalar = isinstance(b, numbers.Number)
+    left = a if a_scalar else np.asarray(a)
+    right = b if b_scalar else np.asarray(b)
+    # NumPy would broadcast length-1 and 2-D operands; the pure path does not.
+    for x in (x for x in (left, right) if isinstance(x, np.ndarray)):
+        if x.ndim != 1:
+            raise ValueError(f"operands must be one-dimensional, got shape {x.shape}")
+    length = _broadcast_length(left, right, a_scalar, b_scalar)
+    if out is not None and len(out) != length:
+        raise ValueError(
+            f"output length {len(out)} does not match operand length {length}"
+        )
+    dtype = np.result_type(left, right)
+    _check_integer_result(np, left, right, dtype)
+
+    if out is None:
+        _check_range(np, left, right, dtype)
+        result = np.add(left, right)
+        if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+            return result
+        if not (_is_buffer(a) or _is_buffer(b)):
+            return result.tolist()
+        try:
+            packed = array.array(result.dtype.char)
+        except ValueError:
+            return result.tolist()
+        packed.frombytes(result.tobytes())
+        return packed
+
+    if isinstance(out, list):
+        _check_range(np, left, right, dtype)
+        out[:] = np.add(left, right).tolist()
+        return out
+
+    target = np.asarray(out)
+    _check_range(np, left, right, target.dtype)
+    np.add(left, right, out=target)
+    return out
+
+
+def _check_integer_result(np, left, right, dtype):
+    """
+    Raise ``OverflowError`` if integer operands give a non-integer result.
+
+    NumPy has no integer type for e.g. ``int64`` plus values above the
+    ``int64`` range, and falls back to ``float64`` (inexact) or ``object``,
+    where an ``array.array`` of an integer typecode raises.
+    """
+    if dtype.kind in "biu":
+        return
+    operands = [np.asarray(x) for x in (left, right)]
+    if all(
+        x.dtype.kind in "biu"
+        or (x.dtype.kind == "O" and all(isinstance(v, int) for v in x.flat))
+        for x in operands
+    ):
+        raise OverflowError(
+            f"no integer type holds the sum of {operands[0].dtype} and "
+            f"{operands[1].dtype} values"
+        )
+
+
+def _check_range(np, left, right, dtype):
+    """
+    Raise ``OverflowError`` if an integer sum does not fit ``dtype``.
+
+    NumPy wraps integer overflow silently where ``array.array`` raises, so
+    both paths raise. Operand extremes rule out overflow in one pass in the
+    common case; only otherwise are the sums computed exactly.
+    """
+    if dtype.kind not in "iu":
+        return
+    operands = [np.asarray(x) for x in (left, right)]
+    if any(x.dtype.kind not in "biu" or x.size == 0 for x in operands):
+        return
+    info = np.iinfo(dtype)
+    low = sum(int(x.min()) for x in operands)
+    high = sum(int(x.max()) for x in operands)
+    if info.min <= low and high <= info.max:
+        return
+    wide = object if max(x.dtype.itemsize for x in operands) >= 8 else np.int64
+    total = np.add(operands[0].astype(wide), operands[1].astype(wide))
+    if (total < info.min).any() or (total > info.max).any():
+        raise OverflowError(f"sum out of range for {dtype}")
@@ -0,0 +1,155 @@
+"""
+Truncated previews of long text columns with on-demand full text.
+
+In preview mode the grid gets the first ``PREVIEW_CHARS`` characters of
+``STIBO_Data`` and ``Recommended_Value`` on one fixed-height line; the full
+text of a row is read from the ``CatalogStore`` only when the row is
+expanded, through a small ``DetailCache``, so expanding it again costs a
+dictionary lookup.
+"""
+
+import threading
+from collections import OrderedDict
+
+DETAIL_COLUMNS = ("STIBO_Data", "Recommended_Value")
+PREVIEW_CHARS = 80
+ELLIPSIS = "…"
+
+
+def truncate_text(series, limit=PREVIEW_CHARS):
+    """
+    Cut strings longer than ``limit`` characters and mark them with "…".
+
+    Args:
+        series (pandas.Series): text values
+        limit (int): characters kept
+
+    Returns:
+        pandas.Series: the previews, aligned with ``series``
+    """
+    text = series.astype(str)
+    long = text.str.len() > limit
+    if not long.any():
+        return text
+    return text.where(~long, text.str.slice(0, limit) + ELLIPSIS)
+
+
+def preview_block(block, columns=DETAIL_COLUMNS, limit=PREVIEW_CHARS):
+    """Return ``block`` with the long text ``columns`` truncated."""
+    return block.assign(**{name: truncate_text(block[name], limit) for name in columns})
+
+
+def preview_grid_options(options, columns=DETAIL_COLUMNS):
+    """
+    Return a copy of grid options with the preview columns on one line.
+
+    The previews no longer need wrapping, so those cells skip AgGrid's
+    per-cell height measurement.
+    """
+    options = dict(options)
+    options["columnDefs"] = [
+        {**column, "wrapText": False, "autoHeight": False}
+        if column.get("field") in columns
+        else column
+        for column in options["columnDefs"]
+    ]
+    return options
+
+
+class DetailCache:
+    """
+    LRU cache of full-text rows read from a ``CatalogStore``.
+
+    Args:
+        store (CatalogStore): backing rows
+        columns (tuple[str]): columns returned per row
+        max_entries (int): rows kept
+    """
+
+    def __init__(self, store, columns=DETAIL_COLUMNS, max_entries=256):
+        self.store = store
+        self.columns = columns
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Memory the cache can grow to, estimated from the first rows."""
+        from .cache import estimate_size
+
+        sample = self.store.frame[list(self.columns)].head(64).astype(object)
+        row_bytes = estimate_size(sample) / max(len(sample), 1)
+        return int(self.max_entries * row_bytes)
+
+    def get_many(self, keys):
+        """
+        Return the full text of each row key, fetching misses in one lookup.
+
+        Args:
+            keys (list[str]): ``comments.row_keys``-style keys
+
+        Returns:
+            dict[str, dict[str, str]]: row key to column values; unknown
+            keys are left out
+        """
+        found, missing = {}, []
+        with self._lock:
+            for key in keys:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[key] = self._entries[key]
+                    self.hits += 1
+                else:
+                    missing.append(key)
+        if not missing:
+            return found
+
+        from .comments import row_keys
+
+        rows = self.store.frame.take(self.store.positions(missing))
+        fetched = dict(
+            zip(
+                row_keys(rows),
+                rows[list(self.columns)].astype(object).to_dict("records"),
+            )
+        )
+        with self._lock:
+            self.misses += len(missing)
+            for key, values in fetched.items():
+                self._entries[key] = values
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        found.update(fetched)
+        return found
+
+    def get(self, key):
+        """Return the full text of one row, or ``None`` for unknown keys."""
+        return self.get_many([key]).get(key)
+
+
+def detail_panel(cache, keys, limit=5):
+    """
+    Show the full text of up to ``limit`` expanded rows.
+
+    Args:
+        cache (DetailCache): full-text source
+        keys (list[str]): row keys to expand, e.g. the selected rows
+        limit (int): rows expanded at once
+    """
+    import streamlit as st
+
+    if not keys:
+        st.caption("Select rows to read their full text.")
+        return
+    details = cache.get_many(keys[:limit])
+    for key in keys[:limit]:
+        with st.expander(f"📖 {key}", expanded=True):
+            for column, text in details.get(key, {}).items():
+                st.markdown(f"**{column}**")
+                st.text(text)
+    if len(keys) > limit:
+        st.caption(f"Showing the first {limit} of {len(keys)} selected rows.")
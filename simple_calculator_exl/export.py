@@ -0,0 +1,155 @@
+"""
+Chunked export of selected catalog rows to CSV or Parquet.
+
+The grid only reports which rows are selected; their key columns are turned
+into row positions in the ``CatalogStore`` and the rows are read back from
+there, a chunk at a time, so an export of many thousands of rows never
+holds more than one chunk in the grid format.
+"""
+
+import io
+
+EXPORT_FORMATS = ("csv", "parquet")
+MIME_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+
+def selection_keys(selected, key_columns=("SKU_NBR", "Attributes")):
+    """
+    Return the row keys of the grid's selected rows.
+
+    Only the key columns are read, whatever else the rows carry.
+
+    Args:
+        selected (pandas.DataFrame|list[dict]|None): ``selected_rows`` from
+            the grid response
+        key_columns (tuple[str]): columns that identify a row
+
+    Returns:
+        list[str]: keys in the ``comments.row_keys`` format
+    """
+    if selected is None or len(selected) == 0:
+        return []
+    if isinstance(selected, list):
+        return ["|".join(str(row[c]) for c in key_columns) for row in selected]
+    from .comments import row_keys
+
+    return row_keys(selected, key_columns).tolist()
+
+
+def iter_chunks(store, positions, chunk_size=10_000, overlay=None):
+    """
+    Yield the rows at ``positions`` in the grid layout, chunk by chunk.
+
+    Args:
+        store (CatalogStore): backing rows
+        positions (numpy.ndarray): row positions to export, in order
+        chunk_size (int): rows per chunk
+        overlay (callable, optional): applied to each chunk, e.g. to fill in
+            saved comments
+
+    Yields:
+        pandas.DataFrame: at most ``chunk_size`` rows
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    for start in range(0, len(positions), chunk_size):
+        chunk = store.encode_block(
+            store.frame.take(positions[start : start + chunk_size])
+        )
+        yield chunk if overlay is None else overlay(chunk)
+
+
+def write_csv(chunks, out):
+    """Write DataFrame chunks to the text stream ``out`` as one CSV."""
+    header = True
+    for chunk in chunks:
+        chunk.to_csv(out, header=header, index=False)
+        header = False
+
+
+def write_parquet(chunks, out):
+    """Write DataFrame chunks to ``out`` as one Parquet row group each."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            if writer is None:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                writer = pq.ParquetWriter(out, table.schema)
+            else:
+                table = pa.Table.from_pandas(
+                    chunk, schema=writer.schema, preserve_index=False
+                )
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def export_rows(store, positions, fmt="csv", chunk_size=10_000, overlay=None):
+    """
+    Export the rows at ``positions`` and return the file contents.
+
+    Args:
+        store (CatalogStore): backing rows
+        positions (numpy.ndarray): row positions to export, in order
+        fmt (str): one of ``EXPORT_FORMATS``
+        chunk_size (int): rows converted at a time
+        overlay (callable, optional): applied to each chunk
+
+    Returns:
+        bytes: CSV or Parquet file contents
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}")
+    chunks = iter_chunks(store, positions, chunk_size, overlay)
+    out = io.BytesIO()
+    if fmt == "csv":
+        text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+        write_csv(chunks, text)
+        text.flush()
+        text.detach()
+    else:
+        write_parquet(chunks, out)
+    return out.getvalue()
+
+
+def export_panel(store, positions, overlay=None, preview_rows=5):
+    """
+    Show the selection's size, a short preview and an export button.
+
+    The file is only built when "Prepare export" is clicked; its bytes are
+    kept in the session for the download button until the selection or
+    format changes.
+
+    Args:
+        store (CatalogStore): backing rows
+        positions (numpy.ndarray): row positions to export, in order
+        overlay (callable, optional): applied to each exported chunk
+        preview_rows (int): rows shown inline
+    """
+    import hashlib
+
+    import numpy as np
+    import streamlit as st
+
+    st.write("✅ Selected Rows:", len(positions))
+    if not len(positions):
+        return
+    preview = next(iter_chunks(store, positions[:preview_rows], overlay=overlay))
+    st.dataframe(preview, hide_index=True)
+    fmt = st.radio("Export format", EXPORT_FORMATS, horizontal=True)
+    selection = (fmt, hashlib.sha1(np.asarray(positions).tobytes()).hexdigest())
+    if st.button(f"📦 Prepare export of {len(positions)} rows"):
+        data = export_rows(store, positions, fmt, overlay=overlay)
+        st.session_state.catalog_export = (selection, data)
+    prepared = st.session_state.get("catalog_export")
+    if prepared is not None and prepared[0] == selection:
+        st.download_button(
+            f"⬇️ Download {len(positions)} rows",
+            prepared[1],
+            file_name=f"catalog_selection.{fmt}",
+            mime=MIME_TYPES[fmt],
+        )
@@ -0,0 +1,289 @@
+"""
+Arithmetic expression engine.
+
+Expressions such as ``"a + b * 2"`` are parsed once, checked against a small
+arithmetic grammar, constant-folded and compiled to a Python function. The
+compiled form is kept in a bounded LRU cache keyed on the expression text, so
+evaluating the same formula again, or over many rows, never re-parses it.
+"""
+
+import ast
+import functools
+import numbers
+import operator
+from itertools import repeat
+
+CACHE_SIZE = 1024
+
+_BINARY = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_FUNCTIONS = {"abs": abs}
+# Integer results are capped so a short expression such as ``9**9**9`` cannot
+# tie up a process: powers at evaluation time, anything at compile time.
+_MAX_POWER_BITS = 1 << 16
+_MAX_FOLDED_BITS = 4096
+
+
+class ExpressionError(ValueError):
+    """Raised for expressions outside the supported arithmetic grammar."""
+
+
+class Expression:
+    """
+    A compiled arithmetic expression.
+
+    Attributes:
+        text (str): the source expression
+        variables (tuple[str]): free variable names, in first-use order
+    """
+
+    __slots__ = ("_function", "text", "variables")
+
+    def __init__(self, text, variables, function):
+        self.text = text
+        self.variables = variables
+        self._function = function
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+    def __call__(self, **bindings):
+        return self.evaluate(bindings)
+
+    def evaluate(self, bindings=None):
+        """
+        Evaluate the expression for one set of variable bindings.
+
+        Args:
+            bindings (dict, optional): variable name to value
+
+        Returns:
+            number: the result
+        """
+        bindings = bindings or {}
+        try:
+            args = [bindings[name] for name in self.variables]
+        except KeyError as exc:
+            raise ExpressionError(f"missing binding for {exc.args[0]!r}") from None
+        return self._function(*args)
+
+    def evaluate_many(self, bindings):
+        """
+        Evaluate the expression over many rows of bindings at once.
+
+        Args:
+            bindings (dict|iterable[dict]): either columns (variable name to a
+                sequence, NumPy array or scalar broadcast to every row) or an
+                iterable of per-row dicts
+
+        Returns:
+            list|numpy.ndarray: one result per row; a NumPy array when any
+            column is a NumPy array, which is then evaluated in one vector pass
+        """
+        if not isinstance(bindings, dict):
+            if not self.variables:
+                return [self._function() for _ in bindings]
+            row_args = operator.itemgetter(*self.variables)
+            try:
+                if len(self.variables) == 1:
+                    return [self._function(row_args(row)) for row in bindings]
+                return [self._function(*row_args(row)) for row in bindings]
+            except KeyError as exc:
+                raise ExpressionError(f"missing binding for {exc.args[0]!r}") from None
+
+        try:
+            columns = [bindings[name] for name in self.variables]
+        except KeyError as exc:
+            raise ExpressionError(f"missing binding for {exc.args[0]!r}") from None
+        if any(type(column).__module__ == "numpy" for column in columns):
+            import numpy as np
+
+            # Lists would otherwise keep list semantics, e.g. ``b * 2``
+            # repeating the list instead of doubling it.
+            return self._function(
+                *(
+                    c if isinstance(c, numbers.Number) else np.asarray(c)
+                    for c in columns
+                )
+            )
+
+        lengths = {len(c) for c in columns if not isinstance(c, numbers.Number)}
+        if len(lengths) > 1:
+            raise ExpressionError(
+                f"binding columns differ in length: {sorted(lengths)}"
+            )
+        length = lengths.pop() if lengths else 1
+        columns = [
+            repeat(c, length) if isinstance(c, numbers.Number) else c for c in columns
+        ]
+        return [self._function(*args) for args in zip(*columns)]
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(text):
+    """
+    Parse, fold and compile an arithmetic expression, with LRU caching.
+
+    Args:
+        text (str): expression using numbers, variables, ``+ - * / // % **``,
+            parentheses and ``abs(...)``
+
+    Returns:
+        Expression: the compiled expression
+
+    Raises:
+        ExpressionError: if the text is not a valid arithmetic expression
+    """
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise ExpressionError(f"invalid expression {text!r}: {exc.msg}") from None
+
+    variables = []
+    body = _Folder(text, variables).visit(tree.body)
+    lambda_node = ast.Lambda(
+        args=ast.arguments(
+            posonlyargs=[],
+            args=[ast.arg(arg=name) for name in variables],
+            kwonlyargs=[],
+            kw_defaults=[],
+            defaults=[],
+        ),
+        body=body,
+    )
+    code = compile(
+        ast.fix_missing_locations(ast.Expression(lambda_node)), "<expression>", "eval"
+    )
+    function = eval(code, {"__builtins__": {}, **_FUNCTIONS, **_HELPERS})
+    return Expression(text, tuple(variables), function)
+
+
+def evaluate(text, bindings=None, **kwargs):
+    """
+    Evaluate an expression string, compiling it through the cache.
+
+    Args:
+        text (str): the expression
+        bindings (dict, optional): variable name to value
+        **kwargs: further bindings
+
+    Returns:
+        number: the result
+    """
+    if kwargs:
+        bindings = {**(bindings or {}), **kwargs}
+    return compile_expression(text).evaluate(bindings)
+
+
+def _power(base, exponent):
+    """``base ** exponent``, refusing integer results over ``_MAX_POWER_BITS``."""
+    if (
+        isinstance(base, int)
+        and isinstance(exponent, int)
+        and _power_bits(base, exponent) > _MAX_POWER_BITS
+    ):
+        raise OverflowError(f"integer power {base} ** {exponent} is too large")
+    return base**exponent
+
+
+def _power_bits(base, exponent):
+    # Lower bound on the bit length of base ** exponent for integers.
+    if exponent <= 0 or abs(base) <= 1:
+        return 1
+    return (abs(base).bit_length() - 1) * exponent
+
+
+def _folded_bits(op, left, right):
+    """Bound the bit length of a constant integer result before computing it."""
+    if not (isinstance(left, int) and isinstance(right, int)):
+        return 0
+    if isinstance(op, ast.Pow):
+        return _power_bits(left, right)
+    if isinstance(op, ast.Mult):
+        return left.bit_length() + right.bit_length()
+    return max(left.bit_length(), right.bit_length()) + 1
+
+
+# Helpers the compiled code calls; their names cannot be used as variables.
+_HELPERS = {"__power__": _power}
+
+
+class _Folder(ast.NodeTransformer):
+    """Validate the tree against the grammar and fold constant subtrees."""
+
+    def __init__(self, text, variables):
+        self.text = text
+        self.variables = variables
+
+    def generic_visit(self, node):
+        raise ExpressionError(
+            f"unsupported syntax {type(node).__name__} in {self.text!r}"
+        )
+
+    def visit_Constant(self, node):
+        if isinstance(node.value, bool) or not isinstance(node.value, numbers.Number):
+            raise ExpressionError(
+                f"unsupported constant {node.value!r} in {self.text!r}"
+            )
+        return node
+
+    def visit_Name(self, node):
+        if node.id in _HELPERS:
+            raise ExpressionError(f"{node.id!r} is a reserved name in {self.text!r}")
+        if node.id in _FUNCTIONS:
+            raise ExpressionError(f"{node.id!r} can only be called in {self.text!r}")
+        if node.id not in self.variables:
+            self.variables.append(node.id)
+        return node
+
+    def visit_UnaryOp(self, node):
+        if type(node.op) not in _UNARY:
+            return self.generic_visit(node)
+        node.operand = self.visit(node.operand)
+        if isinstance(node.operand, ast.Constant):
+            return ast.Constant(_UNARY[type(node.op)](node.operand.value))
+        return node
+
+    def visit_BinOp(self, node):
+        if type(node.op) not in _BINARY:
+            return self.generic_visit(node)
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+        if (
+            isinstance(node.left, ast.Constant)
+            and isinstance(node.right, ast.Constant)
+            and _folded_bits(node.op, node.left.value, node.right.value)
+            <= _MAX_FOLDED_BITS
+        ):
+            try:
+                return ast.Constant(
+                    _BINARY[type(node.op)](node.left.value, node.right.value)
+                )
+            except ArithmeticError:
+                # Leave it for evaluation time so the error surfaces there.
+                pass
+        if isinstance(node.op, ast.Pow):
+            return ast.Call(
+                func=ast.Name(id="__power__", ctx=ast.Load()),
+                args=[node.left, node.right],
+                keywords=[],
+            )
+        return node
+
+    def visit_Call(self, node):
+        if (
+            not isinstance(node.func, ast.Name)
+            or node.func.id not in _FUNCTIONS
+            or node.keywords
+        ):
+            return self.generic_visit(node)
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
@@ -0,0 +1,464 @@
+"""
+Exact fixed-point addition for money-style values.
+
+Values are held as integer counts of ``10 ** -scale`` units (cents for the
+default scale of 2). Batches are parsed, packed into NumPy ``int64`` arrays
+and added in bulk; whenever a result could leave the 64-bit range the
+affected values are added again as Python ints, which never overflow.
+Results come back as ``Decimal`` or as plain strings, never as floats.
+"""
+
+import re
+from collections.abc import Sequence
+from decimal import Decimal
+from itertools import islice
+
+from .core import _numpy
+
+DEFAULT_SCALE = 2
+INT64_MAX = 2**63 - 1
+INT64_MIN = -(2**63)
+
+_PLAIN = re.compile(r"\s*([+-]?)(\d*)(?:\.(\d*))?\s*$")
+
+# Strings parsed at a time in bulk, and the longest one parsed there (sign,
+# point and newline included); anything longer goes through ``to_units``.
+_PARSE_CHUNK = 65536
+_PARSE_WIDTH = 20
+_PARSE_DIGITS = 17
+
+
+def to_units(value, scale=DEFAULT_SCALE):
+    """
+    Convert a value to an integer number of ``10 ** -scale`` units.
+
+    Floats are converted through their shortest ``repr``, so ``0.1`` is one
+    tenth, not the binary value nearest to it.
+
+    Args:
+        value (int|str|decimal.Decimal|float): amount, e.g. ``"12.34"``
+        scale (int): digits after the decimal point
+
+    Returns:
+        int: the amount in units, e.g. ``1234``
+
+    Raises:
+        ValueError: if the value is not a finite number or has more than
+            ``scale`` significant fractional digits
+    """
+    if isinstance(value, int):
+        return value * 10**scale
+    if isinstance(value, float):
+        value = repr(value)
+    if isinstance(value, str):
+        match = _PLAIN.match(value)
+        if match and (match.group(2) or match.group(3)):
+            sign, whole, fraction = match.groups()
+            fraction = (fraction or "").rstrip("0")
+            if len(fraction) > scale:
+                raise ValueError(f"{value!r} has more than {scale} decimal places")
+            units = int(whole or "0") * 10**scale + int(fraction.ljust(scale, "0") or 0)
+            return -units if sign == "-" else units
+        value = Decimal(value)
+    if isinstance(value, Decimal):
+        if not value.is_finite():
+            raise ValueError(f"{value!r} is not a finite number")
+        numerator, denominator = value.as_integer_ratio()
+        units, remainder = divmod(numerator * 10**scale, denominator)
+        if remainder:
+            raise ValueError(f"{value!r} has more than {scale} decimal places")
+        return units
+    raise TypeError(f"cannot convert {type(value).__name__} to fixed point")
+
+
+def to_units_many(values, scale=DEFAULT_SCALE):
+    """
+    Convert many values with ``to_units``.
+
+    With NumPy installed, plain decimal strings (and ints, floats and
+    ``Decimal`` values, through their text) are parsed in bulk: the text is
+    laid out as a byte matrix, one right-aligned row per value, and the digits
+    are weighted and summed per row. Whatever that parser does not cover
+    (exponents, whitespace, more than 17 digits) goes through ``to_units``.
+    Without NumPy, strings with exactly ``scale`` decimals skip the general
+    parser: dropping the point gives the units.
+
+    Args:
+        values (iterable): amounts as ints, strings, ``Decimal`` or floats
+        scale (int): digits after the decimal point
+
+    Returns:
+        numpy.ndarray|list[int]: the amounts in units, as an ``int64`` array
+        when NumPy is installed and they all fit
+
+    Raises:
+        ValueError: as ``to_units`` does, for the first offending value
+    """
+    values = values if isinstance(values, list) else list(values)
+    np = _numpy()
+    texts = None if np is None or scale > _PARSE_DIGITS else _texts(values)
+    if texts is None:
+        units = []
+        append = units.append
+        for value in values:
+            if type(value) is str and scale and value[-scale - 1 : -scale] == ".":
+                try:
+                    append(int(value.replace(".", "", 1)))
+                    continue
+                except ValueError:
+                    pass
+            append(to_units(value, scale))
+        return units
+
+    units = np.zeros(len(values), dtype=np.int64)
+    slow = np.zeros(len(values), dtype=bool)
+    for start in range(0, len(values), _PARSE_CHUNK):
+        stop = start + _PARSE_CHUNK
+        parsed = _parse_many(np, texts[start:stop], scale)
+        if parsed is None:
+            slow[start:stop] = True
+        else:
+            units[start:stop], slow[start:stop] = parsed
+    rows = np.flatnonzero(slow).tolist()
+    exact = [to_units(values[i], scale) for i in rows]
+    packed = _pack(np, exact)
+    if packed is None:
+        units = units.tolist()
+        for i, value in zip(rows, exact):
+            units[i] = value
+        return units
+    units[rows] = packed
+    return units
+
+
+def _texts(values):
+    """Return ``values`` as strings for the bulk parser, or ``None``."""
+    kinds = set(map(type, values))
+    if kinds <= {str}:
+        return values
+    if kinds <= {str, int, float, Decimal}:
+        # str() of a float is its shortest repr, as in to_units.
+        return list(map(str, values))
+    return None
+
+
+def _parse_many(np, texts, scale):
+    """
+    Parse plain decimal strings into ``int64`` units in bulk.
+
+    Each string becomes one row of a byte matrix, right-aligned on the
+    newline that ends it, so a digit's power of ten only depends on its
+    column and on whether the point is to its right. Rows are flagged for
+    ``to_units`` unless they are an optional sign, 1 to 17 digits and at most
+    one point followed by at most ``scale`` digits, and their units fit.
+
+    Returns:
+        tuple|None: ``(units, slow)`` arrays, or ``None`` if the strings
+        cannot be laid out (non-ASCII text or embedded newlines)
+    """
+    try:
+        text = ("\n".join(texts) + "\n").encode("ascii")
+    except UnicodeEncodeError:
+        return None
+    buffer = np.frombuffer(text, dtype=np.uint8)
+    ends = np.flatnonzero(buffer == 10)
+    n = len(texts)
+    if len(ends) != n:
+        return None
+    lengths = np.diff(ends, prepend=-1)
+    width = int(min(lengths.max(), _PARSE_WIDTH))
+    padded = np.concatenate([np.zeros(width, dtype=np.uint8), buffer])
+    chars = np.lib.stride_tricks.sliding_window_view(padded, width)[ends + 1]
+    columns = np.arange(width, dtype=np.uint8)
+    first = (width - np.minimum(lengths, width)).astype(np.uint8)
+    # Windows start inside the previous string; blank that part out.
+    chars *= columns >= first[:, None]
+
+    digits = chars - 48
+    is_digit = digits < 10
+    digits *= is_digit
+    is_point = (chars == 46).view(np.uint8)
+    ones = np.ones(width, dtype=np.uint8)
+    counts = is_digit.view(np.uint8) @ ones
+    points = is_point @ ones
+    point_at = np.where(points == 1, (is_point @ columns).astype(np.int64), -1)
+    head = chars[np.arange(n), first]
+    negative = head == 45
+    fraction = np.where(points == 1, width - 2 - point_at, 0)
+    slow = (
+        (lengths > width)
+        | (counts + points + (negative | (head == 43)) + 1 != lengths)
+        | (points > 1)
+        | (counts == 0)
+        | (counts > _PARSE_DIGITS)
+        | (fraction > scale)
+    )
+
+    units = np.zeros(n, dtype=np.int64)
+    powers = width - 2 - np.arange(width)
+    for at in np.flatnonzero(np.bincount(point_at + 1)) - 1:
+        # The point takes a column: digits left of it are a power lower.
+        weights = 10 ** np.maximum(powers - (np.arange(width) < at), 0)
+        rows = point_at == at
+        if rows.all():
+            units = digits @ weights
+        else:
+            units[rows] = digits[rows] @ weights
+    factors = (10 ** np.arange(scale + 1))[scale - np.minimum(fraction, scale)]
+    slow |= units > INT64_MAX // factors
+    units *= factors
+    np.negative(units, out=units, where=negative)
+    return units, slow
+
+
+def from_units(units, scale=DEFAULT_SCALE, as_str=False):
+    """
+    Convert a unit count back to an exact amount.
+
+    Args:
+        units (int): amount in ``10 ** -scale`` units
+        scale (int): digits after the decimal point
+        as_str (bool): return a string such as ``"-12.30"`` instead of a
+            ``Decimal``
+
+    Returns:
+        decimal.Decimal|str: the amount with exactly ``scale`` decimals
+    """
+    units = int(units)
+    whole, fraction = divmod(abs(units), 10**scale)
+    text = f"{'-' if units < 0 else ''}{whole}"
+    if scale:
+        text += f".{fraction:0{scale}d}"
+    return text if as_str else Decimal(text)
+
+
+def from_units_many(units, scale=DEFAULT_SCALE, as_str=False):
+    """
+    Convert many unit counts back to exact amounts with ``from_units``.
+
+    With NumPy installed, counts that fit ``int64`` are formatted in bulk:
+    their digits are written into one byte matrix, which is decoded and split
+    into strings once.
+
+    Args:
+        units (list[int]|numpy.ndarray): amounts in ``10 ** -scale`` units
+        scale (int): digits after the decimal point
+        as_str (bool): return strings instead of ``Decimal`` values
+
+    Returns:
+        list[decimal.Decimal|str]: the amounts with exactly ``scale`` decimals
+    """
+    np = _numpy()
+    packed = None if np is None or scale > _PARSE_DIGITS else _pack(np, units)
+    if packed is None or not len(packed):
+        return [from_units(u, scale, as_str) for u in units]
+    texts = _format_many(np, packed, scale)
+    return texts if as_str else list(map(Decimal, texts))
+
+
+def _format_many(np, units, scale):
+    """Return ``int64`` units as strings with exactly ``scale`` decimals."""
+    n = len(units)
+    negative = units < 0
+    # Two's complement negation of the unsigned view also covers INT64_MIN.
+    magnitude = units.astype(np.uint64)
+    np.negative(magnitude, out=magnitude, where=negative)
+    powers = 10 ** np.arange(20, dtype=np.uint64)
+    count = np.maximum(np.searchsorted(powers, magnitude, side="right"), scale + 1)
+    # Digits are written four at a time from a table of "0000".."9999".
+    table = np.frombuffer(
+        "".join(f"{i:04d}" for i in range(10000)).encode("ascii"), dtype=np.uint8
+    ).reshape(10000, 4)
+    blocks = -(-int(count.max()) // 4)
+    digits = np.empty((n, 4 * blocks), dtype=np.uint8)
+    for block in range(blocks, 0, -1):
+        magnitude, low = np.divmod(magnitude, 10000)
+        digits[:, 4 * block - 4 : 4 * block] = table[low]
+    split = digits.shape[1] - scale
+    parts = [np.zeros((n, 1), dtype=np.uint8), digits[:, :split]]
+    if scale:
+        parts += [np.full((n, 1), 46, dtype=np.uint8), digits[:, split:]]
+    chars = np.concatenate([*parts, np.full((n, 1), 10, dtype=np.uint8)], axis=1)
+    width = chars.shape[1]
+    first = width - (negative + count + bool(scale) + 1)
+    rows = np.flatnonzero(negative)
+    chars[rows, first[rows]] = 45
+    keep = np.arange(width) >= first[:, None]
+    return chars[keep].tobytes().decode("ascii").split("\n")[:-1]
+
+
+def add_exact(a, b, scale=DEFAULT_SCALE, as_str=False):
+    """
+    Return the exact sum of two amounts.
+
+    Args:
+        a (int|str|decimal.Decimal|float): first addend
+        b (int|str|decimal.Decimal|float): second addend
+        scale (int): digits after the decimal point
+        as_str (bool): return a string instead of a ``Decimal``
+
+    Returns:
+        decimal.Decimal|str: a + b
+    """
+    return from_units(to_units(a, scale) + to_units(b, scale), scale, as_str)
+
+
+def add_many_exact(a, b, scale=DEFAULT_SCALE, as_str=False):
+    """
+    Return the exact element-wise sum of two equally long sequences.
+
+    Args:
+        a (iterable): first addends
+        b (iterable): second addends
+        scale (int): digits after the decimal point
+        as_str (bool): return strings instead of ``Decimal`` values
+
+    Returns:
+        Amounts: one sum per pair; compares equal to the list of sums
+
+    Raises:
+        ValueError: if the sequences differ in length
+    """
+    left = to_units_many(a, scale)
+    right = to_units_many(b, scale)
+    if len(left) != len(right):
+        raise ValueError(
+            f"operands could not be added together: lengths {len(left)} and "
+            f"{len(right)}"
+        )
+    return Amounts(add_units(left, right), scale, as_str)
+
+
+class Amounts(Sequence):
+    """
+    A read-only sequence of exact amounts kept as unit counts.
+
+    The counts stay an ``int64`` array (a list of ints once one leaves the
+    64-bit range) and are only turned into ``Decimal`` values or strings when
+    read: one at a time by index, or all at once in bulk by ``tolist`` or
+    iteration.
+
+    Args:
+        units (numpy.ndarray|list[int]): amounts in ``10 ** -scale`` units
+        scale (int): digits after the decimal point
+        as_str (bool): return strings instead of ``Decimal`` values
+    """
+
+    def __init__(self, units, scale=DEFAULT_SCALE, as_str=False):
+        self.units = units
+        self.scale = scale
+        self.as_str = as_str
+
+    def __len__(self):
+        return len(self.units)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return Amounts(self.units[index], self.scale, self.as_str)
+        return from_units(self.units[index], self.scale, self.as_str)
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, (Amounts, list, tuple)):
+            return self.tolist() == list(other)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Amounts({self.tolist()!r})"
+
+    def tolist(self):
+        """Return the amounts as a list of ``Decimal`` values or strings."""
+        return from_units_many(self.units, self.scale, self.as_str)
+
+
+def sum_exact(values, scale=DEFAULT_SCALE, as_str=False, chunk_size=65536):
+    """
+    Return the exact total of an iterable of amounts.
+
+    Values are converted and summed one chunk at a time, so the input may be
+    a generator of any length.
+
+    Args:
+        values (iterable): amounts as ints, strings, ``Decimal`` or floats
+        scale (int): digits after the decimal point
+        as_str (bool): return a string instead of a ``Decimal``
+        chunk_size (int): values converted at a time
+
+    Returns:
+        decimal.Decimal|str: the total
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    iterator = iter(values)
+    total = 0
+    while chunk := list(islice(iterator, chunk_size)):
+        total += sum_units(to_units_many(chunk, scale))
+    return from_units(total, scale, as_str)
+
+
+def sum_units(units):
+    """
+    Return the exact total of unit counts as a Python int.
+
+    The values are summed as one ``int64`` array unless the largest value
+    times the count could overflow, in which case they are summed as Python
+    ints.
+
+    Args:
+        units (list[int]|numpy.ndarray): amounts in units
+
+    Returns:
+        int: the total
+    """
+    np = _numpy()
+    if np is None or not len(units):
+        return sum(int(u) for u in units)
+    packed = _pack(np, units)
+    if packed is None:
+        return sum(int(u) for u in units)
+    bound = max(-int(packed.min()), int(packed.max()))
+    if bound * len(packed) <= INT64_MAX:
+        return int(packed.sum())
+    return sum(packed.tolist())
+
+
+def add_units(left, right):
+    """
+    Return the exact element-wise sum of two unit-count sequences.
+
+    Pairs whose ``int64`` sum wrapped around are recomputed as Python ints.
+
+    Args:
+        left (list[int]|numpy.ndarray): first amounts in units
+        right (list[int]|numpy.ndarray): second amounts in units
+
+    Returns:
+        numpy.ndarray|list[int]: one total per pair, as an ``int64`` array
+        when NumPy is installed and every total fits
+    """
+    np = _numpy()
+    packed = None if np is None else (_pack(np, left), _pack(np, right))
+    if packed is None or packed[0] is None or packed[1] is None:
+        return [int(x) + int(y) for x, y in zip(left, right)]
+    x, y = packed
+    result = np.add(x, y)
+    # Signed overflow: both operands share a sign the result does not have.
+    wrapped = ((x ^ result) & (y ^ result)) < 0
+    if not wrapped.any():
+        return result
+    totals = result.tolist()
+    for i in np.flatnonzero(wrapped).tolist():
+        totals[i] = int(x[i]) + int(y[i])
+    return totals
+
+
+def _pack(np, units):
+    """Return ``units`` as an int64 array, or ``None`` if any do not fit."""
+    if isinstance(units, np.ndarray) and units.dtype == np.int64:
+        return units
+    try:
+        return np.asarray(units, dtype=np.int64)
+    except OverflowError:
+        return None
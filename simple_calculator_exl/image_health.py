@@ -0,0 +1,277 @@
+"""
+Concurrent validation of catalog image URLs.
+
+``ImageValidator`` checks URLs with ``HEAD`` requests on asyncio, at most
+``concurrency`` in flight overall and ``per_host`` connections per host.
+Hosts that refuse ``HEAD`` (405, 403 or 501, as many CDNs do) are asked
+again with a one-byte ranged ``GET`` before a URL is reported broken.
+Connections are kept alive and reused for later URLs on the same host.
+Results are cached with a TTL, so only new or expired URLs go out on later
+calls. ``health_flags`` turns the results into one flag per catalog row.
+"""
+
+import asyncio
+import json
+import ssl
+import threading
+import time
+from collections import namedtuple
+from urllib.parse import urljoin, urlsplit
+
+UrlStatus = namedtuple("UrlStatus", "url ok status error checked_at")
+
+HEALTH_OK = "✅"
+HEALTH_PARTIAL = "⚠️"
+HEALTH_BROKEN = "❌"
+HEALTH_NONE = ""
+
+_MAX_REDIRECTS = 5
+# HEAD answers that only say the host does not take HEAD requests.
+_HEAD_REFUSED = (403, 405, 501)
+# Rough footprint of one cached result: the URL, the tuple and its fields.
+_RESULT_BYTES = 400
+_USER_AGENT = "simple-calculator-exl image check"
+
+
+class _HostPool:
+    """Idle keep-alive connections to one host, at most ``size`` open."""
+
+    def __init__(self, scheme, host, port, size, timeout):
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.slots = asyncio.Semaphore(size)
+        self.idle = []
+
+    async def connect(self):
+        if self.idle:
+            return self.idle.pop()
+        context = ssl.create_default_context() if self.scheme == "https" else None
+        return await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=context),
+            self.timeout,
+        )
+
+    def release(self, connection, reusable):
+        if reusable:
+            self.idle.append(connection)
+        else:
+            connection[1].close()
+
+    def close(self):
+        for _, writer in self.idle:
+            writer.close()
+        self.idle.clear()
+
+
+class ImageValidator:
+    """
+    Check image URLs concurrently and cache the results.
+
+    Args:
+        concurrency (int): requests in flight at once
+        per_host (int): open connections per host
+        timeout (float): seconds allowed per request
+        ttl (float): seconds a result stays valid
+        max_results (int): results kept; the oldest checks are dropped first
+    """
+
+    def __init__(
+        self, concurrency=32, per_host=6, timeout=5.0, ttl=3600.0, max_results=50_000
+    ):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_results = max_results
+        self.requests = 0
+        self._results = {}
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """Memory the result cache can grow to, approximately."""
+        return self.max_results * _RESULT_BYTES
+
+    def cached(self, url):
+        """Return the unexpired result for ``url``, or ``None``."""
+        with self._lock:
+            status = self._results.get(url)
+        if status is not None and time.time() - status.checked_at < self.ttl:
+            return status
+        return None
+
+    def validate(self, urls):
+        """
+        Check ``urls`` and return their results.
+
+        Cached results are reused; the rest are checked in one event loop.
+
+        Args:
+            urls (iterable[str]): image URLs; duplicates are checked once
+
+        Returns:
+            dict[str, UrlStatus]: result per URL
+        """
+        results, pending = {}, []
+        for url in dict.fromkeys(urls):
+            status = self.cached(url)
+            if status is None:
+                pending.append(url)
+            else:
+                results[url] = status
+        if pending:
+            checked = asyncio.run(self.check_many(pending))
+            with self._lock:
+                for url, status in checked.items():
+                    self._results.pop(url, None)
+                    self._results[url] = status
+                while len(self._results) > self.max_results:
+                    del self._results[next(iter(self._results))]
+            results.update(checked)
+        return results
+
+    async def check_many(self, urls):
+        """Check ``urls`` without the cache and return a result per URL."""
+        limit = asyncio.Semaphore(self.concurrency)
+        pools = {}
+
+        async def bounded(url):
+            async with limit:
+                return await self._check(url, pools)
+
+        try:
+            statuses = await asyncio.gather(*(bounded(url) for url in urls))
+        finally:
+            for pool in pools.values():
+                pool.close()
+        return {status.url: status for status in statuses}
+
+    async def _check(self, url, pools):
+        target, method = url, "HEAD"
+        try:
+            for _ in range(_MAX_REDIRECTS + 2):
+                status, location = await self._head(target, pools, method)
+                if 300 <= status < 400 and location:
+                    target = urljoin(target, location)
+                    continue
+                if method == "HEAD" and status in _HEAD_REFUSED:
+                    method = "GET"
+                    continue
+                return UrlStatus(url, 200 <= status < 300, status, None, time.time())
+            error = "too many redirects"
+        except (
+            OSError,
+            TimeoutError,
+            ValueError,
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+        ) as exc:
+            error = str(exc) or type(exc).__name__
+        return UrlStatus(url, False, None, error, time.time())
+
+    async def _head(self, url, pools, method="HEAD"):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ValueError(f"unsupported URL {url!r}")
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        key = (parts.scheme, parts.hostname, port)
+        if key not in pools:
+            pools[key] = _HostPool(*key, self.per_host, self.timeout)
+        pool = pools[key]
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+
+        async with pool.slots:
+            # A pooled connection may have been closed by the server since
+            # its last use, so retry once on a fresh one.
+            for attempt in range(2):
+                fresh = not pool.idle
+                connection = await pool.connect()
+                try:
+                    status, headers = await asyncio.wait_for(
+                        self._request(connection, parts.netloc, path, method),
+                        self.timeout,
+                    )
+                except (OSError, ValueError, asyncio.IncompleteReadError):
+                    pool.release(connection, False)
+                    if fresh or attempt:
+                        raise
+                    continue
+                except BaseException:
+                    pool.release(connection, False)
+                    raise
+                # A GET's body is left unread, so its connection is closed.
+                reusable = (
+                    method == "HEAD"
+                    and headers.get("connection", "").lower() != "close"
+                )
+                pool.release(connection, reusable)
+                return status, headers.get("location")
+
+    async def _request(self, connection, host, path, method="HEAD"):
+        reader, writer = connection
+        self.requests += 1
+        extra = "Range: bytes=0-0\r\n" if method == "GET" else ""
+        writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {host}\r\n"
+            f"User-Agent: {_USER_AGENT}\r\nAccept: image/*\r\n{extra}\r\n".encode(
+                "latin-1"
+            )
+        )
+        await writer.drain()
+        status_line = await reader.readuntil(b"\r\n")
+        fields = status_line.decode("latin-1").split(maxsplit=2)
+        if len(fields) < 2 or not fields[0].startswith("HTTP/"):
+            raise ValueError(f"bad status line {status_line!r}")
+        headers = {}
+        while True:
+            line = await reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if (
+            fields[0] == "HTTP/1.0"
+            and "keep-alive" not in headers.get("connection", "").lower()
+        ):
+            headers["connection"] = "close"
+        return int(fields[1]), headers
+
+
+def health_flags(images, results):
+    """
+    Return one image-health flag per row.
+
+    Args:
+        images (iterable[str|list[str]]): each row's image URLs, as a list or
+            the grid's JSON string
+        results (dict[str, UrlStatus]): ``ImageValidator.validate`` output
+
+    Returns:
+        list[str]: ``HEALTH_OK`` when every URL works, ``HEALTH_PARTIAL``
+        when some do, ``HEALTH_BROKEN`` when none do and ``HEALTH_NONE`` for
+        rows without images
+    """
+    flags = []
+    for urls in images:
+        if isinstance(urls, str):
+            urls = json.loads(urls)
+        working = sum(results[url].ok for url in urls if url in results)
+        if not urls:
+            flags.append(HEALTH_NONE)
+        elif working == len(urls):
+            flags.append(HEALTH_OK)
+        elif working:
+            flags.append(HEALTH_PARTIAL)
+        else:
+            flags.append(HEALTH_BROKEN)
+    return flags
+
+
+def drop_broken(images, results):
+    """Return the grid's JSON image list without URLs known to be broken."""
+    urls = json.loads(images)
+    return json.dumps([url for url in urls if url not in results or results[url].ok])
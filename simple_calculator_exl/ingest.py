@@ -0,0 +1,434 @@
+"""
+Streaming ingestion of catalog exports into a ``CatalogStore``.
+
+Exports are CSV (optionally compressed), Parquet or JSON Lines files in the
+``catalog.CATALOG`` layout, one row per SKU attribute. They are read
+``chunk_size`` rows at a time with explicit column dtypes; each chunk is
+validated, its image lists are normalized to lists of URLs, and it is folded
+straight into the compact columns of the store, so the raw text of the whole
+export is never held at once. The result can be saved as a snapshot that
+``CatalogStore.open`` maps back in milliseconds.
+
+Run it with ``python -m simple_calculator_exl.ingest export.csv --output DIR``.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from .catalog_store import IMAGES_COLUMN, KEY_COLUMNS, TEXT_COLUMNS
+
+FORMATS = ("csv", "parquet", "jsonl")
+REQUIRED_COLUMNS = ("SKU_NBR", "Attributes")
+# Store column order; columns missing from an export get these defaults.
+COLUMN_DEFAULTS = {
+    "SKU_NBR": None,
+    "Product_Name": "",
+    "Attributes": None,
+    "STIBO_Data": "",
+    "Recommended_Value": "",
+    "Scoring": float("nan"),
+    IMAGES_COLUMN: "",
+    "Comment": "",
+}
+# Dtypes the raw columns are parsed with; Scoring is converted after
+# validation so a bad value is reported with its row instead of failing the
+# parse.
+READ_DTYPES = dict.fromkeys(COLUMN_DEFAULTS, "string")
+MAX_ERRORS = 5
+
+_SUFFIXES = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+}
+_COMPRESSION = (".gz", ".bz2", ".xz", ".zst", ".zip")
+_URL_SEPARATORS = re.compile(r"[\s,;|]+")
+
+
+class CatalogSchemaError(ValueError):
+    """An export does not have the catalog's columns or values."""
+
+
+def detect_format(path):
+    """
+    Return the export format of ``path`` from its suffix.
+
+    Compression suffixes such as ``.gz`` are skipped.
+
+    Raises:
+        ValueError: if the suffix is not a known format
+    """
+    suffixes = [s.lower() for s in Path(path).suffixes]
+    while suffixes and suffixes[-1] in _COMPRESSION:
+        suffixes.pop()
+    if suffixes and suffixes[-1] in _SUFFIXES:
+        return _SUFFIXES[suffixes[-1]]
+    raise ValueError(f"cannot tell the format of {str(path)!r}, expected {FORMATS}")
+
+
+def read_chunks(path, fmt=None, chunk_size=100_000):
+    """
+    Read an export ``chunk_size`` rows at a time.
+
+    Only the catalog's columns are read, all of them as strings except
+    Parquet and JSON values that are already typed.
+
+    Args:
+        path (str|os.PathLike): export file
+        fmt (str, optional): one of ``FORMATS``; detected from the suffix
+        chunk_size (int): rows per chunk
+
+    Yields:
+        pandas.DataFrame: raw rows of the export
+    """
+    import pandas as pd
+
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}, expected one of {FORMATS}")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if fmt == "csv":
+        sep = "\t" if ".tsv" in Path(path).suffixes else ","
+        with pd.read_csv(
+            path,
+            sep=sep,
+            dtype=READ_DTYPES,
+            usecols=lambda name: name in COLUMN_DEFAULTS,
+            keep_default_na=False,
+            chunksize=chunk_size,
+        ) as reader:
+            yield from reader
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        source = pq.ParquetFile(path)
+        present = [n for n in source.schema_arrow.names if n in COLUMN_DEFAULTS]
+        for batch in source.iter_batches(batch_size=chunk_size, columns=present):
+            yield batch.to_pandas()
+    else:
+        with pd.read_json(
+            path, lines=True, dtype=False, chunksize=chunk_size
+        ) as reader:
+            for chunk in reader:
+                yield chunk[[n for n in chunk.columns if n in COLUMN_DEFAULTS]]
+
+
+def normalize_images(cell):
+    """
+    Return a row's images as a list of URLs.
+
+    Accepts a list or array of URLs, the grid's JSON string, or URLs
+    separated by whitespace, commas, semicolons or ``|``. Blank and repeated
+    URLs are dropped.
+
+    Args:
+        cell (str|list|numpy.ndarray|None): the raw ``Images`` value
+
+    Returns:
+        list[str]: the row's URLs in their original order
+    """
+    if cell is None:
+        return []
+    if isinstance(cell, str):
+        text = cell.strip()
+        if not text:
+            return []
+        urls = json.loads(text) if text.startswith("[") else _URL_SEPARATORS.split(text)
+    elif isinstance(cell, float):
+        # A missing value read as NaN.
+        return []
+    else:
+        urls = list(cell)
+    return list(dict.fromkeys(str(url).strip() for url in urls if url))
+
+
+def validate_chunk(chunk, first_row=1):
+    """
+    Check one chunk and return it with normalized values.
+
+    Args:
+        chunk (pandas.DataFrame): raw rows from ``read_chunks``
+        first_row (int): 1-based row number of the chunk's first row
+
+    Returns:
+        tuple: the chunk with every catalog column as strings (``Scoring``
+        as float), and the image count of each row with all image URLs row
+        after row
+
+    Raises:
+        CatalogSchemaError: for missing required columns, blank keys,
+            non-numeric scores, malformed image lists or non-HTTP image URLs
+    """
+    import pandas as pd
+
+    missing = [name for name in REQUIRED_COLUMNS if name not in chunk.columns]
+    if missing:
+        raise CatalogSchemaError(f"missing required columns: {', '.join(missing)}")
+
+    columns = {}
+    errors = []
+    for name, default in COLUMN_DEFAULTS.items():
+        if name == IMAGES_COLUMN:
+            continue
+        if name not in chunk.columns:
+            columns[name] = pd.Series(default, index=chunk.index)
+        elif name == "Scoring":
+            raw = chunk[name]
+            scores = pd.to_numeric(raw.replace("", None), errors="coerce")
+            bad = scores.isna() & raw.notna() & (raw.astype(str).str.strip() != "")
+            errors += [
+                f"row {first_row + i}: Scoring {raw.iloc[i]!r} is not a number"
+                for i in bad.to_numpy().nonzero()[0][:MAX_ERRORS]
+            ]
+            columns[name] = scores.astype(float)
+        else:
+            text = chunk[name].astype("string").fillna("").str.strip()
+            if name in REQUIRED_COLUMNS:
+                errors += [
+                    f"row {first_row + i}: {name} is blank"
+                    for i in (text == "").to_numpy().nonzero()[0][:MAX_ERRORS]
+                ]
+            columns[name] = text
+
+    raw = chunk[IMAGES_COLUMN] if IMAGES_COLUMN in chunk.columns else None
+    counts, urls, bad = _split_images(raw, len(chunk))
+    errors += [
+        f"row {first_row + i}: Images {problem}" for i, problem in bad[:MAX_ERRORS]
+    ]
+
+    if errors:
+        raise CatalogSchemaError(_summary(errors))
+    return pd.DataFrame(columns, index=chunk.index), (counts, urls)
+
+
+def _split_images(raw, rows):
+    """
+    Return per-row image counts, the URLs row after row, and bad rows.
+
+    Delimited text is split for the whole chunk at once with Arrow compute
+    kernels; JSON strings and list values go through ``normalize_images``.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if raw is None:
+        return np.zeros(rows, dtype=np.int64), [], []
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    cells = raw.astype(object).where(raw.notna(), None)
+    try:
+        text = pa.array(cells, pa.string())
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        text = None
+    if text is not None:
+        text = pc.utf8_trim_whitespace(text.fill_null(""))
+    if text is not None and not pc.any(pc.starts_with(text, "[")).as_py():
+        lists = pc.split_pattern_regex(text, _URL_SEPARATORS.pattern)
+        flat = pc.list_flatten(lists)
+        parents = pc.list_parent_indices(lists).to_numpy()
+        keep = pc.not_equal(flat, "").to_numpy(zero_copy_only=False)
+        # Drop a URL repeated within its own row, keeping the first.
+        keep &= ~pd.DataFrame({"row": parents, "url": flat}).duplicated().to_numpy()
+        flat, parents = flat.filter(pa.array(keep)), parents[keep]
+        http = pc.or_(pc.starts_with(flat, "http://"), pc.starts_with(flat, "https://"))
+        broken = parents[~http.to_numpy(zero_copy_only=False)]
+        bad = [(int(i), "has a non-HTTP URL") for i in np.unique(broken)]
+        return np.bincount(parents, minlength=rows), flat.to_pylist(), bad
+
+    counts, urls, bad = np.zeros(rows, dtype=np.int64), [], []
+    for i, cell in enumerate(cells.tolist()):
+        try:
+            row = normalize_images(cell)
+        except ValueError:
+            bad.append((i, "is not a valid list"))
+            continue
+        if not all(url.startswith(("http://", "https://")) for url in row):
+            bad.append((i, "has a non-HTTP URL"))
+        counts[i] = len(row)
+        urls += row
+    return counts, urls, bad
+
+
+class _StoreBuilder:
+    """Fold validated chunks into the compact columns of a store."""
+
+    def __init__(self):
+        self.rows = 0
+        self._columns = {name: [] for name in COLUMN_DEFAULTS if name != IMAGES_COLUMN}
+        self._image_counts = []
+        self._image_values = []
+
+    def add(self, frame, images):
+        import pandas as pd
+
+        counts, urls = images
+
+        for name, parts in self._columns.items():
+            values = frame[name]
+            if name in KEY_COLUMNS:
+                parts.append(pd.Categorical(values.to_numpy(dtype=object)))
+            elif name in TEXT_COLUMNS:
+                parts.append(values.astype("string[pyarrow]").reset_index(drop=True))
+            else:
+                parts.append(values.to_numpy(dtype=float))
+        self._image_counts.append(counts)
+        self._image_values.append(pd.Categorical(urls))
+        self.rows += len(frame)
+
+    def build(self):
+        import numpy as np
+        import pandas as pd
+        from pandas.api.types import union_categoricals
+
+        from .catalog_store import CatalogStore
+
+        # Sorted categories, as ``pd.Categorical`` gives an in-memory store:
+        # the row model sorts categoricals by category order, which would
+        # otherwise be the order values first appeared in across chunks.
+        data = {}
+        for name, parts in self._columns.items():
+            if name in KEY_COLUMNS:
+                data[name] = (
+                    union_categoricals(parts, sort_categories=True)
+                    if parts
+                    else pd.Categorical([])
+                )
+            elif name in TEXT_COLUMNS:
+                data[name] = (
+                    pd.concat(parts, ignore_index=True)
+                    if parts
+                    else pd.array([], dtype="string[pyarrow]")
+                )
+            else:
+                data[name] = np.concatenate(parts) if parts else np.empty(0)
+        frame = pd.DataFrame(data)
+        counts = np.concatenate(self._image_counts or [np.empty(0, np.int64)])
+        offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        values = (
+            union_categoricals(self._image_values, sort_categories=True)
+            if self._image_values
+            else pd.Categorical([])
+        )
+        return CatalogStore(frame, offsets, values, list(COLUMN_DEFAULTS))
+
+
+def ingest_catalog(path, fmt=None, chunk_size=100_000, output=None):
+    """
+    Read an export into a ``CatalogStore``, chunk by chunk.
+
+    Args:
+        path (str|os.PathLike): CSV, Parquet or JSON Lines export
+        fmt (str, optional): one of ``FORMATS``; detected from the suffix
+        chunk_size (int): rows parsed and validated at a time
+        output (str|os.PathLike, optional): also save the store as a
+            snapshot in this directory
+
+    Returns:
+        catalog_store.CatalogStore: the validated catalog
+
+    Raises:
+        CatalogSchemaError: if the export does not match the catalog schema,
+            including repeated ``(SKU_NBR, Attributes)`` pairs
+    """
+    builder = _StoreBuilder()
+    for chunk in read_chunks(path, fmt, chunk_size):
+        frame, images = validate_chunk(chunk, first_row=builder.rows + 1)
+        builder.add(frame, images)
+    store = builder.build()
+    _check_unique_keys(store.frame)
+    if output is not None:
+        store.save(output)
+    return store
+
+
+def _check_unique_keys(frame):
+    """Reject exports that list an attribute of a SKU twice."""
+    import numpy as np
+
+    skus = frame["SKU_NBR"].cat.codes.to_numpy(dtype=np.int64)
+    attributes = frame["Attributes"].cat.codes.to_numpy(dtype=np.int64)
+    pairs = skus * max(len(frame["Attributes"].cat.categories), 1) + attributes
+    _, first, counts = np.unique(pairs, return_index=True, return_counts=True)
+    repeated = np.sort(first[counts > 1])
+    if len(repeated):
+        raise CatalogSchemaError(
+            _summary(
+                [
+                    f"row {i + 1}: SKU {frame['SKU_NBR'].iloc[i]} lists "
+                    f"{frame['Attributes'].iloc[i]!r} more than once"
+                    for i in repeated[:MAX_ERRORS]
+                ],
+                len(repeated),
+            )
+        )
+
+
+def _summary(errors, total=None):
+    total = len(errors) if total is None else total
+    shown = "; ".join(errors[:MAX_ERRORS])
+    more = total - min(total, MAX_ERRORS)
+    return shown + (f"; and {more} more" if more else "")
+
+
+def source_fingerprint(path):
+    """
+    Return a short id that changes whenever the export at ``path`` does.
+
+    Built from the resolved path, size and modification time, so it costs
+    one ``stat`` call; a snapshot directory is identified by its ``meta``
+    file.
+    """
+    path = Path(path).resolve()
+    if path.is_dir():
+        path = path / "meta.json"
+    stat = path.stat()
+    digest = hashlib.sha1(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()[:12]
+
+
+def load_source(path, fmt=None, chunk_size=100_000):
+    """
+    Return the store for ``path``: a saved snapshot directory is opened
+    memory-mapped, anything else is ingested.
+    """
+    from .catalog_store import CatalogStore
+
+    if os.path.isdir(path):
+        return CatalogStore.open(path)
+    return ingest_catalog(path, fmt, chunk_size)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Ingest a catalog export into a snapshot."
+    )
+    parser.add_argument("source", help="CSV, Parquet or JSON Lines export")
+    parser.add_argument("--output", required=True, help="snapshot directory")
+    parser.add_argument("--format", choices=FORMATS)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    try:
+        store = ingest_catalog(args.source, args.format, args.chunk_size, args.output)
+    except CatalogSchemaError as exc:
+        parser.exit(1, f"{args.source}: {exc}\n")
+    print(
+        f"{len(store):,} rows, {len(store.image_values):,} image URLs "
+        f"in {time.perf_counter() - started:.2f}s -> {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""
+Per-phase timing, memory and profiling for the catalog app script.
+
+Wrap each phase of a rerun in ``timer.phase(name)``. A disabled timer hands
+back one shared no-op context manager, so leaving the instrumentation in the
+hot path costs a method call per phase. When enabled it records wall time
+per phase, optionally the peak traced memory (``tracemalloc``) and a
+``cProfile`` profile of the whole rerun.
+
+Both tracers are process-wide while sessions rerun concurrently, so they are
+shared under one lock: ``tracemalloc`` runs while any phase measures memory,
+and a phase overlapped by another one gets no peak, since the peak is the
+whole process's. Only one rerun at a time is profiled; the others report the
+profiler as busy.
+"""
+
+import contextlib
+import csv
+import io
+import json
+import threading
+import time
+
+FIELDS = ("rerun", "phase", "seconds", "peak_memory_bytes")
+
+_DISABLED = contextlib.nullcontext()
+
+_LOCK = threading.Lock()
+# Phases measuring memory, each mapped to whether another one overlapped it.
+_TRACING = {}
+_STARTED_TRACING = False
+_PROFILING = None
+
+
+class PhaseTimer:
+    """
+    Collect per-phase measurements for one rerun.
+
+    Args:
+        enabled (bool): record anything at all
+        track_memory (bool): record peak traced memory per phase
+        profile (bool): run ``cProfile`` between ``start`` and ``stop``
+        rerun (int): rerun number stored with each record
+    """
+
+    def __init__(self, enabled=False, track_memory=False, profile=False, rerun=0):
+        self.enabled = enabled
+        self.track_memory = enabled and track_memory
+        self.profile = enabled and profile
+        self.rerun = rerun
+        self.records = []
+        self.profiler_busy = False
+        self._profiler = None
+
+    def phase(self, name):
+        """Return a context manager measuring the phase ``name``."""
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        token = _begin_tracing() if self.track_memory else None
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - started
+            peak = _end_tracing(token) if self.track_memory else None
+            self.records.append(
+                {
+                    "rerun": self.rerun,
+                    "phase": name,
+                    "seconds": seconds,
+                    "peak_memory_bytes": peak,
+                }
+            )
+
+    def start(self):
+        """
+        Start profiling the rerun, if profiling is on.
+
+        When another rerun in the process is being profiled, or another
+        profiler is active, nothing is profiled and ``profiler_busy`` is set.
+        """
+        global _PROFILING
+        if not self.profile:
+            return
+        import cProfile
+
+        profiler = cProfile.Profile()
+        with _LOCK:
+            if _PROFILING is None:
+                try:
+                    profiler.enable()
+                except ValueError:
+                    # Python 3.12+: another profiling tool is registered.
+                    pass
+                else:
+                    _PROFILING = self._profiler = profiler
+        self.profiler_busy = self._profiler is None
+
+    def stop(self):
+        """Stop profiling the rerun."""
+        global _PROFILING
+        if self._profiler is None:
+            return
+        with _LOCK:
+            if _PROFILING is self._profiler:
+                self._profiler.disable()
+                _PROFILING = None
+
+    def profile_report(self, limit=25, sort="cumulative"):
+        """Return the rerun's ``pstats`` report, or "" when not profiled."""
+        if self._profiler is None:
+            return ""
+        import pstats
+
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+
+def _begin_tracing():
+    """Count a phase in to ``tracemalloc``, starting it if needed."""
+    global _STARTED_TRACING
+    import tracemalloc
+
+    token = object()
+    with _LOCK:
+        if _TRACING:
+            for other in _TRACING:
+                _TRACING[other] = True
+        elif tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            _STARTED_TRACING = True
+        _TRACING[token] = bool(_TRACING)
+    return token
+
+
+def _end_tracing(token):
+    """
+    Count a phase out of ``tracemalloc`` and return its peak.
+
+    Returns:
+        int|None: peak traced bytes, or ``None`` if another phase overlapped
+    """
+    global _STARTED_TRACING
+    import tracemalloc
+
+    with _LOCK:
+        overlapped = _TRACING.pop(token)
+        peak = None if overlapped else tracemalloc.get_traced_memory()[1]
+        if not _TRACING and _STARTED_TRACING:
+            tracemalloc.stop()
+            _STARTED_TRACING = False
+    return peak
+
+
+def to_json(records):
+    """Serialize phase records to a JSON string."""
+    return json.dumps(records, indent=2)
+
+
+def to_csv(records):
+    """Serialize phase records to CSV text."""
+    out = io.StringIO()
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    writer.writerows(records)
+    return out.getvalue()
+
+
+def instrumentation_panel(timer, history):
+    """
+    Show the rerun's measurements and exports in the Streamlit sidebar.
+
+    Args:
+        timer (PhaseTimer): the finished rerun's timer
+        history (list[dict]): records of earlier reruns; this rerun's
+            records are appended to it
+    """
+    import streamlit as st
+
+    history.extend(timer.records)
+    with st.sidebar.expander("⏱️ Hot-path timings", expanded=True):
+        st.table(
+            [
+                {
+                    "phase": r["phase"],
+                    "ms": round(r["seconds"] * 1000, 2),
+                    "peak KiB": None
+                    if r["peak_memory_bytes"] is None
+                    else round(r["peak_memory_bytes"] / 1024, 1),
+                }
+                for r in timer.records
+            ]
+        )
+        st.download_button(
+            "Export JSON", to_json(history), "timings.json", "application/json"
+        )
+        st.download_button("Export CSV", to_csv(history), "timings.csv", "text/csv")
+        if timer.profiler_busy:
+            st.info("🔒 Profiler busy: another rerun is being profiled.")
+        report = timer.profile_report()
+        if report:
+            st.code(report, language=None)
@@ -0,0 +1,259 @@
+"""
+Per-SKU index and a one-row-per-SKU pivot of the catalog.
+
+The catalog is long: one row per SKU attribute. ``SkuIndex`` groups the row
+positions of each SKU once, with a stable argsort of the SKU codes, so a
+SKU's rows are a dictionary lookup and a slice. ``PivotView`` turns the long
+rows into a wide frame with one text column per attribute plus the min and
+mean ``Scoring`` of each SKU; added or edited rows only recompute the SKUs
+they touch. When a SKU lists an attribute more than once, its last row wins.
+"""
+
+SCORE_STATS = ("Scoring_min", "Scoring_mean")
+
+
+class SkuIndex:
+    """
+    Row positions of each SKU.
+
+    Args:
+        skus (pandas.Series): SKU of each row, in row-position order
+    """
+
+    def __init__(self, skus):
+        import numpy as np
+        import pandas as pd
+
+        codes, uniques = pd.factorize(skus)
+        known = codes >= 0
+        self._order = np.flatnonzero(known)[np.argsort(codes[known], kind="stable")]
+        counts = np.bincount(codes[known], minlength=len(uniques))
+        self._starts = np.zeros(len(uniques) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self._starts[1:])
+        self._codes = {str(sku): n for n, sku in enumerate(uniques)}
+        self._added = {}
+        self._folded = None
+
+    def __len__(self):
+        return len(self._codes.keys() | self._added.keys())
+
+    def __contains__(self, sku):
+        return str(sku) in self._codes or str(sku) in self._added
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the index."""
+        import sys
+
+        return (
+            self._order.nbytes
+            + self._starts.nbytes
+            + sys.getsizeof(self._codes)
+            + sum(map(sys.getsizeof, self._codes))
+            + sum(rows.nbytes for rows in self._added.values())
+        )
+
+    def rows(self, sku, case=True):
+        """
+        Return the row positions of ``sku``, in row order.
+
+        Args:
+            sku (str): SKU to look up
+            case (bool): match case exactly; otherwise every SKU equal to
+                ``sku`` ignoring case matches, as in the grid's "equals"
+                filter
+
+        Returns:
+            numpy.ndarray: int64 row positions
+        """
+        import numpy as np
+
+        sku = str(sku)
+        if not case:
+            if self._folded is None:
+                self._folded = {}
+                for name in self._codes.keys() | self._added.keys():
+                    self._folded.setdefault(name.lower(), []).append(name)
+            found = [self.rows(name) for name in self._folded.get(sku.lower(), ())]
+            if len(found) == 1:
+                return found[0]
+            return np.sort(np.concatenate(found)) if found else np.empty(0, np.int64)
+        code = self._codes.get(sku)
+        found = (
+            self._order[self._starts[code] : self._starts[code + 1]]
+            if code is not None
+            else np.empty(0, dtype=np.int64)
+        )
+        if sku in self._added:
+            found = np.concatenate([found, self._added[sku]])
+        return found
+
+    def positions(self, skus):
+        """Return the row positions of all ``skus``, SKU by SKU."""
+        import numpy as np
+
+        found = [self.rows(sku) for sku in skus]
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def add(self, skus, positions):
+        """
+        Register rows appended after the index was built.
+
+        Args:
+            skus (iterable[str]): SKU of each new row
+            positions (iterable[int]): position of each new row
+        """
+        import numpy as np
+
+        self._folded = None
+        grouped = {}
+        for sku, position in zip(skus, positions):
+            grouped.setdefault(str(sku), []).append(position)
+        for sku, found in grouped.items():
+            found = np.asarray(found, dtype=np.int64)
+            if sku in self._added:
+                found = np.concatenate([self._added[sku], found])
+            self._added[sku] = found
+
+
+class PivotView:
+    """
+    One row per SKU, with a column per attribute and ``Scoring`` stats.
+
+    Args:
+        frame (pandas.DataFrame): long catalog rows
+        value_column (str): text shown in the attribute columns
+        keep (tuple[str]): per-SKU columns carried over from the first row
+    """
+
+    def __init__(self, frame, value_column="STIBO_Data", keep=("Product_Name",)):
+        import pandas as pd
+
+        self.value_column = value_column
+        self.keep = keep
+        long = self._long(frame)
+        self.attributes = list(pd.unique(long["Attributes"]))
+        values, self._scores = self._pivot(long)
+        first = long.groupby("SKU_NBR", sort=False)[list(keep)].first()
+        self.frame = pd.concat([first, values], axis=1).astype(self._text_dtypes())
+        for name in SCORE_STATS:
+            self.frame[name] = float("nan")
+        self._refresh(self.frame.index)
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the wide frame and the scores."""
+        return int(
+            self.frame.memory_usage(deep=True).sum()
+            + self._scores.memory_usage(deep=True).sum()
+        )
+
+    def _text_dtypes(self):
+        return {name: object for name in [*self.keep, *self.attributes]}
+
+    def _long(self, frame):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "SKU_NBR": frame["SKU_NBR"].astype(str).to_numpy(),
+                "Attributes": frame["Attributes"].astype(str).to_numpy(),
+                "Scoring": frame["Scoring"].astype(float).to_numpy(),
+                self.value_column: frame[self.value_column].astype(object).to_numpy(),
+                **{name: frame[name].astype(object).to_numpy() for name in self.keep},
+            }
+        )
+
+    def _pivot(self, long):
+        # ``pivot`` refuses repeated pairs; the last row is the current one.
+        long = long.drop_duplicates(["SKU_NBR", "Attributes"], keep="last")
+        values = long.pivot(
+            index="SKU_NBR", columns="Attributes", values=self.value_column
+        )
+        scores = long.pivot(index="SKU_NBR", columns="Attributes", values="Scoring")
+        order = [a for a in self.attributes if a in values.columns]
+        values, scores = values[order], scores[order]
+        values.columns.name = scores.columns.name = None
+        return values, scores
+
+    def _refresh(self, skus):
+        scores = self._scores.loc[skus]
+        self.frame.loc[skus, "Scoring_min"] = scores.min(axis=1)
+        self.frame.loc[skus, "Scoring_mean"] = scores.mean(axis=1)
+
+    def update(self, rows):
+        """
+        Fold added or edited long rows into the pivot.
+
+        Only the SKUs present in ``rows`` are recomputed.
+
+        Args:
+            rows (pandas.DataFrame): long rows; a row replaces the cell of its
+                ``(SKU_NBR, Attributes)`` pair
+        """
+        long = self._long(rows)
+        self.attributes.extend(
+            a for a in dict.fromkeys(long["Attributes"]) if a not in self.attributes
+        )
+        values, scores = self._pivot(long)
+
+        new = values.index.difference(self.frame.index)
+        columns = [*self.keep, *self.attributes, *SCORE_STATS]
+        self.frame = self.frame.reindex(
+            index=self.frame.index.append(new), columns=columns
+        ).astype(self._text_dtypes())
+        self._scores = self._scores.reindex(
+            index=self.frame.index, columns=self.attributes
+        )
+        if len(new):
+            first = long.groupby("SKU_NBR", sort=False)[list(self.keep)].first()
+            self.frame.loc[new, list(self.keep)] = first.loc[new]
+        self.frame.update(values)
+        self._scores.update(scores)
+        self._refresh(values.index)
+
+    def grid_frame(self):
+        """Return the pivot with ``SKU_NBR`` as a column, for the grid."""
+        return self.frame.rename_axis("SKU_NBR").reset_index()
+
+
+def pivot_grid_options(df, page_size=12):
+    """
+    Build the AgGrid options for the one-row-per-SKU layout.
+
+    Args:
+        df (pandas.DataFrame): pivot frame; only its columns are used
+        page_size (int): rows per grid page
+
+    Returns:
+        dict: grid options for ``AgGrid``
+    """
+    from st_aggrid import GridOptionsBuilder, JsCode
+
+    gb = GridOptionsBuilder.from_dataframe(df)
+    gb.configure_default_column(
+        resizable=True,
+        sortable=True,
+        filter=True,
+        wrapText=False,
+        autoHeight=False,
+        cellStyle={"fontFamily": "Inter, sans-serif", "fontSize": "13px"},
+    )
+    gb.configure_column("SKU_NBR", headerName="SKU", width=110, pinned="left")
+    gb.configure_column("Product_Name", headerName="Product Name", width=160)
+    for name in SCORE_STATS:
+        gb.configure_column(
+            name,
+            headerName=name.replace("_", " "),
+            type=["numericColumn"],
+            valueFormatter=JsCode(
+                "function(p) { return p.value == null ? '' : p.value.toFixed(2); }"
+            ),
+            width=120,
+        )
+    gb.configure_selection(
+        selection_mode="multiple", use_checkbox=True, header_checkbox=True
+    )
+    gb.configure_pagination(paginationAutoPageSize=False, paginationPageSize=page_size)
+    gb.configure_grid_options(rowHeight=40, animateRows=False)
+    return gb.build()
@@ -0,0 +1,133 @@
+"""
+Shared AgGrid cell renderers for the catalog apps.
+
+Both apps use one image slider, ``assets/image_slider.js`` with its
+stylesheet ``assets/image_slider.css``, registered in ``gridOptions`` under
+the component name ``IMAGE_SLIDER`` and referenced by that name from the
+Images column. The grid options only carry ``IMAGE_SLIDER_LOADER``, a small
+stub that fetches the two versioned files once per page (the browser caches
+them, see ``assets``) and hands every cell to the real renderer.
+
+Renderer params pick the look: ``variant`` is ``"classic"`` or
+``"portrait"``, and ``fade`` animates image changes. The "fast" mode turns
+fading off and expects fixed row heights, so grids using it should not set
+``autoHeight``.
+
+The slider decodes each image before showing it and prefetches the
+``prefetch`` images on either side of the current one, with at most
+``concurrency`` prefetches in flight per grid. Decoded images are shared
+between cells through a per-grid cache of ``cache_size`` entries. Set
+``prefetch=0`` for slow connections: only the images clicked to are fetched.
+"""
+
+RENDERER_MODES = ("fancy", "fast")
+
+# Fixed row height used in fast mode; the slider cell itself is 100px high.
+FAST_ROW_HEIGHT = 110
+
+IMAGE_SLIDER = "imageSlider"
+
+# Images prefetched on each side of the shown one, prefetches in flight per
+# grid and decoded images kept per grid.
+PREFETCH_NEIGHBOURS = 1
+PREFETCH_CONCURRENCY = 4
+IMAGE_CACHE_SIZE = 48
+
+IMAGE_SLIDER_LOADER = """
+class ImageSliderLoader {
+    static load(params) {
+        const loads = window.__catalogAssets = window.__catalogAssets || {};
+        const key = params.scriptUrl + ' ' + params.styleUrl;
+        if (!loads[key]) {
+            const link = document.createElement('link');
+            link.rel = 'stylesheet';
+            link.href = params.styleUrl;
+            document.head.appendChild(link);
+            loads[key] = new Promise((resolve, reject) => {
+                const script = document.createElement('script');
+                script.src = params.scriptUrl;
+                script.onload = resolve;
+                script.onerror = reject;
+                document.head.appendChild(script);
+            });
+        }
+        return loads[key];
+    }
+
+    init(params) {
+        this.params = params;
+        this.eGui = document.createElement('div');
+        this.eGui.className = 'isr-loading';
+        ImageSliderLoader.load(params).then(() => {
+            if (!this.params) return;
+            this.slider = new window.CatalogImageSlider();
+            this.slider.init(this.params);
+            this.eGui.appendChild(this.slider.getGui());
+        }, () => { this.eGui.innerText = 'Images unavailable'; });
+    }
+
+    getGui() {
+        return this.eGui;
+    }
+
+    refresh(params) {
+        this.params = params;
+        return this.slider ? this.slider.refresh(params) : true;
+    }
+
+    destroy() {
+        if (this.slider) this.slider.destroy();
+        this.params = null;
+    }
+}
+"""
+
+
+def configure_image_slider(
+    gb,
+    renderer="fancy",
+    variant="classic",
+    prefetch=PREFETCH_NEIGHBOURS,
+    concurrency=PREFETCH_CONCURRENCY,
+    cache_size=IMAGE_CACHE_SIZE,
+    **column,
+):
+    """
+    Show the Images column with the shared slider.
+
+    Args:
+        gb (st_aggrid.GridOptionsBuilder): builder to configure
+        renderer (str): one of ``RENDERER_MODES``; "fast" disables fading
+            and auto-sized rows
+        variant (str): "classic" or "portrait" cell styling
+        prefetch (int): images to prefetch on each side of the shown one;
+            0 disables prefetching
+        concurrency (int): prefetches in flight at once per grid
+        cache_size (int): decoded images kept per grid
+        **column: further options for the Images column
+    """
+    from st_aggrid import JsCode
+
+    from simple_calculator_exl.assets import asset_url
+
+    if prefetch < 0 or concurrency < 1 or cache_size < 1:
+        raise ValueError(
+            "prefetch must be >= 0, concurrency and cache_size must be >= 1"
+        )
+    fast = renderer == "fast"
+    gb.configure_grid_options(components={IMAGE_SLIDER: JsCode(IMAGE_SLIDER_LOADER)})
+    gb.configure_column(
+        "Images",
+        cellRenderer=IMAGE_SLIDER,
+        cellRendererParams={
+            "scriptUrl": asset_url("image_slider.js"),
+            "styleUrl": asset_url("image_slider.css"),
+            "variant": variant,
+            "fade": not fast,
+            "prefetch": int(prefetch),
+            "concurrency": int(concurrency),
+            "cacheSize": int(cache_size),
+        },
+        autoHeight=not fast,
+        **column,
+    )
@@ -0,0 +1,338 @@
+"""
+Server-side row model for the catalog grid.
+
+Instead of handing the whole DataFrame to the grid, the app asks this model
+for one block of rows at a time. Sorting and filtering run here against the
+backing frame, using the same request shape as AG Grid's server-side and
+infinite row models (``startRow``, ``endRow``, ``sortModel``,
+``filterModel``, plus the grid's ``quickFilterText``), so payload size
+depends on the page size, not the catalog.
+"""
+
+import json
+import threading
+from collections import OrderedDict
+
+PAGE_SIZES = (12, 25, 50, 100, 250)
+
+_TEXT_FILTERS = {
+    "contains": lambda s, v: s.str.contains(v, case=False, regex=False),
+    "notContains": lambda s, v: ~s.str.contains(v, case=False, regex=False),
+    "equals": lambda s, v: s.str.lower() == v.lower(),
+    "notEqual": lambda s, v: s.str.lower() != v.lower(),
+    "startsWith": lambda s, v: s.str.lower().str.startswith(v.lower()),
+    "endsWith": lambda s, v: s.str.lower().str.endswith(v.lower()),
+}
+_NUMBER_FILTERS = {
+    "equals": lambda s, v, _: s == v,
+    "notEqual": lambda s, v, _: s != v,
+    "lessThan": lambda s, v, _: s < v,
+    "lessThanOrEqual": lambda s, v, _: s <= v,
+    "greaterThan": lambda s, v, _: s > v,
+    "greaterThanOrEqual": lambda s, v, _: s >= v,
+    "inRange": lambda s, v, to: s.between(v, to),
+}
+
+
+class ServerSideRowModel:
+    """
+    Serve sorted, filtered blocks of a DataFrame on request.
+
+    Sorted/filtered row orders and materialized blocks are kept in small LRU
+    caches, and the blocks after each requested one are prepared ahead of
+    time so paging forward does not wait on the slice.
+
+    Args:
+        df (pandas.DataFrame): backing catalog data
+        block_size (int): rows per block (the page size)
+        prefetch_blocks (int): blocks to prepare after each requested block
+        max_cached_blocks (int): materialized blocks kept in memory
+        max_cached_views (int): sort/filter orderings kept in memory
+        encode_block (callable, optional): applied to each materialized
+            block, e.g. ``CatalogStore.encode_block`` to turn compact rows
+            into the grid format only for rows actually sent
+        indexes (dict, optional): column to an index with
+            ``rows(value, case=False)``, e.g. ``pivot.SkuIndex``; "equals"
+            filters on those columns look the rows up, ignoring case like
+            the scan, instead of scanning the column
+        search (object, optional): word index with ``search(text)``
+            returning sorted row positions, e.g.
+            ``search.QuickFilterIndex``; without one the quick filter scans
+            the text columns
+    """
+
+    def __init__(
+        self,
+        df,
+        block_size=100,
+        prefetch_blocks=1,
+        max_cached_blocks=32,
+        max_cached_views=8,
+        encode_block=None,
+        indexes=None,
+        search=None,
+    ):
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.df = df
+        self._positional = df.reset_index(drop=True)
+        self.block_size = block_size
+        self.prefetch_blocks = prefetch_blocks
+        self.max_cached_blocks = max_cached_blocks
+        self.max_cached_views = max_cached_views
+        self.encode_block = encode_block
+        self.indexes = indexes or {}
+        self.search = search
+        self._views = OrderedDict()
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        """
+        Memory the ordering and block caches can grow to, at most.
+
+        The backing frame is not counted: it is usually shared with a
+        ``CatalogStore`` that is accounted for on its own.
+        """
+        from .cache import estimate_size
+
+        sample = self.df.head(self.block_size)
+        if self.encode_block is not None:
+            sample = self.encode_block(sample)
+        row_bytes = estimate_size(sample) / max(len(sample), 1)
+        return int(
+            self.max_cached_views * len(self.df) * 8
+            + self.max_cached_blocks * self.block_size * row_bytes
+        )
+
+    def invalidate(self):
+        """Drop cached orderings and blocks after the backing data changed."""
+        with self._lock:
+            self._views.clear()
+            self._blocks.clear()
+
+    def row_count(self, filter_model=None, quick_filter=None):
+        """Number of rows matching ``filter_model`` and ``quick_filter``."""
+        with self._lock:
+            return len(self._view(None, filter_model, quick_filter)[1])
+
+    def positions(self, sort_model=None, filter_model=None, quick_filter=None):
+        """
+        Return the backing-frame positions of every row in a view, in order.
+
+        Returns:
+            numpy.ndarray: row positions of the sorted, filtered view
+        """
+        with self._lock:
+            return self._view(sort_model, filter_model, quick_filter)[1]
+
+    def get_block(
+        self, start_row, end_row, sort_model=None, filter_model=None, quick_filter=None
+    ):
+        """
+        Return rows ``start_row:end_row`` of the sorted, filtered view.
+
+        Args:
+            start_row (int): first row, inclusive
+            end_row (int): last row, exclusive
+            sort_model (list[dict], optional): ``{"colId", "sort"}`` entries
+            filter_model (dict, optional): column id to AG Grid filter model
+            quick_filter (str, optional): words every row must contain
+
+        Returns:
+            tuple[pandas.DataFrame, int]: the rows and the total matching rows
+        """
+        with self._lock:
+            key, positions = self._view(sort_model, filter_model, quick_filter)
+            first = start_row // self.block_size
+            last = max(first, (end_row - 1) // self.block_size)
+            blocks = [self._block(key, positions, n) for n in range(first, last + 1)]
+            for n in range(last + 1, last + 1 + self.prefetch_blocks):
+                if n * self.block_size < len(positions):
+                    self._block(key, positions, n)
+
+        offset = first * self.block_size
+        rows = blocks[0] if len(blocks) == 1 else _concat(blocks)
+        return rows.iloc[start_row - offset : end_row - offset], len(positions)
+
+    def get_rows(self, request):
+        """
+        Answer an AG Grid ``getRows`` request.
+
+        Args:
+            request (dict): ``startRow``, ``endRow`` and optional
+                ``sortModel``/``filterModel``/``quickFilterText``
+
+        Returns:
+            dict: ``rowData`` (list of records), ``rowCount`` and ``lastRow``
+                (the row count once the final block has been served, else -1)
+        """
+        start, end = request.get("startRow", 0), request["endRow"]
+        rows, count = self.get_block(
+            start,
+            end,
+            request.get("sortModel"),
+            request.get("filterModel"),
+            request.get("quickFilterText"),
+        )
+        return {
+            "rowData": rows.to_dict("records"),
+            "rowCount": count,
+            "lastRow": count if end >= count else -1,
+        }
+
+    def _view(self, sort_model, filter_model, quick_filter=None):
+        quick_filter = (quick_filter or "").strip()
+        key = json.dumps(
+            [sort_model or [], filter_model or {}, quick_filter], sort_keys=True
+        )
+        if key in self._views:
+            self._views.move_to_end(key)
+            return key, self._views[key]
+
+        frame = self._positional
+        if quick_filter:
+            frame = self._quick_filtered(quick_filter)
+        if filter_model:
+            frame, filter_model = self._indexed(frame, filter_model)
+        if filter_model:
+            frame = frame[_filter_mask(frame, filter_model)]
+        if sort_model:
+            frame = frame.sort_values(
+                [s["colId"] for s in sort_model],
+                ascending=[s.get("sort", "asc") == "asc" for s in sort_model],
+                kind="stable",
+            )
+        positions = frame.index.to_numpy()
+
+        self._views[key] = positions
+        if len(self._views) > self.max_cached_views:
+            self._views.popitem(last=False)
+        return key, positions
+
+    def _quick_filtered(self, text):
+        if self.search is not None:
+            return self._positional.take(self.search.search(text))
+        from pandas.api.types import is_numeric_dtype
+
+        # No index: every word must appear in some text column.
+        frame = self._positional
+        columns = [
+            frame[name].astype(str)
+            for name in frame.columns
+            if not is_numeric_dtype(frame[name])
+        ]
+        mask = None
+        for word in text.split():
+            hit = None
+            for series in columns:
+                found = series.str.contains(word, case=False, regex=False)
+                hit = found if hit is None else hit | found
+            mask = hit if mask is None else mask & hit
+        return frame if mask is None else frame[mask]
+
+    def _indexed(self, frame, filter_model):
+        import numpy as np
+
+        remaining = dict(filter_model)
+        for column, index in self.indexes.items():
+            spec = remaining.get(column)
+            if not spec or spec.get("type") != "equals":
+                continue
+            # Case-insensitive like the scan, so the index answers misses too.
+            rows = index.rows(spec["filter"], case=False)
+            if frame is not self._positional:
+                rows = np.intersect1d(rows, frame.index)
+            frame = self._positional.take(rows)
+            del remaining[column]
+        return frame, remaining
+
+    def _block(self, key, positions, n):
+        block_key = (key, self.block_size, n)
+        if block_key in self._blocks:
+            self._blocks.move_to_end(block_key)
+            return self._blocks[block_key]
+        start = n * self.block_size
+        block = self.df.take(positions[start : start + self.block_size])
+        if self.encode_block is not None:
+            block = self.encode_block(block)
+        self._blocks[block_key] = block
+        if len(self._blocks) > self.max_cached_blocks:
+            self._blocks.popitem(last=False)
+        return block
+
+
+def paging_sidebar(model, columns):
+    """
+    Render the paging, sort and filter controls in the Streamlit sidebar.
+
+    Args:
+        model (ServerSideRowModel): model the request will be sent to
+        columns (list[str]): columns offered for sorting and filtering
+
+    Returns:
+        dict: a ``getRows``-style request for the selected page
+    """
+    import streamlit as st
+
+    st.sidebar.markdown("📄 **Paging**")
+    page_size = st.sidebar.selectbox("Rows per page", PAGE_SIZES, index=0)
+    sort_column = st.sidebar.selectbox("Sort by", ["(none)", *columns])
+    descending = st.sidebar.checkbox("Descending")
+    filter_column = st.sidebar.selectbox("Filter column", columns)
+    filter_text = st.sidebar.text_input("Filter value")
+    exact = st.sidebar.checkbox("Exact match")
+    quick_filter = st.sidebar.text_input(
+        "🔎 Search",
+        help="Rows containing every word; words match as prefixes when indexed.",
+    )
+
+    sort_model = None
+    if sort_column != "(none)":
+        sort_model = [{"colId": sort_column, "sort": "desc" if descending else "asc"}]
+    filter_model = None
+    if filter_text:
+        filter_model = {
+            filter_column: {
+                "filterType": "text",
+                "type": "equals" if exact else "contains",
+                "filter": filter_text,
+            }
+        }
+
+    pages = max(1, -(-model.row_count(filter_model, quick_filter) // page_size))
+    page = st.sidebar.number_input("Page", min_value=1, max_value=pages, value=1)
+    start = (page - 1) * page_size
+    return {
+        "startRow": start,
+        "endRow": start + page_size,
+        "sortModel": sort_model,
+        "filterModel": filter_model,
+        "quickFilterText": quick_filter,
+    }
+
+
+def _filter_mask(frame, filter_model):
+    mask = None
+    for column, spec in filter_model.items():
+        series = frame[column]
+        kind = spec.get("filterType", "text")
+        if kind == "set":
+            condition = series.isin(spec.get("values", []))
+        elif kind == "number":
+            condition = _NUMBER_FILTERS[spec["type"]](
+                series, spec["filter"], spec.get("filterTo")
+            )
+        else:
+            condition = _TEXT_FILTERS[spec.get("type", "contains")](
+                series.astype(str), str(spec["filter"])
+            )
+        mask = condition if mask is None else mask & condition
+    return mask
+
+
+def _concat(blocks):
+    import pandas as pd
+
+    return pd.concat(blocks)
@@ -0,0 +1,194 @@
+"""
+Running totals with O(log n) point updates and range sums.
+
+``RunningSum`` keeps the values in an ``array.array`` next to a Fenwick
+(binary indexed) tree of partial sums in a second array of the same type.
+Entry ``i`` of the tree (1-based) holds the sum of the ``i & -i`` values
+ending at position ``i``, so any prefix sum is the total of at most
+``log2(n)`` entries and a point update touches at most as many.
+"""
+
+import array
+
+
+class RunningSum:
+    """
+    A sequence of numbers with fast prefix and range sums.
+
+    Building from existing values takes O(n); point updates, appends and
+    prefix or range sums take O(log n). With a floating-point typecode the
+    sums are subject to the usual rounding, and corrections are applied as
+    differences, so use an integer typecode (e.g. ``"q"`` for cents) when the
+    totals must be exact. With an integer typecode, a value or partial sum
+    that does not fit raises ``OverflowError`` and leaves the sums unchanged.
+
+    Args:
+        values (iterable|array.array|numpy.ndarray): initial values
+        typecode (str, optional): ``array`` typecode of the buffers; defaults
+            to the typecode of an ``array.array`` or NumPy input, else ``"d"``
+    """
+
+    def __init__(self, values=(), typecode=None):
+        if typecode is None:
+            typecode = _typecode(values)
+        self.typecode = typecode
+        if type(values).__module__ == "numpy":
+            values = values.astype(typecode, copy=False).tobytes()
+        self._values = array.array(typecode, values)
+        self._tree = _build(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __repr__(self):
+        return f"RunningSum({self._values.tolist()!r}, typecode={self.typecode!r})"
+
+    def __getitem__(self, index):
+        return self._values[index]
+
+    def __setitem__(self, index, value):
+        index = self._index(index)
+        self.add(index, value - self._values[index])
+
+    def add(self, index, delta):
+        """
+        Add ``delta`` to the value at ``index``.
+
+        Args:
+            index (int): position; negative positions count from the end
+            delta (int|float): amount to add
+        """
+        index = self._index(index)
+        self._values[index] += delta
+        tree = self._tree
+        size = len(tree)
+        touched = []
+        i = index + 1
+        try:
+            while i < size:
+                tree[i] += delta
+                touched.append(i)
+                i += i & -i
+        except OverflowError:
+            for i in touched:
+                tree[i] -= delta
+            self._values[index] -= delta
+            raise
+
+    def append(self, value):
+        """Add ``value`` at the end."""
+        n = len(self._values)
+        low = n + 1 - ((n + 1) & -(n + 1))
+        self._values.append(value)
+        # The new node covers positions low+1..n+1: the new value plus the
+        # already stored positions low+1..n.
+        try:
+            self._tree.append(value + self.prefix_sum(n) - self.prefix_sum(low))
+        except OverflowError:
+            self._values.pop()
+            raise
+
+    def extend(self, values):
+        """Add each of ``values`` at the end."""
+        for value in values:
+            self.append(value)
+
+    def prefix_sum(self, stop):
+        """
+        Return the sum of the first ``stop`` values.
+
+        Args:
+            stop (int): number of values; clipped to ``0..len(self)``
+
+        Returns:
+            int|float: ``sum(self[:stop])``
+        """
+        tree = self._tree
+        i = max(0, min(stop, len(self._values)))
+        total = tree[0]
+        while i:
+            total += tree[i]
+            i &= i - 1
+        return total
+
+    def range_sum(self, start=0, stop=None):
+        """
+        Return the sum of the values from ``start`` up to, not including,
+        ``stop``.
+
+        Negative positions count from the end, as in slicing.
+
+        Returns:
+            int|float: ``sum(self[start:stop])``
+        """
+        start, stop, _ = slice(start, stop).indices(len(self._values))
+        if stop <= start:
+            return self._tree[0]
+        return self.prefix_sum(stop) - self.prefix_sum(start)
+
+    def total(self):
+        """Return the sum of all values."""
+        return self.prefix_sum(len(self._values))
+
+    def tolist(self):
+        """Return the values as a list."""
+        return self._values.tolist()
+
+    def _index(self, index):
+        n = len(self._values)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("RunningSum index out of range")
+        return index
+
+
+def _typecode(values):
+    if isinstance(values, array.array):
+        return values.typecode
+    dtype = getattr(values, "dtype", None)
+    if dtype is not None and dtype.char in array.typecodes:
+        return dtype.char
+    return "d"
+
+
+def _build(values):
+    """
+    Return the Fenwick tree of ``values`` in O(n).
+
+    Slot 0 holds a zero of the buffer's type and is never updated.
+
+    Raises:
+        OverflowError: if a partial sum does not fit an integer typecode
+    """
+    from .core import _check_range, _numpy
+
+    np = _numpy()
+    tree = array.array(values.typecode, [0])
+    tree.extend(values)
+    n = len(values)
+    if np is not None and n:
+        nodes = np.frombuffer(tree, dtype=values.typecode)
+        # Each node passes its sum to its parent i + (i & -i). Nodes with the
+        # same lowest bit have distinct parents, so one level is one
+        # vectorized add, and levels go from the leaves up.
+        step = 1
+        while step <= n:
+            children = np.arange(step, n + 1, 2 * step)
+            parents = children + step
+            keep = parents <= n
+            parents, children = parents[keep], children[keep]
+            sums, passed = nodes[parents], nodes[children]
+            # NumPy wraps integers where the array buffer raises.
+            _check_range(np, sums, passed, nodes.dtype)
+            nodes[parents] = sums + passed
+            step *= 2
+        return tree
+    for i in range(1, n + 1):
+        parent = i + (i & -i)
+        if parent <= n:
+            tree[parent] += tree[i]
+    return tree
@@ -0,0 +1,225 @@
+"""
+Text similarity scoring for the catalog ``Scoring`` column.
+
+Each row compares ``STIBO_Data`` with ``Recommended_Value`` using a blend of
+token-set Jaccard similarity and TF-IDF cosine similarity. Vectors are sparse
+``{token: weight}`` dicts, so no numeric stack is needed. Per-text vectors
+and per-pair scores are cached, so rows whose texts did not change are not
+rescored, and large frames are scored in chunks on a process pool.
+"""
+
+import math
+import re
+from collections import Counter, OrderedDict
+from itertools import chain, islice
+
+_TOKEN = re.compile(r"\w+")
+
+
+def tokenize(text):
+    """Split ``text`` into lowercase word tokens."""
+    return _TOKEN.findall(str(text).lower())
+
+
+def jaccard(left_tokens, right_tokens):
+    """Jaccard similarity of two token collections, treated as sets."""
+    left, right = set(left_tokens), set(right_tokens)
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def cosine(left, right):
+    """Cosine similarity of two L2-normalized sparse vectors."""
+    if len(left) > len(right):
+        left, right = right, left
+    return sum(weight * right.get(token, 0.0) for token, weight in left.items())
+
+
+class SimilarityScorer:
+    """
+    Blend of Jaccard and TF-IDF cosine similarity with bounded caches.
+
+    Args:
+        jaccard_weight (float): share of the Jaccard score in the blend; the
+            rest goes to the TF-IDF cosine
+        max_cached (int): vectors and pair scores kept in each LRU cache
+    """
+
+    def __init__(self, jaccard_weight=0.5, max_cached=100_000):
+        if not 0.0 <= jaccard_weight <= 1.0:
+            raise ValueError("jaccard_weight must be between 0 and 1")
+        self.jaccard_weight = jaccard_weight
+        self.max_cached = max_cached
+        self.document_count = 0
+        self.document_frequency = Counter()
+        self._vectors = OrderedDict()
+        self._scores = OrderedDict()
+
+    def __getstate__(self):
+        # Workers get the fitted model, not the parent's caches.
+        state = self.__dict__.copy()
+        state["_vectors"] = OrderedDict()
+        state["_scores"] = OrderedDict()
+        return state
+
+    def fit(self, texts):
+        """
+        Learn document frequencies from ``texts``, replacing earlier ones.
+
+        Args:
+            texts (iterable[str]): corpus the IDF weights are derived from
+
+        Returns:
+            SimilarityScorer: self
+        """
+        self.document_count = 0
+        self.document_frequency = Counter()
+        for text in texts:
+            self.document_count += 1
+            self.document_frequency.update(set(tokenize(text)))
+        self._vectors.clear()
+        self._scores.clear()
+        return self
+
+    def vector(self, text):
+        """Return the cached, L2-normalized TF-IDF vector of ``text``."""
+        cached = self._vectors.get(text)
+        if cached is not None:
+            self._vectors.move_to_end(text)
+            return cached
+
+        counts = Counter(tokenize(text))
+        n = self.document_count
+        weights = {
+            token: tf * (math.log((1 + n) / (1 + self.document_frequency[token])) + 1)
+            for token, tf in counts.items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        vector = {token: w / norm for token, w in weights.items()}
+        _remember(self._vectors, text, vector, self.max_cached)
+        return vector
+
+    def score(self, left, right):
+        """
+        Similarity of two texts in ``[0, 1]``.
+
+        Args:
+            left (str): e.g. the STIBO value
+            right (str): e.g. the recommended value
+
+        Returns:
+            float: the blended similarity
+        """
+        key = (left, right)
+        cached = self._scores.get(key)
+        if cached is not None:
+            self._scores.move_to_end(key)
+            return cached
+
+        left_vector, right_vector = self.vector(left), self.vector(right)
+        blended = self.jaccard_weight * jaccard(left_vector, right_vector) + (
+            1.0 - self.jaccard_weight
+        ) * cosine(left_vector, right_vector)
+        result = round(min(1.0, blended), 6)
+        _remember(self._scores, key, result, self.max_cached)
+        return result
+
+    def score_many(self, lefts, rights):
+        """Score two equally long sequences of texts pairwise."""
+        return [self.score(left, right) for left, right in zip(lefts, rights)]
+
+    def cached_score(self, left, right):
+        """Return the cached score of a pair, or None when not cached."""
+        return self._scores.get((left, right))
+
+    def remember(self, left, right, score):
+        """Store an externally computed score of a pair."""
+        _remember(self._scores, (left, right), score, self.max_cached)
+
+
+def score_frame(
+    df,
+    left="STIBO_Data",
+    right="Recommended_Value",
+    scorer=None,
+    chunk_size=50_000,
+    workers=1,
+):
+    """
+    Compute similarity scores for every row of a catalog frame.
+
+    Pairs already in the scorer's cache are not rescored; the remaining pairs
+    are scored chunk by chunk, on a process pool when ``workers > 1``.
+
+    Args:
+        df (pandas.DataFrame): frame holding the two text columns
+        left (str): first text column
+        right (str): second text column
+        scorer (SimilarityScorer, optional): fitted scorer to reuse (and
+            whose caches are reused); by default one is fitted on both columns
+        chunk_size (int): rows scored per task
+        workers (int): process count; 1 scores in the calling process
+
+    Returns:
+        pandas.Series: scores aligned with ``df.index``
+    """
+    import pandas as pd
+
+    if scorer is None:
+        scorer = SimilarityScorer().fit(
+            chain(df[left].astype(str), df[right].astype(str))
+        )
+    lefts = df[left].astype(str).tolist()
+    rights = df[right].astype(str).tolist()
+
+    scores = [scorer.cached_score(a, b) for a, b in zip(lefts, rights)]
+    missing = sorted({(lefts[i], rights[i]) for i, s in enumerate(scores) if s is None})
+    computed = dict(zip(missing, _score_pairs(scorer, missing, chunk_size, workers)))
+    for pair, value in computed.items():
+        scorer.remember(*pair, value)
+    scores = [
+        s if s is not None else computed[(a, b)]
+        for s, a, b in zip(scores, lefts, rights)
+    ]
+    return pd.Series(scores, index=df.index, name="Scoring", dtype="float64")
+
+
+def _score_pairs(scorer, pairs, chunk_size, workers):
+    chunks = _chunked(pairs, chunk_size)
+    if workers <= 1:
+        for chunk in chunks:
+            yield from scorer.score_many(*zip(*chunk))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(scorer,)
+    ) as pool:
+        for result in pool.map(_score_chunk, chunks):
+            yield from result
+
+
+_WORKER_SCORER = None
+
+
+def _init_worker(scorer):
+    global _WORKER_SCORER
+    _WORKER_SCORER = scorer
+
+
+def _score_chunk(chunk):
+    return _WORKER_SCORER.score_many(*zip(*chunk))
+
+
+def _chunked(items, size):
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+def _remember(cache, key, value, limit):
+    cache[key] = value
+    if len(cache) > limit:
+        cache.popitem(last=False)
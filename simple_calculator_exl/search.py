@@ -0,0 +1,319 @@
+"""
+Inverted index for the catalog's quick-filter search box.
+
+Text in ``Product_Name``, ``STIBO_Data`` and ``Recommended_Value`` is
+lower-cased and split into words. The index keeps the sorted vocabulary and,
+for each word, the sorted positions of the rows containing it, all in two
+flat arrays as in ``pivot.SkuIndex``. Because the vocabulary is sorted, every
+word starting with a prefix is a contiguous run of it, so a prefix query is a
+binary search and one slice. Rows edited after the index was built are kept
+in a small overlay until the next rebuild.
+"""
+
+import re
+from bisect import bisect_left, insort
+
+SEARCH_COLUMNS = ("Product_Name", "STIBO_Data", "Recommended_Value")
+
+# Runs of letters and digits; the Arrow pattern below splits on the rest.
+_WORD = re.compile(r"[^\W_]+")
+_SEPARATORS = r"[^\p{L}\p{N}]+"
+_LAST = "\U0010ffff"
+
+
+def tokenize(text):
+    """Return the lower-cased words of ``text``."""
+    return _WORD.findall(str(text).lower())
+
+
+class QuickFilterIndex:
+    """
+    Word index over catalog text columns, grouped by SKU on request.
+
+    Args:
+        frame (pandas.DataFrame): catalog rows, e.g. ``CatalogStore.frame``;
+            rows are identified by position
+        columns (tuple[str]): text columns to index
+        sku_column (str): column results are grouped by
+    """
+
+    def __init__(self, frame, columns=SEARCH_COLUMNS, sku_column="SKU_NBR"):
+        import numpy as np
+        import pandas as pd
+
+        self.columns = tuple(columns)
+        self.sku_column = sku_column
+        self._size = self._built = len(frame)
+        self._terms, self._starts, self._rows = _postings(frame, self.columns)
+        codes, names = pd.factorize(frame[sku_column].astype(str))
+        self._sku_codes = codes.astype(np.int64)
+        self._sku_names = [str(name) for name in names]
+        self._sku_lookup = None
+        # Overlay of rows edited or added since the build.
+        self._stale = None
+        self._added_terms = {}
+        self._added_rows = {}
+        self._added_vocabulary = []
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the index."""
+        import sys
+
+        arrays = (self._starts, self._rows, self._sku_codes, self._stale)
+        return (
+            sum(a.nbytes for a in arrays if a is not None)
+            + sum(map(sys.getsizeof, self._terms))
+            + sum(map(sys.getsizeof, self._sku_names))
+            + 8 * (len(self._terms) + len(self._sku_names))
+        )
+
+    def search(self, query, prefix=True):
+        """
+        Return the rows containing every word of ``query``.
+
+        Args:
+            query (str): words to look for, in any order and case
+            prefix (bool): match words that start with each query word, as
+                when typing; otherwise only whole words match
+
+        Returns:
+            numpy.ndarray: sorted int64 row positions; every row for a
+            query without words
+        """
+        import numpy as np
+
+        words = tokenize(query)
+        if not words:
+            return np.arange(self._size, dtype=np.int64)
+        found = None
+        # Rarest first keeps the running intersection small.
+        for rows in sorted((self._matches(w, prefix) for w in words), key=len):
+            found = rows if found is None else found[self._mask(rows)[found]]
+            if not len(found):
+                break
+        return found
+
+    def search_skus(self, query, prefix=True):
+        """
+        Return the SKUs whose rows, taken together, contain every word.
+
+        A SKU matches even when the words are spread over different
+        attribute rows, as in the one-row-per-SKU layout.
+
+        Returns:
+            list[str]: matching SKUs in order of first appearance
+        """
+        import numpy as np
+
+        words = tokenize(query)
+        if not words:
+            return list(self._sku_names)
+        found = np.ones(len(self._sku_names), dtype=bool)
+        for word in words:
+            hits = np.zeros(len(self._sku_names), dtype=bool)
+            codes = self._sku_codes[self._matches(word, prefix)]
+            hits[codes[codes >= 0]] = True
+            found &= hits
+        return [self._sku_names[code] for code in np.flatnonzero(found).tolist()]
+
+    def group_by_sku(self, rows):
+        """
+        Group row positions by SKU.
+
+        Args:
+            rows (numpy.ndarray): row positions, e.g. from ``search``
+
+        Returns:
+            dict[str, numpy.ndarray]: SKU to its rows, SKUs in order of
+            their first row
+        """
+        import numpy as np
+
+        rows = np.asarray(rows, dtype=np.int64)
+        codes = self._sku_codes[rows]
+        uniques, first, counts = np.unique(codes, return_index=True, return_counts=True)
+        groups = np.split(
+            rows[np.argsort(codes, kind="stable")], np.cumsum(counts)[:-1]
+        )
+        return {
+            self._sku_names[uniques[n]]: groups[n] for n in np.argsort(first).tolist()
+        }
+
+    def sku_count(self, rows):
+        """Return how many SKUs the row positions ``rows`` belong to."""
+        import numpy as np
+
+        return len(np.unique(self._sku_codes[rows]))
+
+    def update(self, rows, positions=None):
+        """
+        Re-index edited rows and index appended ones.
+
+        Only the given rows are tokenized; the built postings are left as
+        they are and the rows' old entries are masked out.
+
+        Args:
+            rows (pandas.DataFrame): the rows' current values, including the
+                indexed columns and the SKU column
+            positions (iterable[int], optional): row positions; defaults to
+                ``rows.index``
+        """
+        import numpy as np
+
+        positions = rows.index if positions is None else positions
+        positions = [int(p) for p in positions]
+        skus = rows[self.sku_column].astype(str).tolist()
+        texts = zip(*(rows[column].tolist() for column in self.columns))
+        grow = max(positions, default=-1) + 1 - self._size
+        if grow > 0:
+            self._sku_codes = np.concatenate(
+                [self._sku_codes, np.full(grow, -1, dtype=np.int64)]
+            )
+            self._size += grow
+        for position, sku, values in zip(positions, skus, texts):
+            if position < self._built:
+                if self._stale is None:
+                    self._stale = np.zeros(self._built, dtype=bool)
+                self._stale[position] = True
+            for term in self._added_rows.pop(position, ()):
+                self._added_terms[term].discard(position)
+            terms = {word for value in values for word in tokenize(value)}
+            for term in terms:
+                if term not in self._added_terms:
+                    self._added_terms[term] = set()
+                    insort(self._added_vocabulary, term)
+                self._added_terms[term].add(position)
+            self._added_rows[position] = terms
+            self._sku_codes[position] = self._sku_code(sku)
+
+    def _sku_code(self, sku):
+        if self._sku_lookup is None:
+            self._sku_lookup = {name: n for n, name in enumerate(self._sku_names)}
+        if sku not in self._sku_lookup:
+            self._sku_lookup[sku] = len(self._sku_names)
+            self._sku_names.append(sku)
+        return self._sku_lookup[sku]
+
+    def _mask(self, rows):
+        import numpy as np
+
+        mask = np.zeros(self._size, dtype=bool)
+        mask[rows] = True
+        return mask
+
+    def _matches(self, word, prefix):
+        import numpy as np
+
+        lo, hi = _term_range(self._terms, word, prefix)
+        rows = self._rows[self._starts[lo] : self._starts[hi]]
+        if hi - lo > 1:
+            # Postings of several words overlap: a mask dedups large unions
+            # in linear time, sorting is cheaper for small ones.
+            if len(rows) * 16 > self._size:
+                rows = np.flatnonzero(self._mask(rows))
+            else:
+                rows = np.unique(rows)
+        if self._stale is not None:
+            rows = rows[~self._stale[rows]]
+        if self._added_terms:
+            lo, hi = _term_range(self._added_vocabulary, word, prefix)
+            added = set().union(
+                *(self._added_terms[t] for t in self._added_vocabulary[lo:hi])
+            )
+            if added:
+                rows = np.union1d(rows, np.fromiter(added, np.int64, len(added)))
+        return rows
+
+
+def _term_range(terms, word, prefix):
+    lo = bisect_left(terms, word)
+    if prefix:
+        return lo, bisect_left(terms, word + _LAST, lo)
+    return lo, lo + (lo < len(terms) and terms[lo] == word)
+
+
+def _postings(frame, columns):
+    """
+    Return the sorted vocabulary, per-term offsets and row postings.
+
+    Words are split with Arrow compute kernels; dictionary-encoded columns
+    are split once per distinct value.
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    words, parents = [], []
+    for column in columns:
+        values = pa.array(frame[column], from_pandas=True)
+        if isinstance(values, pa.ChunkedArray):
+            values = values.combine_chunks()
+        if pa.types.is_dictionary(values.type):
+            lists = _split_whitespace(values.dictionary).take(values.indices)
+        else:
+            lists = _split_whitespace(values)
+        words.append(pc.list_flatten(lists))
+        parents.append(pc.list_parent_indices(lists).to_numpy().astype(np.int64))
+    parents = np.concatenate(parents) if parents else np.empty(0, np.int64)
+
+    # Punctuation is split off the distinct whitespace-separated tokens only;
+    # each occurrence then takes its token's word ids.
+    tokens = pc.dictionary_encode(pa.concat_arrays(words))
+    pieces = pc.split_pattern_regex(tokens.dictionary, _SEPARATORS)
+    vocabulary = pc.dictionary_encode(pc.list_flatten(pieces))
+    order = pc.sort_indices(vocabulary.dictionary).to_numpy()
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    terms = vocabulary.dictionary.take(order).to_pylist()
+    piece_ids = pa.ListArray.from_arrays(
+        pieces.offsets, pa.array(rank[vocabulary.indices.to_numpy()])
+    ).take(tokens.indices)
+    term_ids = pc.list_flatten(piece_ids).to_numpy()
+    rows = parents[pc.list_parent_indices(piece_ids).to_numpy()]
+    if terms and terms[0] == "":
+        keep = term_ids > 0
+        term_ids, rows, terms = term_ids[keep] - 1, rows[keep], terms[1:]
+
+    # One entry per (term, row), sorted by term and then row.
+    size = max(len(frame), 1)
+    pairs = np.sort(term_ids * size + rows)
+    if len(pairs):
+        pairs = pairs[np.concatenate(([True], pairs[1:] != pairs[:-1]))]
+    term_ids, rows = np.divmod(pairs, size)
+    starts = np.zeros(len(terms) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(term_ids, minlength=len(terms)), out=starts[1:])
+    return terms, starts, rows
+
+
+def _split_whitespace(strings):
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    return pc.utf8_split_whitespace(pc.utf8_lower(strings.cast(pa.string())))
+
+
+class SkuSearch:
+    """
+    ``QuickFilterIndex`` results as positions in a one-row-per-SKU frame.
+
+    Args:
+        index (QuickFilterIndex): word index over the long catalog rows
+        skus (pandas.Series): SKU of each row of the wide frame
+    """
+
+    def __init__(self, index, skus):
+        import pandas as pd
+
+        self.index = index
+        self._skus = pd.Index(skus.astype(str))
+
+    def search(self, query, prefix=True):
+        """Return the sorted wide-frame positions of the matching SKUs."""
+        import numpy as np
+
+        found = self._skus.get_indexer_for(self.index.search_skus(query, prefix))
+        return np.sort(found[found >= 0])
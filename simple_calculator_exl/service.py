@@ -0,0 +1,403 @@
+"""
+Local asyncio calculation service with request coalescing.
+
+Clients keep a TCP or Unix socket connection open and send one JSON request
+per line; responses carry the request ``id`` and may arrive out of order::
+
+    {"id": 1, "op": "add", "a": 1, "b": 2}
+    {"id": 2, "op": "add_many", "a": [1, 2], "b": [3, 4]}
+    {"id": 3, "op": "evaluate", "expression": "x * 2", "bindings": {"x": 4}}
+    {"id": 4, "op": "evaluate_many", "expression": "x + y",
+     "bindings": {"x": [1, 2], "y": [3, 4]}}
+
+Scalar ``add`` and ``evaluate`` requests arriving within ``window`` seconds
+of each other are coalesced into one ``add_many`` or ``evaluate_many`` call.
+Each connection has at most ``max_inflight`` requests in progress and the
+server at most ``max_pending``; beyond that the server stops reading, so
+clients are slowed down by TCP flow control instead of piling up work.
+
+Run it with ``python -m simple_calculator_exl.service --port 8765``.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from .core import add_many
+from .expression import compile_expression
+
+OPERATIONS = ("add", "add_many", "evaluate", "evaluate_many")
+MAX_LINE = 1 << 20
+# Errors a bad request can raise, e.g. a too deeply nested expression; they
+# are reported back to the client.
+REQUEST_ERRORS = (
+    ArithmeticError,
+    AttributeError,
+    LookupError,
+    RecursionError,
+    TypeError,
+    ValueError,
+)
+
+
+class Coalescer:
+    """
+    Collect small requests and run them as one batch.
+
+    Items with the same key are gathered until ``max_batch`` of them are
+    waiting or ``window`` seconds have passed since the first, then
+    ``run(key, items)`` computes all of their results at once.
+
+    Args:
+        run (callable): ``run(key, items) -> list`` of one result per item
+        window (float): seconds to wait for more items
+        max_batch (int): batch size that triggers an immediate run
+    """
+
+    def __init__(self, run, window=0.002, max_batch=1024):
+        self.run = run
+        self.window = window
+        self.max_batch = max_batch
+        self.batches = 0
+        self._pending = {}
+
+    async def submit(self, key, item):
+        """Queue ``item`` under ``key`` and return its result."""
+        future = asyncio.get_running_loop().create_future()
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = self._pending[key] = []
+            asyncio.get_running_loop().call_later(self.window, self._flush, key, batch)
+        batch.append((item, future))
+        if len(batch) >= self.max_batch:
+            self._flush(key, batch)
+        return await future
+
+    def _flush(self, key, batch):
+        if self._pending.get(key) is not batch:
+            return
+        del self._pending[key]
+        self.batches += 1
+        try:
+            results = self._results(key, [item for item, _ in batch])
+        except Exception as exc:
+            # Anything else is a bug: fail the whole batch instead of leaving
+            # its requests waiting forever, and let the loop report it.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            raise
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def _results(self, key, items):
+        try:
+            return self.run(key, items)
+        except REQUEST_ERRORS:
+            # One bad item must not fail its neighbours: retry one by one.
+            results = []
+            for item in items:
+                try:
+                    results.append(self.run(key, [item])[0])
+                except REQUEST_ERRORS as exc:
+                    results.append(exc)
+            return results
+
+
+def _run_batch(key, items):
+    if key == "add":
+        return add_many([a for a, _ in items], [b for _, b in items])
+    expression = compile_expression(key[1])
+    if len(items) == 1:
+        return [expression.evaluate(items[0])]
+    return expression.evaluate_many(items)
+
+
+class CalcService:
+    """
+    The calculation service; ``start`` binds it to a socket.
+
+    Args:
+        window (float): coalescing window in seconds
+        max_batch (int): largest coalesced batch
+        max_pending (int): requests in progress across all connections
+        max_inflight (int): requests in progress per connection
+    """
+
+    def __init__(
+        self, window=0.002, max_batch=1024, max_pending=10_000, max_inflight=256
+    ):
+        self.coalescer = Coalescer(_run_batch, window, max_batch)
+        self.max_inflight = max_inflight
+        self.requests = 0
+        self._pending = asyncio.Semaphore(max_pending)
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8765, path=None):
+        """
+        Start listening on ``host:port``, or on the Unix socket ``path``.
+
+        Returns:
+            asyncio.Server: the listening server
+        """
+        if path is not None:
+            self._server = await asyncio.start_unix_server(
+                self._serve, path, limit=MAX_LINE
+            )
+        else:
+            self._server = await asyncio.start_server(
+                self._serve, host, port, limit=MAX_LINE
+            )
+        return self._server
+
+    async def close(self):
+        """Stop accepting connections and wait for the server to close."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        inflight = asyncio.Semaphore(self.max_inflight)
+        tasks = set()
+        try:
+            while True:
+                # Waiting here before reading the next line is the
+                # backpressure: unread requests stay in the socket buffers.
+                await inflight.acquire()
+                try:
+                    line = await reader.readline()
+                except (ConnectionError, ValueError):
+                    line = b""
+                if not line:
+                    inflight.release()
+                    break
+                await self._pending.acquire()
+                task = asyncio.create_task(self._answer(line, writer, inflight))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def _answer(self, line, writer, inflight):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            # Encoded here so a result JSON cannot hold, e.g. a complex
+            # number, is answered with an error like any other failure.
+            response = json.dumps(
+                {"id": request_id, "result": await self._handle(request)}
+            )
+        except Exception as exc:
+            response = json.dumps(
+                {"id": request_id, "error": f"{type(exc).__name__}: {exc}"}
+            )
+            if not isinstance(exc, REQUEST_ERRORS):
+                # A bug, not a bad request: answer it, then fail the task.
+                await self._send(writer, response)
+                raise
+        finally:
+            inflight.release()
+            self._pending.release()
+        await self._send(writer, response)
+
+    async def _send(self, writer, response):
+        self.requests += 1
+        if not writer.is_closing():
+            writer.write(response.encode() + b"\n")
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def _handle(self, request):
+        op = request.get("op")
+        if op == "add":
+            return await self.coalescer.submit("add", (request["a"], request["b"]))
+        if op == "evaluate":
+            key = ("evaluate", request["expression"])
+            return await self.coalescer.submit(key, request.get("bindings") or {})
+        if op == "add_many":
+            return add_many(request["a"], request["b"])
+        if op == "evaluate_many":
+            expression = compile_expression(request["expression"])
+            return expression.evaluate_many(request["bindings"])
+        raise ValueError(f"unknown op {op!r}, expected one of {OPERATIONS}")
+
+
+class CalcClient:
+    """
+    Keep-alive client that pipelines requests over one connection.
+
+    Use ``await CalcClient.connect(...)`` and ``await client.call(op, ...)``.
+    """
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._ids = itertools.count(1)
+        self._waiting = {}
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765, path=None):
+        """Open a connection to a running service."""
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path, limit=MAX_LINE)
+        else:
+            reader, writer = await asyncio.open_connection(host, port, limit=MAX_LINE)
+        return cls(reader, writer)
+
+    async def call(self, op, **arguments):
+        """
+        Send one request and return its result.
+
+        Raises:
+            RuntimeError: with the service's message if the request failed
+        """
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[request_id] = future
+        message = {"id": request_id, "op": op, **arguments}
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+        return await future
+
+    async def close(self):
+        """Close the connection."""
+        self._receiver.cancel()
+        self._writer.close()
+        try:
+            await self._writer.wait_closed()
+        except ConnectionError:
+            pass
+
+    async def _receive(self):
+        try:
+            while line := await self._reader.readline():
+                response = json.loads(line)
+                future = self._waiting.pop(response["id"], None)
+                if future is None or future.done():
+                    continue
+                if "error" in response:
+                    future.set_exception(RuntimeError(response["error"]))
+                else:
+                    future.set_result(response["result"])
+        finally:
+            for future in self._waiting.values():
+                if not future.done():
+                    future.set_exception(
+                        ConnectionError("service closed the connection")
+                    )
+            self._waiting.clear()
+
+
+async def load_test(
+    host="127.0.0.1",
+    port=8765,
+    path=None,
+    connections=8,
+    concurrency=32,
+    requests=10_000,
+    make_request=None,
+):
+    """
+    Drive a running service and measure latency and throughput.
+
+    Args:
+        host (str): service host
+        port (int): service port
+        path (str, optional): Unix socket path instead of host and port
+        connections (int): client connections
+        concurrency (int): requests in flight per connection
+        requests (int): total requests
+        make_request (callable, optional): ``make_request(n) -> (op, kwargs)``;
+            defaults to scalar ``add`` requests
+
+    Returns:
+        dict: ``requests``, ``errors``, ``seconds``, ``throughput`` (requests
+        per second) and ``p50_ms``/``p99_ms`` latency
+    """
+    if make_request is None:
+
+        def make_request(n):
+            return "add", {"a": n, "b": 0.5}
+
+    clients = [await CalcClient.connect(host, port, path) for _ in range(connections)]
+    counter = itertools.count()
+    latencies = []
+    errors = 0
+
+    async def worker(client):
+        nonlocal errors
+        while (n := next(counter)) < requests:
+            op, arguments = make_request(n)
+            started = time.perf_counter()
+            try:
+                await client.call(op, **arguments)
+            except RuntimeError:
+                errors += 1
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(worker(client) for client in clients for _ in range(concurrency))
+    )
+    seconds = time.perf_counter() - started
+    for client in clients:
+        await client.close()
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "seconds": seconds,
+        "throughput": len(latencies) / seconds if seconds else float("inf"),
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+
+
+def _percentile(ordered, percent):
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, round(percent / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the calculation service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix-socket", help="listen on this Unix socket instead")
+    parser.add_argument("--window", type=float, default=0.002)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-pending", type=int, default=10_000)
+    parser.add_argument("--max-inflight", type=int, default=256)
+    args = parser.parse_args()
+
+    async def run():
+        service = CalcService(
+            args.window, args.max_batch, args.max_pending, args.max_inflight
+        )
+        server = await service.start(args.host, args.port, args.unix_socket)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Streaming summation over iterables and numeric files.
+
+Input is consumed lazily in fixed-size chunks, chunks are reduced either
+in-process or on a process pool, and the partial results are merged in
+chunk order so the total does not depend on worker scheduling.
+"""
+
+import array
+import csv
+import math
+import os
+import time
+from collections import deque, namedtuple
+from itertools import islice
+
+ALGORITHMS = ("neumaier", "pairwise", "exact")
+
+
+class SumResult(namedtuple("SumResult", "total count seconds")):
+    """Total of a stream together with how long it took to produce."""
+
+    __slots__ = ()
+
+    @property
+    def throughput(self):
+        """Values summed per second."""
+        return self.count / self.seconds if self.seconds else float("inf")
+
+
+def sum_stream(
+    source, chunk_size=65536, workers=1, algorithm="neumaier", column=None, header=None
+):
+    """
+    Sum a numeric stream chunk by chunk, optionally across processes.
+
+    Args:
+        source (iterable|str|os.PathLike|file): numbers (or numeric strings),
+            a path to a text/CSV file or an open text file
+        chunk_size (int): number of values handed to a worker at a time
+        workers (int): process count; 1 sums in the calling process
+        algorithm (str): "neumaier" (compensated), "pairwise" or "exact"
+            (correctly rounded, same result as ``math.fsum``)
+        column (int|str, optional): CSV column index or header name to read
+            when ``source`` is a file; defaults to the first column
+        header (bool, optional): whether a file starts with a header row;
+            by default a first row whose value is not a number is skipped.
+            Implied when ``column`` is a header name
+
+    Returns:
+        SumResult: the total, the number of values and the elapsed seconds
+
+    Raises:
+        ValueError: for an unknown algorithm or a non-positive chunk size
+    """
+    if algorithm not in ALGORITHMS:
+        raise ValueError(
+            f"unknown algorithm {algorithm!r}, expected one of {ALGORITHMS}"
+        )
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+
+    started = time.perf_counter()
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="") as handle:
+            partials = _reduce(
+                _chunks(_read_column(handle, column, header), chunk_size),
+                workers,
+                algorithm,
+            )
+    elif hasattr(source, "read"):
+        partials = _reduce(
+            _chunks(_read_column(source, column, header), chunk_size),
+            workers,
+            algorithm,
+        )
+    else:
+        partials = _reduce(_chunks(source, chunk_size), workers, algorithm)
+
+    count = sum(n for n, _ in partials)
+    total = _MERGE[algorithm]([p for _, p in partials])
+    return SumResult(total, count, time.perf_counter() - started)
+
+
+def _read_column(handle, column, header):
+    rows = csv.reader(handle)
+    index = column or 0
+    if isinstance(column, str):
+        index = next(rows).index(column)
+    elif header or header is None:
+        first = next(rows, None)
+        if first and not header and _is_number(first[index]):
+            yield first[index]
+    for row in rows:
+        if row and row[index].strip():
+            yield row[index]
+
+
+def _is_number(text):
+    try:
+        float(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _chunks(values, chunk_size):
+    values = iter(values)
+    while True:
+        chunk = array.array("d", map(float, islice(values, chunk_size)))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _reduce(chunks, workers, algorithm):
+    reducer = _REDUCE[algorithm]
+    if workers <= 1:
+        return [(len(chunk), reducer(chunk)) for chunk in chunks]
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Keep a bounded number of chunks in flight so input is never read
+    # further ahead than the pool can consume.
+    partials, pending = [], deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk in chunks:
+            pending.append((len(chunk), pool.submit(reducer, chunk)))
+            if len(pending) >= 2 * workers:
+                n, future = pending.popleft()
+                partials.append((n, future.result()))
+        partials.extend((n, future.result()) for n, future in pending)
+    return partials
+
+
+def _neumaier(values):
+    total = compensation = 0.0
+    for x in values:
+        t = total + x
+        if abs(total) >= abs(x):
+            compensation += (total - t) + x
+        else:
+            compensation += (x - t) + total
+        total = t
+    return total, compensation
+
+
+def _merge_neumaier(parts):
+    total, compensation = _neumaier(p[0] for p in parts)
+    return total + (compensation + math.fsum(p[1] for p in parts))
+
+
+def _pairwise(values, block=128):
+    if len(values) <= block:
+        return sum(values, 0.0)
+    middle = len(values) // 2
+    return _pairwise(values[:middle], block) + _pairwise(values[middle:], block)
+
+
+def _exact(values):
+    # Shewchuk's non-overlapping partials: their sum is the exact chunk sum.
+    partials = []
+    for x in values:
+        i = 0
+        for y in partials:
+            if abs(x) < abs(y):
+                x, y = y, x
+            hi = x + y
+            lo = y - (hi - x)
+            if lo:
+                partials[i] = lo
+                i += 1
+            x = hi
+        partials[i:] = [x]
+    return partials
+
+
+_REDUCE = {"neumaier": _neumaier, "pairwise": _pairwise, "exact": _exact}
+_MERGE = {
+    "neumaier": _merge_neumaier,
+    "pairwise": lambda parts: _pairwise(parts, block=2),
+    "exact": lambda parts: math.fsum(x for p in parts for x in p),
+}
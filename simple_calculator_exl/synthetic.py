@@ -0,0 +1,102 @@
+"""
+Synthetic product catalogs for benchmarks and load tests.
+
+``generate_catalog`` returns the same column layout as ``catalog.CATALOG``
+(one row per SKU attribute, a list of image URLs per row), at any size and
+deterministically for a given seed.
+"""
+
+import random
+
+ATTRIBUTES = (
+    "Headline",
+    "Manufacturer",
+    "Description",
+    "Material",
+    "Dimensions",
+    "Color",
+    "Care",
+    "Warranty",
+)
+
+_BRANDS = ("NYX", "EcoFresh", "GlowTech", "Sun&Sky", "Nordic", "Urban", "Aero")
+_PRODUCTS = ("Concealer", "Bottle", "Lamp", "Flip Flop", "Backpack", "Kettle", "Mug")
+_WORDS = [
+    "premium",
+    "advanced",
+    "formula",
+    "durable",
+    "insulated",
+    "reusable",
+    "adjustable",
+    "smart",
+    "touch",
+    "comfortable",
+    "lightweight",
+    "stainless",
+    "steel",
+    "soft",
+    "cushioned",
+    "modern",
+    "professional",
+    "eco",
+    "friendly",
+    "compact",
+    "portable",
+    "waterproof",
+    "classic",
+    "design",
+]
+
+
+def generate_catalog(skus, attributes=3, images=2, seed=0):
+    """
+    Generate a catalog with ``skus * attributes`` rows.
+
+    Args:
+        skus (int): number of products
+        attributes (int): attribute rows per product (at most 8)
+        images (int): maximum images per row; each row gets 1 to ``images``
+        seed (int): random seed
+
+    Returns:
+        dict[str, list]: columns in the ``catalog.CATALOG`` layout
+    """
+    if not 1 <= attributes <= len(ATTRIBUTES):
+        raise ValueError(f"attributes must be between 1 and {len(ATTRIBUTES)}")
+    rng = random.Random(seed)
+    columns = {
+        name: []
+        for name in (
+            "SKU_NBR",
+            "Product_Name",
+            "Attributes",
+            "STIBO_Data",
+            "Recommended_Value",
+            "Scoring",
+            "Images",
+            "Comment",
+        )
+    }
+
+    def phrase(low, high):
+        return " ".join(rng.choices(_WORDS, k=rng.randint(low, high))).capitalize()
+
+    for n in range(skus):
+        sku = f"{rng.randint(100000, 999999)}{n:06d}"
+        name = f"{rng.choice(_BRANDS)} {rng.choice(_PRODUCTS)}"
+        for attribute in ATTRIBUTES[:attributes]:
+            columns["SKU_NBR"].append(sku)
+            columns["Product_Name"].append(name)
+            columns["Attributes"].append(attribute)
+            columns["STIBO_Data"].append(f"{name} {phrase(3, 12)}")
+            columns["Recommended_Value"].append(f"{name} {phrase(2, 8)}")
+            columns["Scoring"].append(round(rng.random(), 2))
+            columns["Images"].append(
+                [
+                    f"https://picsum.photos/id/{rng.randint(1, 1000)}/800/600"
+                    for _ in range(rng.randint(1, images))
+                ]
+            )
+            columns["Comment"].append("")
+    return columns
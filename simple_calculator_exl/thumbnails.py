@@ -0,0 +1,210 @@
+"""
+Thumbnail pipeline for the image slider column.
+
+Each source image is downloaded once, shrunk to the grid cell size and
+stored in a content-addressed directory (files are named after a hash of the
+source bytes, so the same picture behind several URLs is stored once). The
+directory is capped in size and trimmed least-recently-used first.
+
+By default thumbnails live in the package's ``static/thumbs`` folder, which
+Streamlit serves at ``/app/static/thumbs/`` when the app is started with
+``--server.enableStaticServing true``. Where the package is installed
+read-only, point ``CATALOG_THUMBNAIL_DIR`` at a writable directory and
+``CATALOG_THUMBNAIL_URL`` at the URL it is served under.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+DIRECTORY_ENV = "CATALOG_THUMBNAIL_DIR"
+URL_PREFIX_ENV = "CATALOG_THUMBNAIL_URL"
+DEFAULT_DIRECTORY = Path(__file__).parent / "static" / "thumbs"
+DEFAULT_URL_PREFIX = "/app/static/thumbs/"
+# Twice the slider cell size, so thumbnails stay sharp on high-DPI screens.
+DEFAULT_SIZE = (500, 240)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+# Largest source image downloaded.
+MAX_SOURCE_BYTES = 20 * 1024 * 1024
+
+
+def fetch_url(url, timeout=10, max_bytes=MAX_SOURCE_BYTES):
+    """
+    Download ``url`` and return the response body.
+
+    Raises:
+        ValueError: if the body is larger than ``max_bytes``
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        length = response.headers.get("Content-Length")
+        if length and length.isdigit() and int(length) > max_bytes:
+            raise ValueError(f"{url} is larger than {max_bytes} bytes")
+        body = response.read(max_bytes + 1)
+    if len(body) > max_bytes:
+        raise ValueError(f"{url} is larger than {max_bytes} bytes")
+    return body
+
+
+class ThumbnailCache:
+    """
+    Downsized copies of remote images in a size-capped disk cache.
+
+    If ``directory`` cannot be created, ``writable`` is false and image
+    URLs are left as they are.
+
+    Args:
+        directory (str|os.PathLike, optional): where thumbnails are stored;
+            ``CATALOG_THUMBNAIL_DIR`` or the package's ``static/thumbs``
+        url_prefix (str, optional): URL under which ``directory`` is
+            served; ``CATALOG_THUMBNAIL_URL`` or ``/app/static/thumbs/``
+        size (tuple[int, int]): bounding box thumbnails are shrunk into
+        max_bytes (int): total size the directory is trimmed back to
+        fetch (callable): ``fetch(url) -> bytes`` used to download sources
+        quality (int): JPEG quality of the stored thumbnails
+    """
+
+    def __init__(
+        self,
+        directory=None,
+        url_prefix=None,
+        size=DEFAULT_SIZE,
+        max_bytes=DEFAULT_MAX_BYTES,
+        fetch=fetch_url,
+        quality=80,
+    ):
+        if directory is None:
+            directory = os.environ.get(DIRECTORY_ENV) or DEFAULT_DIRECTORY
+        if url_prefix is None:
+            url_prefix = os.environ.get(URL_PREFIX_ENV) or DEFAULT_URL_PREFIX
+        self.directory = Path(directory)
+        self.url_prefix = url_prefix
+        self.size = tuple(size)
+        self.max_bytes = max_bytes
+        self.fetch = fetch
+        self.quality = quality
+        self._index = self.directory / "index"
+        self._lock = threading.Lock()
+        self._bytes = None
+        try:
+            self._index.mkdir(parents=True, exist_ok=True)
+            self.writable = os.access(self._index, os.W_OK)
+        except OSError:
+            self.writable = False
+
+    def thumbnail_path(self, url):
+        """
+        Return the local thumbnail for ``url``, creating it on first use.
+
+        Args:
+            url (str): source image URL
+
+        Returns:
+            pathlib.Path: path of the stored JPEG thumbnail
+        """
+        entry = self._index / (_digest(f"{url}|{self.size}".encode()) + ".txt")
+        try:
+            path = self.directory / entry.read_text()
+            os.utime(path)  # mark as recently used
+            return path
+        except OSError:
+            pass
+
+        source = self.fetch(url)
+        name = _digest(source + repr(self.size).encode()) + ".jpg"
+        path = self.directory / name
+        if not path.exists():
+            thumbnail = self._shrink(source)
+            _write_atomic(path, thumbnail)
+            with self._lock:
+                if self._bytes is not None:
+                    self._bytes += len(thumbnail)
+        entry.write_text(name)
+        if self._bytes is None or self._bytes > self.max_bytes:
+            self.trim()
+        return path
+
+    def thumbnail_url(self, url):
+        """Return the URL the thumbnail of ``url`` is served under."""
+        return self.url_prefix + self.thumbnail_path(url).name
+
+    def rewrite_images(self, images_json, workers=8):
+        """
+        Swap the image URLs of one ``Images`` cell for thumbnail entries.
+
+        Args:
+            images_json (str): JSON list of source image URLs
+            workers (int): concurrent downloads for uncached images
+
+        Returns:
+            str: JSON list of ``{"thumb": ..., "src": ...}`` objects; images
+            that cannot be fetched keep their original URL as the thumbnail
+        """
+        return self.rewrite_many([images_json], workers)[0]
+
+    def rewrite_many(self, cells, workers=8):
+        """
+        ``rewrite_images`` for a whole page of ``Images`` cells.
+
+        Every distinct URL of the page is fetched once, through one pool.
+
+        Args:
+            cells (iterable[str]): JSON lists of source image URLs
+            workers (int): concurrent downloads for uncached images
+
+        Returns:
+            list[str]: the rewritten cells, in order
+        """
+        cells = [json.loads(cell) for cell in cells]
+        urls = list(dict.fromkeys(url for cell in cells for url in cell))
+        if self.writable:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                thumbs = dict(zip(urls, pool.map(self._safe_thumbnail_url, urls)))
+        else:
+            thumbs = {url: url for url in urls}
+        return [
+            json.dumps([{"thumb": thumbs[url], "src": url} for url in cell])
+            for cell in cells
+        ]
+
+    def trim(self):
+        """Delete least recently used thumbnails until under ``max_bytes``."""
+        with self._lock:
+            files = [(p.stat(), p) for p in self.directory.glob("*.jpg")]
+            total = sum(stat.st_size for stat, _ in files)
+            for stat, path in sorted(files, key=lambda item: item[0].st_mtime):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= stat.st_size
+            self._bytes = total
+
+    def _safe_thumbnail_url(self, url):
+        try:
+            return self.thumbnail_url(url)
+        except (OSError, ValueError):
+            return url
+
+    def _shrink(self, source):
+        from PIL import Image
+
+        with Image.open(BytesIO(source)) as image:
+            image = image.convert("RGB")
+            image.thumbnail(self.size)
+            buffer = BytesIO()
+            image.save(buffer, "JPEG", quality=self.quality, optimize=True)
+        return buffer.getvalue()
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _write_atomic(path, data):
+    partial = path.parent / f"{path.name}.{threading.get_ident()}.tmp"
+    partial.write_bytes(data)
+    os.replace(partial, path)
@@ -0,0 +1,20 @@
+import pytest
+
+from simple_calculator_exl.cache import catalog_cache
+
+
+@pytest.fixture(autouse=True)
+def app_files(tmp_path, monkeypatch):
+    """Keep files the apps write out of the home directory and the package."""
+    monkeypatch.setenv("CATALOG_COMMENTS_DB", str(tmp_path / "comments.sqlite3"))
+    monkeypatch.setenv("CATALOG_THUMBNAIL_DIR", str(tmp_path / "thumbs"))
+    # Asset URLs point at Streamlit's serving; no test binds the asset port.
+    monkeypatch.delenv("CATALOG_ASSET_URL", raising=False)
+    monkeypatch.delenv("CATALOG_ASSET_PORT", raising=False)
+    yield
+    # The apps keep these in the process-wide cache; the next test gets
+    # fresh ones in its own directory.
+    if ("comments",) in catalog_cache:
+        catalog_cache.get_or_build(("comments",), None).close()
+    catalog_cache.invalidate(name="comments")
+    catalog_cache.invalidate(name="thumbnails")
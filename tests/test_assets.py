@@ -0,0 +1,84 @@
+import socket
+import urllib.error
+import urllib.request
+
+import pytest
+
+from simple_calculator_exl import assets
+from simple_calculator_exl.assets import (
+    ASSET_DIR,
+    CACHE_CONTROL,
+    COMPONENT_NAME,
+    AssetServer,
+    asset_url,
+    asset_version,
+    serve_assets,
+)
+
+
+@pytest.fixture
+def server():
+    server = AssetServer()
+    yield server.url
+    server.close()
+
+
+def test_assets_are_served_with_immutable_cache_headers(server):
+    with urllib.request.urlopen(f"{server}image_slider.js?v={asset_version()}") as r:
+        body = r.read()
+        assert r.headers["Cache-Control"] == CACHE_CONTROL
+        assert r.headers["Content-Type"].startswith("text/javascript")
+        assert "Access-Control-Allow-Origin" not in r.headers
+        etag = r.headers["ETag"]
+    assert body == (ASSET_DIR / "image_slider.js").read_bytes()
+
+    request = urllib.request.Request(
+        f"{server}image_slider.css", headers={"If-None-Match": etag}
+    )
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(request)
+    assert error.value.code == 304
+
+
+def test_server_binds_loopback_by_default(server):
+    assert server.startswith("http://127.0.0.1:")
+
+
+@pytest.mark.parametrize(
+    "path", ["", "missing.js", "x/image_slider.js", "../assets.py"]
+)
+def test_other_paths_are_not_found(server, path):
+    with pytest.raises(urllib.error.HTTPError) as error:
+        urllib.request.urlopen(server + path)
+    assert error.value.code == 404
+
+
+def test_asset_url_defaults_to_streamlit_serving(monkeypatch):
+    config = pytest.importorskip("streamlit.config")
+
+    version = asset_version()
+    assert asset_url("a.js") == f"/component/{COMPONENT_NAME}/a.js?v={version}"
+    base_path = config.get_option("server.baseUrlPath")
+    config.set_option("server.baseUrlPath", "/tools/")
+    try:
+        assert (
+            asset_url("a.js") == f"/tools/component/{COMPONENT_NAME}/a.js?v={version}"
+        )
+    finally:
+        config.set_option("server.baseUrlPath", base_path)
+    monkeypatch.setenv("CATALOG_ASSET_URL", "https://cdn.example.com/catalog")
+    assert asset_url("a.js") == f"https://cdn.example.com/catalog/a.js?v={version}"
+
+
+def test_built_in_server_is_opt_in_and_never_borrows_a_taken_port(monkeypatch):
+    pytest.importorskip("streamlit")
+    monkeypatch.setattr(assets, "_SERVER", None)
+    monkeypatch.setattr(assets, "_SERVER_FAILED", False)
+    assert serve_assets() is None
+
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        monkeypatch.setenv("CATALOG_ASSET_PORT", str(taken.getsockname()[1]))
+        assert serve_assets() is None
+    assert asset_url("a.js").startswith(f"/component/{COMPONENT_NAME}/")
@@ -0,0 +1,111 @@
+import pytest
+
+from simple_calculator_exl.cache import MemoryCappedCache, frame_schema
+
+
+def test_get_or_build_reuses_value():
+    cache = MemoryCappedCache()
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"rows": 1}
+
+    first = cache.get_or_build(("catalog", 1), build)
+    assert cache.get_or_build(("catalog", 1), build) is first
+    assert (len(calls), cache.hits, cache.misses) == (1, 1, 1)
+
+
+def test_memory_cap_evicts_least_recently_used():
+    cache = MemoryCappedCache(max_bytes=100)
+    cache.get_or_build("a", lambda: "a", size=60)
+    cache.get_or_build("b", lambda: "b", size=30)
+    cache.get_or_build("a", lambda: "a", size=60)
+    cache.get_or_build("c", lambda: "c", size=30)
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.nbytes == 90
+
+
+def test_entries_over_the_cap_survive_the_run_that_uses_them():
+    cache = MemoryCappedCache(max_bytes=100)
+    cache.get_or_build("old", lambda: "old", size=10)
+    cache.begin_run()
+    store = cache.get_or_build("store", object, size=500)
+    index = cache.get_or_build("index", object, size=20)
+    assert "old" not in cache
+    assert cache.get_or_build("store", object) is store
+    assert cache.get_or_build("index", object) is index
+    assert cache.nbytes == 520
+
+    # The next run no longer needs the index; it goes before the store.
+    cache.begin_run()
+    cache.get_or_build("store", object)
+    cache.get_or_build("search", object, size=30)
+    assert "index" not in cache and "store" in cache and "search" in cache
+
+
+def test_entry_being_inserted_is_kept_without_a_run():
+    cache = MemoryCappedCache(max_bytes=100)
+    cache.get_or_build("a", lambda: "a", size=50)
+    cache.get_or_build("b", lambda: "b", size=500)
+    assert "a" not in cache and "b" in cache
+
+
+def test_cap_from_environment(monkeypatch):
+    monkeypatch.setenv("CATALOG_CACHE_MAX_BYTES", "1024")
+    assert MemoryCappedCache().max_bytes == 1024
+    assert MemoryCappedCache(10).max_bytes == 10
+
+
+def test_invalidate_by_name_and_version():
+    cache = MemoryCappedCache()
+    for key in [("catalog", 1), ("catalog", 2), ("grid_options", 1, "x")]:
+        cache.get_or_build(key, dict)
+    assert cache.invalidate(version=1) == 2
+    assert cache.invalidate(name="catalog") == 1
+    assert len(cache) == 0
+
+
+def test_invalidate_stale_keeps_current_and_unversioned_entries():
+    cache = MemoryCappedCache()
+    for key in [
+        ("catalog", 1),
+        ("grid_options", 1, "x"),
+        ("catalog", 2),
+        ("comments",),
+    ]:
+        cache.get_or_build(key, dict, size=10)
+    assert cache.invalidate_stale(2) == 2
+    assert ("catalog", 2) in cache and ("comments",) in cache
+    assert cache.nbytes == 20
+
+
+def test_heavy_entries_report_their_size():
+    pytest.importorskip("pandas")
+    from simple_calculator_exl.catalog import load_catalog_store
+    from simple_calculator_exl.pivot import SkuIndex
+    from simple_calculator_exl.row_model import ServerSideRowModel
+    from simple_calculator_exl.search import QuickFilterIndex
+
+    frame = load_catalog_store().frame
+    cache = MemoryCappedCache()
+    for name, build in [
+        ("sku_index", lambda: SkuIndex(frame["SKU_NBR"])),
+        ("search_index", lambda: QuickFilterIndex(frame)),
+        ("row_model", lambda: ServerSideRowModel(frame)),
+    ]:
+        before = cache.nbytes
+        cache.get_or_build((name, 1), build)
+        assert cache.nbytes > before
+    model = cache.get_or_build(("row_model", 1), None)
+    assert model.nbytes >= model.max_cached_views * len(frame) * 8
+    before = cache.nbytes
+    cache.get_or_build(("text", 1), lambda: "abc", size=len)
+    assert cache.nbytes == before + 3
+
+
+def test_frame_schema_tracks_columns_and_dtypes():
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({"a": [1], "b": ["x"]})
+    assert frame_schema(df)[0] == ("a", "int64")
+    assert frame_schema(df) != frame_schema(df.astype({"a": float}))
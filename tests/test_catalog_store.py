@@ -0,0 +1,87 @@
+import json
+
+import pytest
+
+from simple_calculator_exl.catalog import (
+    CATALOG,
+    SNAPSHOT_ENV,
+    build_catalog,
+    load_catalog_store,
+    open_catalog_store,
+)
+from simple_calculator_exl.catalog_store import (
+    CatalogStore,
+    memory_report,
+    shared_snapshot,
+)
+
+pd = pytest.importorskip("pandas")
+np = pytest.importorskip("numpy")
+
+
+def test_store_round_trips_to_grid_layout():
+    store = load_catalog_store()
+    assert len(store) == len(CATALOG["SKU_NBR"])
+    pd.testing.assert_frame_equal(
+        store.grid_frame(), build_catalog(), check_dtype=False
+    )
+
+
+def test_keys_are_dictionary_encoded_and_images_normalized():
+    store = load_catalog_store()
+    assert str(store.frame["SKU_NBR"].dtype) == "category"
+    assert len(store.frame["SKU_NBR"].cat.categories) == 4
+    assert store.image_offsets[-1] == sum(len(urls) for urls in CATALOG["Images"])
+    assert store.images(2) == CATALOG["Images"][2]
+
+
+def test_encode_block_only_touches_requested_rows():
+    store = load_catalog_store()
+    block = store.encode_block(store.frame.take([5, 0]))
+    assert list(block.index) == [5, 0]
+    assert json.loads(block.loc[5, "Images"]) == CATALOG["Images"][5]
+    assert list(block.columns) == list(CATALOG)
+
+
+def test_memory_report_compares_layouts():
+    report = memory_report(load_catalog_store(), build_catalog())
+    assert set(report["columns"]) == set(CATALOG)
+    assert report["compact_bytes"] < report["legacy_bytes"]
+    sku_legacy, sku_compact = report["columns"]["SKU_NBR"]
+    assert sku_compact < sku_legacy
+
+
+def test_snapshot_opens_memory_mapped(tmp_path):
+    pytest.importorskip("pyarrow")
+    load_catalog_store().save(tmp_path)
+    store = CatalogStore.open(tmp_path)
+    pd.testing.assert_frame_equal(
+        store.grid_frame(), build_catalog(), check_dtype=False
+    )
+    assert isinstance(store.image_offsets, np.memmap)
+    assert not store.frame["Scoring"].to_numpy().flags.writeable
+    assert store.positions([f"{CATALOG['SKU_NBR'][3]}|{CATALOG['Attributes'][3]}"])
+    assert store.mapped and 0 < store.nbytes < load_catalog_store().nbytes
+
+
+def test_shared_snapshot_is_built_once(tmp_path):
+    pytest.importorskip("pyarrow")
+    builds = []
+
+    def build():
+        builds.append(1)
+        return load_catalog_store()
+
+    first = shared_snapshot(build, tmp_path, 1)
+    second = shared_snapshot(build, tmp_path, 1)
+    assert len(builds) == 1
+    assert first.images(2) == second.images(2) == CATALOG["Images"][2]
+    assert [p.name for p in tmp_path.iterdir()] == ["catalog-v1"]
+
+
+def test_open_catalog_store_uses_snapshot_dir(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setenv(SNAPSHOT_ENV, str(tmp_path))
+    store = open_catalog_store()
+    assert isinstance(store.image_offsets, np.memmap)
+    assert len(store) == len(CATALOG["SKU_NBR"])
@@ -0,0 +1,81 @@
+import sqlite3
+
+import pytest
+
+from simple_calculator_exl.comments import (
+    ChangeTracker,
+    CommentStore,
+    apply_saved,
+    diff_cells,
+)
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture
+def rows():
+    return pd.DataFrame(
+        {
+            "SKU_NBR": ["S1", "S1", "S2"],
+            "Attributes": ["Headline", "Description", "Headline"],
+            "Comment": ["", "", ""],
+        }
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = CommentStore(tmp_path / "comments.sqlite3")
+    yield store
+    store.close()
+
+
+def test_diff_cells_matches_rows_by_key(rows):
+    edited = rows.iloc[::-1].copy()
+    edited.loc[1, "Comment"] = "too long"
+    assert diff_cells(rows, edited) == [
+        ("S1|Description", "S1", "Comment", "", "too long")
+    ]
+
+
+def test_tracker_writes_in_batches(rows, store):
+    tracker = ChangeTracker(store, batch_size=2)
+    edited = rows.assign(Comment=["a", "", ""])
+    tracker.capture(rows, edited)
+    assert store.values_for_skus(["S1"]) == {}
+    tracker.capture(edited, edited.assign(Comment=["a", "b", ""]))
+    assert store.values_for_skus(["S1"]) == {"S1|Headline": "a", "S1|Description": "b"}
+    assert tracker.pending == []
+
+
+def test_store_keeps_history_and_uses_wal(rows, store):
+    tracker = ChangeTracker(store)
+    tracker.capture(rows, rows.assign(Comment=["first", "", ""]))
+    tracker.flush()
+    tracker.capture(rows, rows.assign(Comment=["second", "", ""]))
+    tracker.flush()
+    assert [new for _, new, _ in store.history("S1|Headline")] == ["first", "second"]
+    with sqlite3.connect(store.path) as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_apply_saved_overlays_stored_values(rows, store):
+    ChangeTracker(store, batch_size=1).capture(
+        rows, rows.assign(Comment=["", "", "ok"])
+    )
+    assert apply_saved(rows, store)["Comment"].tolist() == ["", "", "ok"]
+
+
+def test_values_for_many_skus(store):
+    skus = [f"S{n}" for n in range(5000)]
+    before = pd.DataFrame({"SKU_NBR": skus, "Attributes": "Headline", "Comment": ""})
+    store.write(diff_cells(before, before.assign(Comment=skus)))
+    saved = store.values_for_skus(skus)
+    assert len(saved) == 5000 and saved["S4999|Headline"] == "S4999"
+
+
+def test_store_path_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("CATALOG_COMMENTS_DB", str(tmp_path / "db" / "c.sqlite3"))
+    store = CommentStore()
+    assert store.path == tmp_path / "db" / "c.sqlite3" and store.path.exists()
+    store.close()
@@ -1,4 +1,8 @@
-from simple_calculator_exl import add
+import array
+
+import pytest
+
+from simple_calculator_exl import add, add_many
 
 
 def test_add_ints():
@@ -7,3 +11,107 @@ def test_add_ints():
 
 def test_add_floats():
     assert add(1.5, 2.5) == 4.0
+
+
+def test_add_many_lists_and_broadcast():
+    assert add_many([1, 2, 3], [10, 20, 30]) == [11, 22, 33]
+    assert add_many(1.5, [1, 2]) == [2.5, 3.5]
+
+
+def test_add_many_scalars():
+    assert add_many(2, 3) == 5
+
+
+def test_add_many_array_buffer():
+    result = add_many(
+        array.array("d", [1.0, 2.0]), memoryview(array.array("d", [0.5, 0.5]))
+    )
+    assert isinstance(result, array.array)
+    assert result.tolist() == [1.5, 2.5]
+
+
+def test_add_many_out_reuses_buffer():
+    out = array.array("l", [0, 0, 0])
+    assert add_many(array.array("l", [1, 2, 3]), 1, out=out) is out
+    assert out.tolist() == [2, 3, 4]
+
+    out_list = [None, None]
+    assert add_many((1, 2), (3, 4), out=out_list) is out_list
+    assert out_list == [4, 6]
+
+
+def test_add_many_length_mismatch():
+    with pytest.raises(ValueError):
+        add_many([1, 2], [1, 2, 3])
+
+
+def test_add_many_numpy():
+    np = pytest.importorskip("numpy")
+    out = np.zeros(3)
+    assert add_many(np.arange(3.0), 2.0, out=out) is out
+    assert out.tolist() == [2.0, 3.0, 4.0]
+    assert add_many(np.arange(3), np.arange(3)).tolist() == [0, 2, 4]
+
+
+@pytest.mark.parametrize(
+    "a, b, out",
+    [
+        (memoryview(b"\xff\x01"), 1, None),
+        (array.array("b", [100, -100]), array.array("b", [100, 0]), None),
+        (array.array("B", [200, 0]), 100, array.array("B", [0, 0])),
+    ],
+)
+def test_add_many_overflow_raises_on_every_path(a, b, out, monkeypatch):
+    from simple_calculator_exl import core
+
+    with pytest.raises(OverflowError):
+        add_many(a, b, out=out)
+    monkeypatch.setattr(core, "_NUMPY", False)
+    with pytest.raises(OverflowError):
+        add_many(a, b, out=out)
+
+
+def test_add_many_no_overflow_when_extremes_do_not_meet():
+    a = array.array("B", [200, 0])
+    b = array.array("B", [0, 200])
+    assert add_many(a, b) == array.array("B", [200, 200])
+
+
+def test_add_many_list_out_raises_instead_of_wrapping():
+    np = pytest.importorskip("numpy")
+    out = [0]
+    with pytest.raises(OverflowError):
+        add_many(np.array([2**62]), [2**62], out=out)
+    assert out == [0]
+
+
+@pytest.mark.parametrize("big", [2**63, 2**70])
+def test_add_many_integer_buffer_never_turns_float(big, monkeypatch):
+    from simple_calculator_exl import core
+
+    pytest.importorskip("numpy")
+    with pytest.raises(OverflowError):
+        add_many(array.array("q", [1]), [big])
+    monkeypatch.setattr(core, "_NUMPY", False)
+    with pytest.raises(OverflowError):
+        add_many(array.array("q", [1]), [big])
+
+
+@pytest.mark.parametrize(
+    "a, b, out",
+    [
+        (array.array("i", [1]), array.array("i", [1, 2]), None),
+        (array.array("i", [1, 2]), 1, array.array("i", [0, 0, 0])),
+    ],
+)
+def test_add_many_numpy_does_not_broadcast(a, b, out, monkeypatch):
+    from simple_calculator_exl import core
+
+    np = pytest.importorskip("numpy")
+    with pytest.raises(ValueError):
+        add_many(a, b, out=out)
+    with pytest.raises(ValueError):
+        add_many(np.ones((2, 2)), np.ones(2))
+    monkeypatch.setattr(core, "_NUMPY", False)
+    with pytest.raises(ValueError):
+        add_many(a, b, out=out)
@@ -0,0 +1,50 @@
+import pytest
+
+from simple_calculator_exl.catalog import CATALOG, build_catalog, load_catalog_store
+from simple_calculator_exl.details import (
+    DetailCache,
+    preview_block,
+    preview_grid_options,
+    truncate_text,
+)
+
+pd = pytest.importorskip("pandas")
+
+
+def test_truncate_text_marks_cut_values():
+    previews = truncate_text(pd.Series(["short", "x" * 10]), limit=5)
+    assert previews.tolist() == ["short", "xxxxx…"]
+
+
+def test_preview_block_truncates_only_long_text_columns():
+    block = preview_block(build_catalog(), limit=20)
+    assert block["STIBO_Data"].str.len().max() <= 21
+    assert block["Images"].tolist() == build_catalog()["Images"].tolist()
+
+
+def test_detail_cache_fetches_full_text_once():
+    cache = DetailCache(load_catalog_store(), max_entries=2)
+    key = f"{CATALOG['SKU_NBR'][4]}|{CATALOG['Attributes'][4]}"
+    assert cache.get(key)["STIBO_Data"] == CATALOG["STIBO_Data"][4]
+    assert cache.get(key)["Recommended_Value"] == CATALOG["Recommended_Value"][4]
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.get("missing|key") is None
+
+
+def test_detail_cache_evicts_least_recently_used():
+    cache = DetailCache(load_catalog_store(), max_entries=2)
+    keys = [f"{s}|{a}" for s, a in zip(CATALOG["SKU_NBR"], CATALOG["Attributes"])]
+    cache.get_many(keys[:3])
+    assert list(cache._entries) == keys[1:3]
+
+
+def test_preview_grid_options_copies_column_defs():
+    pytest.importorskip("st_aggrid")
+    from simple_calculator_exl.image_carousel import build_grid_options
+
+    options = build_grid_options(build_catalog())
+    preview = preview_grid_options(options)
+    stibo = next(c for c in preview["columnDefs"] if c["field"] == "STIBO_Data")
+    assert stibo["autoHeight"] is False
+    assert stibo["wrapText"] is False
+    assert preview["columnDefs"] is not options["columnDefs"]
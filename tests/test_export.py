@@ -0,0 +1,58 @@
+import io
+
+import pytest
+
+from simple_calculator_exl.catalog import build_catalog, load_catalog_store
+from simple_calculator_exl.export import (
+    export_rows,
+    iter_chunks,
+    selection_keys,
+)
+
+pd = pytest.importorskip("pandas")
+
+
+def test_selection_keys_reads_only_key_columns():
+    rows = [{"SKU_NBR": "S08231", "Attributes": "Headline"}]
+    assert selection_keys(rows) == ["S08231|Headline"]
+    assert selection_keys(pd.DataFrame(rows)) == ["S08231|Headline"]
+    assert selection_keys(None) == []
+
+
+def test_selected_rows_resolve_against_the_store():
+    store = load_catalog_store()
+    selected = build_catalog().iloc[[7, 2]][["SKU_NBR", "Attributes"]]
+    assert store.positions(selection_keys(selected)).tolist() == [7, 2]
+    assert store.positions(["missing|key"]).tolist() == []
+
+
+def test_iter_chunks_bounds_chunk_size():
+    store = load_catalog_store()
+    chunks = list(iter_chunks(store, list(range(12)), chunk_size=5))
+    assert [len(c) for c in chunks] == [5, 5, 2]
+
+
+def test_csv_export_matches_grid_rows():
+    store = load_catalog_store()
+    data = export_rows(store, [3, 0, 11], "csv", chunk_size=2)
+    exported = pd.read_csv(io.BytesIO(data), dtype={"Comment": str})
+    expected = build_catalog().iloc[[3, 0, 11]].reset_index(drop=True)
+    assert exported["SKU_NBR"].tolist() == expected["SKU_NBR"].tolist()
+    assert exported["Images"].tolist() == expected["Images"].tolist()
+
+
+def test_parquet_export_applies_overlay():
+    pytest.importorskip("pyarrow")
+    store = load_catalog_store()
+    data = export_rows(
+        store,
+        list(range(12)),
+        "parquet",
+        chunk_size=5,
+        overlay=lambda rows: rows.assign(Comment="checked"),
+    )
+    exported = pd.read_parquet(io.BytesIO(data))
+    assert len(exported) == 12
+    assert set(exported["Comment"]) == {"checked"}
+    with pytest.raises(ValueError):
+        export_rows(store, [0], "xlsx")
@@ -0,0 +1,61 @@
+import pytest
+
+from simple_calculator_exl import ExpressionError, compile_expression, evaluate
+
+
+def test_evaluate_with_bindings():
+    assert evaluate("a + b * 2", a=1, b=3) == 7
+    assert evaluate("abs(x - 10) / 2", {"x": 4}) == 3.0
+
+
+def test_constant_folding_and_variables():
+    expr = compile_expression("x * (2 + 3) - -1")
+    assert expr.variables == ("x",)
+    assert expr(x=2) == 11
+
+
+def test_compiled_expressions_are_cached():
+    assert compile_expression("a + 1") is compile_expression("a + 1")
+
+
+def test_evaluate_many_columns_and_rows():
+    expr = compile_expression("price * qty + fee")
+    assert expr.evaluate_many({"price": [1, 2], "qty": [3, 4], "fee": 1}) == [4, 9]
+    rows = [{"price": 1, "qty": 1, "fee": 0}, {"price": 2, "qty": 2, "fee": 0}]
+    assert expr.evaluate_many(rows) == [1, 4]
+
+
+def test_evaluate_many_numpy():
+    np = pytest.importorskip("numpy")
+    result = compile_expression("a + b * 2").evaluate_many({"a": np.arange(3), "b": 1})
+    assert result.tolist() == [2, 3, 4]
+    result = compile_expression("a + b * 2").evaluate_many(
+        {"a": np.arange(3), "b": [1, 2, 3]}
+    )
+    assert result.tolist() == [2, 5, 8]
+
+
+@pytest.mark.parametrize(
+    "text", ["__import__('os')", "a.b", "a if b else c", "'x' + 1", "1 +", "abs"]
+)
+def test_rejects_non_arithmetic(text):
+    with pytest.raises(ExpressionError):
+        compile_expression(text)
+
+
+def test_missing_binding():
+    with pytest.raises(ExpressionError):
+        evaluate("a + b", a=1)
+    with pytest.raises(ExpressionError):
+        compile_expression("a + b").evaluate_many([{"a": 1, "b": 2}, {"a": 1}])
+
+
+def test_large_integer_powers_are_refused():
+    text = "((9**64)**64)**64" + "**64" * 20
+    expr = compile_expression(text)
+    with pytest.raises(OverflowError):
+        expr.evaluate()
+    with pytest.raises(OverflowError):
+        evaluate("x ** y", x=9, y=10**9)
+    assert evaluate("2 ** 100") == 2**100
+    assert evaluate("x ** 0.5", x=4) == 2.0
@@ -0,0 +1,135 @@
+from decimal import Decimal
+
+import pytest
+
+from simple_calculator_exl import add_exact, add_many_exact, core, sum_exact
+from simple_calculator_exl.fixed import (
+    INT64_MAX,
+    INT64_MIN,
+    Amounts,
+    add_units,
+    from_units,
+    from_units_many,
+    sum_units,
+    to_units,
+    to_units_many,
+)
+
+MIXED = [
+    "12.34",
+    "-0.5",
+    ".05",
+    "+3.",
+    "-0",
+    "007.10",
+    "1.200",
+    "2.5e1",
+    " 7 ",
+    "999999999999999.99",
+    "99999999999999999.99",
+    12,
+    -(2**70),
+    0.1,
+    Decimal("-3.10"),
+    Decimal("1E+3"),
+]
+
+
+@pytest.mark.parametrize(
+    ("value", "units"),
+    [
+        (12, 1200),
+        ("12.34", 1234),
+        ("-0.5", -50),
+        (".05", 5),
+        ("1.200", 120),
+        (Decimal("1E+3"), 100000),
+        ("2.5e1", 2500),
+        (0.1, 10),
+    ],
+)
+def test_to_units(value, units):
+    assert to_units(value) == units
+
+
+@pytest.mark.parametrize("value", ["1.234", Decimal("NaN"), "abc"])
+def test_to_units_rejects_inexact_or_invalid(value):
+    with pytest.raises((ValueError, ArithmeticError)):
+        to_units(value)
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_to_units_many_matches_to_units(monkeypatch, fast):
+    if fast:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(core, "_NUMPY", False)
+    assert list(to_units_many(MIXED)) == [to_units(value) for value in MIXED]
+    units = to_units_many(["1.10", "-2", ".5"] * 30000)
+    assert list(units[:3]) == [110, -200, 50] and len(units) == 90000
+    if fast:
+        assert units.dtype == "int64"
+    for bad in ["1.234", "1..2", "-", "1-2", "abc", "1\n2"]:
+        with pytest.raises((ValueError, ArithmeticError)):
+            to_units_many(["1.00", bad])
+
+
+@pytest.mark.parametrize("scale", [0, 2, 5])
+def test_from_units_many_formats_in_bulk(scale):
+    np = pytest.importorskip("numpy")
+    units = [0, 7, -7, 123456, -100, INT64_MAX, INT64_MIN]
+    expected = [from_units(u, scale, as_str=True) for u in units]
+    assert from_units_many(np.array(units), scale, as_str=True) == expected
+    assert from_units_many(units + [2**70], scale)[-1] == from_units(2**70, scale)
+
+
+def test_from_units_formats_exactly():
+    assert from_units(-1230, as_str=True) == "-12.30"
+    assert from_units(5, scale=3) == Decimal("0.005")
+    assert from_units(7, scale=0, as_str=True) == "7"
+
+
+def test_add_exact_avoids_float_rounding():
+    assert 0.1 + 0.2 != 0.3
+    assert add_exact(0.1, 0.2) == Decimal("0.30")
+    assert add_exact("19.99", "0.01", as_str=True) == "20.00"
+
+
+def test_add_many_exact_promotes_on_overflow():
+    big = INT64_MAX // 100
+    result = add_many_exact([big, "1.10"], [big, "2.20"], as_str=True)
+    assert result == [f"{2 * big}.00", "3.30"]
+    assert add_many_exact(["1.10", "-2"], ["2.20", "0.01"]) == [
+        Decimal("3.30"),
+        Decimal("-1.99"),
+    ]
+    with pytest.raises(ValueError):
+        add_many_exact([1], [1, 2])
+
+
+def test_add_many_exact_keeps_units_until_read():
+    np = pytest.importorskip("numpy")
+    result = add_many_exact(["1.10", "-2", "0.99"], ["2.20", "0.01", "0.01"])
+    assert isinstance(result, Amounts) and result.units.dtype == np.int64
+    assert result[1] == Decimal("-1.99") and result[-1] == Decimal("1.00")
+    assert result[:2] == [Decimal("3.30"), Decimal("-1.99")]
+    assert list(result) == result.tolist() and len(result) == 3
+
+
+def test_add_units_detects_int64_wraparound():
+    pytest.importorskip("numpy")
+    assert add_units([INT64_MAX, 1], [1, 1]) == [INT64_MAX + 1, 2]
+    assert add_units([-INT64_MAX, 0], [-INT64_MAX, 0]) == [-2 * INT64_MAX, 0]
+
+
+def test_sum_units_promotes_instead_of_wrapping():
+    assert sum_units([INT64_MAX, INT64_MAX, 2]) == 2 * INT64_MAX + 2
+    assert sum_units([2**70, 1]) == 2**70 + 1
+    assert sum_units([]) == 0
+
+
+def test_sum_exact_matches_decimal():
+    values = [f"{n % 997}.{n % 100:02d}" for n in range(10_000)]
+    expected = sum(map(Decimal, values))
+    assert sum_exact(iter(values), chunk_size=777) == expected
+    assert sum_exact(["0.1"] * 10, as_str=True) == "1.00"
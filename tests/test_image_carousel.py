@@ -0,0 +1,172 @@
+import pytest
+
+from simple_calculator_exl import image_carousel, image_carousel2
+from simple_calculator_exl.assets import asset_url
+from simple_calculator_exl.catalog import CATALOG_VERSION, build_catalog
+from simple_calculator_exl.renderers import (
+    IMAGE_SLIDER,
+    PREFETCH_NEIGHBOURS,
+    RENDERER_MODES,
+)
+
+pytest.importorskip("st_aggrid")
+
+APPS = [image_carousel, image_carousel2]
+
+
+def _column(options, field):
+    return next(c for c in options["columnDefs"] if c["field"] == field)
+
+
+@pytest.mark.parametrize("app", APPS)
+def test_fancy_renderer_auto_sizes_rows(app):
+    options = app.build_grid_options(build_catalog())
+    images = _column(options, "Images")
+    assert options["defaultColDef"]["autoHeight"] is True
+    assert images["cellRendererParams"]["fade"] is True
+
+
+@pytest.mark.parametrize("app", APPS)
+def test_fast_renderer_uses_fixed_row_heights(app):
+    options = app.build_grid_options(build_catalog(), renderer="fast")
+    images = _column(options, "Images")
+    assert options["defaultColDef"]["autoHeight"] is False
+    assert images["autoHeight"] is False
+    assert images["cellRendererParams"]["fade"] is False
+    assert options["rowHeight"] == 110
+
+
+def test_apps_share_the_slider_asset():
+    loaders, params = set(), []
+    for app in APPS:
+        for renderer in RENDERER_MODES:
+            options = app.build_grid_options(build_catalog(), renderer=renderer)
+            images = _column(options, "Images")
+            assert images["cellRenderer"] == IMAGE_SLIDER
+            loaders.add(options["components"][IMAGE_SLIDER].js_code)
+            params.append(images["cellRendererParams"])
+    assert len(loaders) == 1
+    assert "class ImageSliderRenderer" not in loaders.pop()
+    assert {p["scriptUrl"] for p in params} == {asset_url("image_slider.js")}
+    assert {p["variant"] for p in params} == {"classic", "portrait"}
+
+
+@pytest.mark.parametrize("app", APPS)
+def test_prefetch_can_be_tuned_or_disabled(app):
+    params = _column(app.build_grid_options(build_catalog()), "Images")[
+        "cellRendererParams"
+    ]
+    assert params["prefetch"] == PREFETCH_NEIGHBOURS
+    assert params["concurrency"] >= 1 and params["cacheSize"] >= 1
+    options = app.build_grid_options(build_catalog(), prefetch=0)
+    assert _column(options, "Images")["cellRendererParams"]["prefetch"] == 0
+    with pytest.raises(ValueError):
+        app.build_grid_options(build_catalog(), prefetch=-1)
+
+
+def test_app_prefetch_setting():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    prefetch = next(n for n in at.sidebar.number_input if n.label == "Prefetch images")
+    assert prefetch.value == PREFETCH_NEIGHBOURS
+    prefetch.set_value(0).run(timeout=30)
+    assert not at.exception
+
+
+@pytest.mark.parametrize("app", APPS)
+def test_app_renders(app):
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(app.__file__).run(timeout=30)
+    assert not at.exception
+    assert any("Matching Rows" in m.value for m in at.markdown)
+
+
+def test_app_instrumentation_panel():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    at.sidebar.checkbox[0].check().run(timeout=30)
+    assert not at.exception
+    assert at.sidebar.expander[0].label == "⏱️ Hot-path timings"
+    phases = at.table[0].value["phase"].tolist()
+    assert phases[:2] == ["load catalog", "serve rows"]
+
+
+def test_app_exports_all_matching_rows():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    export = next(r for r in at.sidebar.radio if r.label == "Export")
+    export.set_value("All matching rows").run(timeout=30)
+    assert not at.exception
+    assert any("Selected Rows" in m.value for m in at.markdown)
+    assert len(at.dataframe) == 1
+    assert not at.get("download_button")
+    prepare = next(b for b in at.button if b.label.startswith("📦 Prepare export"))
+    prepare.click().run(timeout=30)
+    assert not at.exception
+    assert any("Download" in b.label for b in at.get("download_button"))
+
+
+def test_app_previews_long_text():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    preview = next(c for c in at.sidebar.checkbox if c.label == "✂️ Preview long text")
+    preview.check().run(timeout=30)
+    assert not at.exception
+    assert any("Select rows" in c.value for c in at.caption)
+
+
+def test_sessions_share_one_catalog_store():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    from simple_calculator_exl.cache import catalog_cache
+
+    testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    held = catalog_cache.nbytes
+    store = catalog_cache.get_or_build(("catalog", CATALOG_VERSION), list)
+    for _ in range(3):
+        at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+        assert not at.exception
+    assert catalog_cache.nbytes == held
+    assert catalog_cache.get_or_build(("catalog", CATALOG_VERSION), list) is store
+
+
+def test_app_pivot_layout():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    layout = next(r for r in at.sidebar.radio if r.label == "Layout")
+    layout.set_value("One row per SKU").run(timeout=30)
+    assert not at.exception
+    assert "Image renderer" not in [r.label for r in at.sidebar.radio]
+    export = next(r for r in at.sidebar.radio if r.label == "Export")
+    export.set_value("All matching rows").run(timeout=30)
+    assert not at.exception
+    prepare = next(b for b in at.button if b.label.startswith("📦 Prepare export"))
+    prepare.click().run(timeout=30)
+    assert not at.exception
+    assert any("Download 12 rows" in b.label for b in at.get("download_button"))
+
+
+def test_app_pivot_shows_saved_comments():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    from simple_calculator_exl.cache import catalog_cache
+    from simple_calculator_exl.comments import CommentStore, Edit
+
+    CommentStore().write([Edit("S08231|Headline", "S08231", "Comment", "", "ok")])
+    at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    layout = next(r for r in at.sidebar.radio if r.label == "Layout")
+    layout.set_value("One row per SKU").run(timeout=30)
+    cells = next(r for r in at.sidebar.radio if r.label == "Attribute cells")
+    cells.set_value("Comment").run(timeout=30)
+    assert not at.exception
+    view = catalog_cache.get_or_build(("pivot_view", CATALOG_VERSION, "Comment"), None)
+    assert view.frame.loc["S08231", "Headline"] == "ok"
+
+
+def test_app_search_box():
+    testing = pytest.importorskip("streamlit.testing.v1")
+    at = testing.AppTest.from_file(image_carousel.__file__).run(timeout=30)
+    search = next(t for t in at.sidebar.text_input if t.label == "🔎 Search")
+    search.set_value("led lam").run(timeout=30)
+    assert not at.exception
+    values = [m.value for m in at.markdown]
+    assert "🔎 Matching Rows: `3`" in values
+    assert "🏷️ Matching SKUs: `1`" in values
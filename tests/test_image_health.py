@@ -0,0 +1,125 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from simple_calculator_exl.image_health import (
+    HEALTH_BROKEN,
+    HEALTH_NONE,
+    HEALTH_OK,
+    HEALTH_PARTIAL,
+    ImageValidator,
+    drop_broken,
+    health_flags,
+)
+
+
+@pytest.fixture
+def image_server():
+    """Stand-in image host speaking keep-alive HTTP/1.1."""
+    connections = set()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_HEAD(self):
+            connections.add(self.client_address)
+            if self.path.startswith("/nohead"):
+                self.send_response(405)
+            elif self.path.startswith("/moved"):
+                self.send_response(302)
+                self.send_header("Location", "/ok" + self.path[len("/moved") :])
+            elif self.path.startswith("/ok"):
+                self.send_response(200)
+                self.send_header("Content-Type", "image/png")
+            else:
+                self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def do_GET(self):
+            # Only hosts refusing HEAD get GETs, and only for the first byte.
+            assert self.headers["Range"] == "bytes=0-0"
+            if self.path.startswith("/nohead/ok"):
+                self.send_response(206)
+                self.send_header("Content-Range", "bytes 0-0/100")
+                self.send_header("Content-Length", "1")
+                self.end_headers()
+                self.wfile.write(b"x")
+            else:
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", connections
+    server.shutdown()
+    server.server_close()
+
+
+def test_validate_reports_status_and_follows_redirects(image_server):
+    base, _ = image_server
+    results = ImageValidator().validate(
+        [f"{base}/ok/1.png", f"{base}/missing.png", f"{base}/moved/2.png"]
+    )
+    assert results[f"{base}/ok/1.png"].ok
+    assert results[f"{base}/missing.png"].status == 404
+    assert not results[f"{base}/missing.png"].ok
+    assert results[f"{base}/moved/2.png"].ok
+
+
+def test_hosts_refusing_head_are_checked_with_a_ranged_get(image_server):
+    base, _ = image_server
+    validator = ImageValidator()
+    results = validator.validate([f"{base}/nohead/ok/1.png", f"{base}/nohead/2.png"])
+    assert results[f"{base}/nohead/ok/1.png"].ok
+    assert results[f"{base}/nohead/ok/1.png"].status == 206
+    assert results[f"{base}/nohead/2.png"].status == 404
+    assert validator.requests == 4
+
+
+def test_connections_are_reused_per_host(image_server):
+    base, connections = image_server
+    validator = ImageValidator(concurrency=8, per_host=2)
+    results = validator.validate(f"{base}/ok/{n}.png" for n in range(40))
+    assert all(status.ok for status in results.values())
+    assert validator.requests == 40
+    assert len(connections) <= 2
+
+
+def test_results_are_cached_until_they_expire(image_server):
+    base, _ = image_server
+    validator = ImageValidator()
+    validator.validate([f"{base}/ok/1.png"])
+    validator.validate([f"{base}/ok/1.png"])
+    assert validator.requests == 1
+    validator.ttl = 0
+    validator.validate([f"{base}/ok/1.png"])
+    assert validator.requests == 2
+
+
+def test_unreachable_and_unsupported_urls_fail():
+    results = ImageValidator(timeout=1).validate(
+        ["http://127.0.0.1:1/a.png", "ftp://example.com/a.png"]
+    )
+    assert not any(status.ok for status in results.values())
+    assert all(status.error for status in results.values())
+
+
+def test_health_flags_and_drop_broken(image_server):
+    base, _ = image_server
+    good, bad = f"{base}/ok/1.png", f"{base}/gone.png"
+    results = ImageValidator().validate([good, bad])
+    rows = [json.dumps([good]), json.dumps([good, bad]), [bad], []]
+    assert health_flags(rows, results) == [
+        HEALTH_OK,
+        HEALTH_PARTIAL,
+        HEALTH_BROKEN,
+        HEALTH_NONE,
+    ]
+    assert json.loads(drop_broken(rows[1], results)) == [good]
@@ -0,0 +1,36 @@
+import json
+import subprocess
+import sys
+
+# Budgets for a bare ``import simple_calculator_exl`` in a fresh interpreter.
+IMPORT_SECONDS_BUDGET = 0.25
+NEW_MODULES_BUDGET = 40
+FORBIDDEN_PREFIXES = ("streamlit", "st_aggrid", "pandas", "numpy", "pyarrow")
+
+PROBE = """
+import json, sys, time
+before = set(sys.modules)
+started = time.perf_counter()
+import simple_calculator_exl
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "modules": sorted(set(sys.modules) - before)}))
+"""
+
+
+def _probe():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_skips_ui_dependencies():
+    modules = _probe()["modules"]
+    heavy = [m for m in modules if m.split(".")[0] in FORBIDDEN_PREFIXES]
+    assert heavy == []
+
+
+def test_import_stays_within_budget():
+    result = _probe()
+    assert len(result["modules"]) <= NEW_MODULES_BUDGET, result["modules"]
+    assert result["seconds"] <= IMPORT_SECONDS_BUDGET
@@ -0,0 +1,116 @@
+import json
+
+import pandas as pd
+import pytest
+
+from simple_calculator_exl import catalog
+from simple_calculator_exl.catalog import CATALOG, build_catalog, load_catalog_store
+from simple_calculator_exl.catalog_store import CatalogStore
+from simple_calculator_exl.ingest import (
+    CatalogSchemaError,
+    detect_format,
+    ingest_catalog,
+    normalize_images,
+    source_fingerprint,
+)
+
+
+def _write(frame, path):
+    if path.suffix == ".parquet":
+        pytest.importorskip("pyarrow")
+        frame.to_parquet(path, index=False)
+    elif path.suffix == ".jsonl":
+        frame.to_json(path, orient="records", lines=True)
+    else:
+        frame.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("name", ["export.csv", "export.parquet", "export.jsonl"])
+def test_ingest_matches_sample_catalog(tmp_path, name):
+    frame = pd.DataFrame(CATALOG)
+    if name.endswith(".csv"):
+        # CSV exports keep image lists as pipe-separated text.
+        frame["Images"] = frame["Images"].map("|".join)
+    store = ingest_catalog(_write(frame, tmp_path / name), chunk_size=5)
+    pd.testing.assert_frame_equal(
+        store.grid_frame(), build_catalog(), check_dtype=False
+    )
+    assert store.frame["SKU_NBR"].dtype == "category"
+
+
+def test_chunked_ingest_sorts_like_the_sample(tmp_path):
+    from simple_calculator_exl.row_model import ServerSideRowModel
+
+    path = tmp_path / "export.csv"
+    path.write_text(
+        "SKU_NBR,Attributes,Images\n"
+        "B,Size,https://x/b.png\nC,Headline,https://x/c.png\nA,Color,https://x/a.png\n"
+    )
+    store = ingest_catalog(path, chunk_size=1)
+    model = ServerSideRowModel(store.frame)
+    for column, expected in (("SKU_NBR", "ABC"), ("Attributes", "CHS")):
+        rows, _ = model.get_block(0, 3, sort_model=[{"colId": column}])
+        assert "".join(value[0] for value in rows[column]) == expected
+    assert list(store.image_values.categories) == [
+        f"https://x/{name}.png" for name in "abc"
+    ]
+
+
+def test_ingest_fills_missing_optional_columns(tmp_path):
+    path = tmp_path / "minimal.csv"
+    path.write_text("SKU_NBR,Attributes,Images\n1,Headline,\n1,Size,\n")
+    store = ingest_catalog(path)
+    assert list(store.columns) == list(CATALOG)
+    assert store.images(0) == []
+    assert store.frame["Product_Name"].tolist() == ["", ""]
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        ("SKU_NBR,Images\n1,\n", "missing required columns: Attributes"),
+        ("SKU_NBR,Attributes\n,Headline\n", "row 1: SKU_NBR is blank"),
+        ("SKU_NBR,Attributes,Scoring\n1,A,high\n", "Scoring 'high'"),
+        ("SKU_NBR,Attributes,Images\n1,A,ftp://x/y.png\n", "non-HTTP URL"),
+        ("SKU_NBR,Attributes\n1,A\n2,A\n1,A\n", "row 1: SKU 1 lists 'A'"),
+    ],
+)
+def test_ingest_rejects_bad_rows(tmp_path, body, message):
+    path = tmp_path / "bad.csv"
+    path.write_text(body)
+    with pytest.raises(CatalogSchemaError, match=message):
+        ingest_catalog(path, chunk_size=1)
+
+
+def test_normalize_images():
+    assert normalize_images(json.dumps(["http://a", "http://b"])) == [
+        "http://a",
+        "http://b",
+    ]
+    assert normalize_images(" http://a ; http://b http://a ") == [
+        "http://a",
+        "http://b",
+    ]
+    assert normalize_images(None) == normalize_images("") == []
+
+
+def test_detect_format():
+    assert detect_format("catalog.csv.gz") == "csv"
+    assert detect_format("catalog.ndjson") == "jsonl"
+    with pytest.raises(ValueError, match="cannot tell"):
+        detect_format("catalog.xlsx")
+
+
+def test_snapshot_round_trip_and_catalog_source(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    export = _write(pd.DataFrame(CATALOG), tmp_path / "export.jsonl")
+    ingest_catalog(export, output=tmp_path / "snapshot")
+    assert len(CatalogStore.open(tmp_path / "snapshot")) == len(CATALOG["SKU_NBR"])
+
+    monkeypatch.setenv(catalog.SOURCE_ENV, str(tmp_path / "snapshot"))
+    store = load_catalog_store()
+    assert store.images(2) == CATALOG["Images"][2]
+    assert catalog.catalog_version() == (
+        f"{catalog.CATALOG_VERSION}-{source_fingerprint(tmp_path / 'snapshot')}"
+    )
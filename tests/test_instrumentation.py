@@ -0,0 +1,92 @@
+import csv
+import io
+import json
+import tracemalloc
+
+from simple_calculator_exl.instrumentation import FIELDS, PhaseTimer, to_csv, to_json
+
+
+def test_disabled_timer_records_nothing():
+    timer = PhaseTimer()
+    assert timer.phase("a") is timer.phase("b")
+    with timer.phase("a"):
+        pass
+    timer.start()
+    timer.stop()
+    assert timer.records == []
+    assert timer.profile_report() == ""
+
+
+def test_enabled_timer_records_phases():
+    timer = PhaseTimer(enabled=True, track_memory=True, rerun=3)
+    with timer.phase("build"):
+        data = [0] * 100_000
+    with timer.phase("sum"):
+        sum(data)
+    assert [r["phase"] for r in timer.records] == ["build", "sum"]
+    assert all(r["rerun"] == 3 and r["seconds"] >= 0 for r in timer.records)
+    assert timer.records[0]["peak_memory_bytes"] >= 800_000
+
+
+def test_profile_report():
+    timer = PhaseTimer(enabled=True, profile=True)
+    timer.start()
+    sorted(range(1000), key=str)
+    timer.stop()
+    assert "function calls" in timer.profile_report()
+
+
+def test_only_one_rerun_profiles_at_a_time():
+    first = PhaseTimer(enabled=True, profile=True)
+    second = PhaseTimer(enabled=True, profile=True)
+    first.start()
+    second.start()
+    first.stop()
+    second.stop()
+    assert not first.profiler_busy and second.profiler_busy
+    assert second.profile_report() == ""
+
+    third = PhaseTimer(enabled=True, profile=True)
+    third.start()
+    third.stop()
+    assert not third.profiler_busy and "function calls" in third.profile_report()
+
+
+def test_profiler_busy_when_another_tool_profiles(monkeypatch):
+    import cProfile
+
+    class Taken(cProfile.Profile):
+        def enable(self):
+            raise ValueError("Another profiling tool is already active")
+
+    monkeypatch.setattr(cProfile, "Profile", Taken)
+    timer = PhaseTimer(enabled=True, profile=True)
+    timer.start()
+    timer.stop()
+    assert timer.profiler_busy and timer.profile_report() == ""
+
+
+def test_overlapping_phases_share_tracemalloc():
+    was_tracing = tracemalloc.is_tracing()
+    first = PhaseTimer(enabled=True, track_memory=True)
+    second = PhaseTimer(enabled=True, track_memory=True)
+    with first.phase("outer"):
+        with second.phase("inner"):
+            data = [0] * 100_000
+        assert tracemalloc.is_tracing()
+    with first.phase("alone"):
+        data = [0] * 100_000
+    del data
+    peaks = [r["peak_memory_bytes"] for r in first.records + second.records]
+    assert peaks[0] is None and peaks[2] is None and peaks[1] >= 800_000
+    assert tracemalloc.is_tracing() == was_tracing
+
+
+def test_exports():
+    timer = PhaseTimer(enabled=True)
+    with timer.phase("a"):
+        pass
+    assert json.loads(to_json(timer.records)) == timer.records
+    rows = list(csv.DictReader(io.StringIO(to_csv(timer.records))))
+    assert tuple(rows[0]) == FIELDS
+    assert rows[0]["phase"] == "a"
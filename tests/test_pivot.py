@@ -0,0 +1,113 @@
+import pytest
+
+from simple_calculator_exl.catalog import CATALOG, load_catalog_store
+from simple_calculator_exl.pivot import PivotView, SkuIndex
+from simple_calculator_exl.row_model import ServerSideRowModel
+
+pd = pytest.importorskip("pandas")
+
+
+def test_sku_index_returns_each_skus_rows():
+    store = load_catalog_store()
+    index = SkuIndex(store.frame["SKU_NBR"])
+    assert len(index) == 4
+    for sku in set(CATALOG["SKU_NBR"]):
+        expected = [i for i, s in enumerate(CATALOG["SKU_NBR"]) if s == sku]
+        assert index.rows(sku).tolist() == expected
+    assert index.rows("missing").tolist() == []
+    index.add(["missing", "S08231"], [12, 13])
+    assert "missing" in index
+    assert index.rows("S08231").tolist() == [0, 1, 2, 13]
+
+
+def test_sku_index_adds_many_rows_at_once():
+    index = SkuIndex(load_catalog_store().frame["SKU_NBR"])
+    skus = ["N1", "N2", "N1"] * 1000
+    index.add(skus, range(12, 12 + len(skus)))
+    index.add(["N1"], [5000])
+    expected = [12 + n for n, sku in enumerate(skus) if sku == "N1"]
+    assert index.rows("N1").tolist() == [*expected, 5000]
+    assert index.rows("n2", case=False).tolist() == list(range(13, 3012, 3))
+
+
+def test_pivot_keeps_the_last_of_repeated_attributes():
+    frame = load_catalog_store().frame.astype(object)
+    repeated = frame.iloc[[0]].assign(STIBO_Data="again", Scoring=0.0)
+    pivot = PivotView(pd.concat([frame, repeated], ignore_index=True))
+    assert len(pivot.frame) == 4
+    assert pivot.frame.loc["S08231", "Headline"] == "again"
+    assert pivot.frame.loc["S08231", "Scoring_min"] == 0.0
+    pivot.update(pd.concat([repeated, repeated.assign(STIBO_Data="third")]))
+    assert pivot.frame.loc["S08231", "Headline"] == "third"
+
+
+def test_pivot_has_one_row_per_sku_with_score_stats():
+    pivot = PivotView(load_catalog_store().frame)
+    assert len(pivot.frame) == 4
+    assert pivot.attributes == ["Headline", "Manufacturer", "Description"]
+    row = pivot.frame.loc["S08231"]
+    scores = CATALOG["Scoring"][:3]
+    assert row["Headline"] == CATALOG["STIBO_Data"][0]
+    assert row["Scoring_min"] == min(scores)
+    assert row["Scoring_mean"] == pytest.approx(sum(scores) / 3)
+    assert pivot.grid_frame().columns[0] == "SKU_NBR"
+
+
+def test_pivot_updates_only_touched_skus():
+    pivot = PivotView(load_catalog_store().frame)
+    before = pivot.frame.loc["621158"].copy()
+    pivot.update(
+        pd.DataFrame(
+            {
+                "SKU_NBR": ["S08231", "N1"],
+                "Product_Name": ["NYX Concealer", "New Lamp"],
+                "Attributes": ["Headline", "Color"],
+                "STIBO_Data": ["edited", "red"],
+                "Scoring": [0.0, 0.5],
+            }
+        )
+    )
+    assert pivot.frame.loc["S08231", "Headline"] == "edited"
+    assert pivot.frame.loc["S08231", "Scoring_min"] == 0.0
+    assert pivot.frame.loc["N1", "Color"] == "red"
+    assert pivot.frame.loc["N1", "Product_Name"] == "New Lamp"
+    assert pivot.frame.loc["N1", "Scoring_mean"] == 0.5
+    assert pd.isna(pivot.frame.loc["N1", "Headline"])
+    pd.testing.assert_series_equal(
+        pivot.frame.loc["621158"].drop("Color"), before, check_names=False
+    )
+
+
+def test_comment_pivot_takes_edited_rows():
+    frame = load_catalog_store().frame
+    pivot = PivotView(frame, value_column="Comment")
+    pivot.update(frame.iloc[[1]].astype(object).assign(Comment="check brand"))
+    assert pivot.frame.loc["S08231", "Manufacturer"] == "check brand"
+    assert pivot.frame.loc["S08231", "Headline"] == frame["Comment"][0]
+
+
+def test_row_model_uses_index_for_exact_filters():
+    store = load_catalog_store()
+    index = SkuIndex(store.frame["SKU_NBR"])
+    model = ServerSideRowModel(store.frame, indexes={"SKU_NBR": index})
+    filter_model = {
+        "SKU_NBR": {"filterType": "text", "type": "equals", "filter": "812450"},
+        "Attributes": {"filterType": "text", "type": "contains", "filter": "a"},
+    }
+    rows, count = model.get_block(0, 10, filter_model=filter_model)
+    assert count == 2
+    assert rows["Attributes"].tolist() == ["Headline", "Manufacturer"]
+
+
+def test_index_and_scan_agree_on_case():
+    store = load_catalog_store()
+    indexed = ServerSideRowModel(
+        store.frame, indexes={"SKU_NBR": SkuIndex(store.frame["SKU_NBR"])}
+    )
+    scanned = ServerSideRowModel(store.frame)
+    for value, expected in (("S08231", 3), ("s08231", 3), ("missing", 0)):
+        filter_model = {
+            "SKU_NBR": {"filterType": "text", "type": "equals", "filter": value}
+        }
+        assert indexed.row_count(filter_model) == expected
+        assert scanned.row_count(filter_model) == expected
@@ -0,0 +1,79 @@
+import pytest
+
+from simple_calculator_exl.row_model import ServerSideRowModel
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture
+def model():
+    df = pd.DataFrame(
+        {
+            "sku": [f"S{i:03d}" for i in range(10)],
+            "name": ["Lamp", "Bottle"] * 5,
+            "score": [0.1 * i for i in range(10)],
+        },
+        index=range(100, 110),
+    )
+    return ServerSideRowModel(df, block_size=4, prefetch_blocks=1)
+
+
+def test_get_block_serves_only_requested_rows(model):
+    rows, count = model.get_block(4, 8)
+    assert count == 10
+    assert rows["sku"].tolist() == ["S004", "S005", "S006", "S007"]
+    # The requested block and the one after it are materialized.
+    assert len(model._blocks) == 2
+
+
+def test_sort_and_filter_run_on_backing_data(model):
+    rows, count = model.get_block(
+        0,
+        3,
+        sort_model=[{"colId": "score", "sort": "desc"}],
+        filter_model={
+            "name": {"filterType": "text", "type": "contains", "filter": "lamp"}
+        },
+    )
+    assert count == 5
+    assert rows["sku"].tolist() == ["S008", "S006", "S004"]
+
+
+def test_get_rows_spans_blocks_and_reports_last_row(model):
+    response = model.get_rows(
+        {
+            "startRow": 2,
+            "endRow": 12,
+            "filterModel": {
+                "score": {"filterType": "number", "type": "greaterThan", "filter": 0.15}
+            },
+        }
+    )
+    assert [r["sku"] for r in response["rowData"]] == [f"S00{i}" for i in range(4, 10)]
+    assert response["rowCount"] == response["lastRow"] == 8
+
+
+def test_invalidate_drops_caches(model):
+    model.get_block(0, 4)
+    model.invalidate()
+    assert not model._blocks and not model._views
+
+
+def test_positions_follow_the_view(model):
+    sort_model = [{"colId": "score", "sort": "desc"}]
+    filter_model = {"name": {"filterType": "text", "type": "equals", "filter": "lamp"}}
+    assert model.positions(sort_model, filter_model).tolist() == [8, 6, 4, 2, 0]
+
+
+def test_quick_filter_uses_search_index(model):
+    class Search:
+        def search(self, text):
+            return np.array([1, 3, 5]) if text == "lamp" else np.array([], int)
+
+    np = pytest.importorskip("numpy")
+    indexed = ServerSideRowModel(model.df, block_size=4, search=Search())
+    rows, count = indexed.get_block(0, 4, filter_model=None, quick_filter="lamp")
+    assert count == 3
+    assert rows["sku"].tolist() == ["S001", "S003", "S005"]
+    # Without an index every word is looked for in the text columns.
+    assert model.row_count(quick_filter="bott s00") == 5
@@ -0,0 +1,95 @@
+import array
+import random
+
+import numpy as np
+import pytest
+
+from simple_calculator_exl import RunningSum, core
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 8, 9, 100])
+def test_bulk_build_matches_prefix_sums(n):
+    values = list(range(1, n + 1))
+    sums = RunningSum(values, typecode="q")
+    assert len(sums) == n
+    assert [sums.prefix_sum(k) for k in range(n + 1)] == [
+        sum(values[:k]) for k in range(n + 1)
+    ]
+
+
+def test_build_without_numpy_matches(monkeypatch):
+    values = [random.Random(1).randint(-100, 100) for _ in range(257)]
+    fast = RunningSum(values, typecode="q")
+    monkeypatch.setattr(core, "_NUMPY", False)
+    slow = RunningSum(values, typecode="q")
+    assert fast._tree == slow._tree
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_integer_overflow_raises_and_keeps_the_sums(fast, monkeypatch):
+    if not fast:
+        monkeypatch.setattr(core, "_NUMPY", False)
+    with pytest.raises(OverflowError):
+        RunningSum([2**30] * 4, typecode="i")
+    with pytest.raises(OverflowError):
+        RunningSum([2**62, 2**62], typecode="q")
+
+    values = [2**30, 2**29, 1]
+    sums = RunningSum(values, typecode="i")
+    with pytest.raises(OverflowError):
+        sums.append(2**30)
+    with pytest.raises(OverflowError):
+        sums.add(1, 2**29)
+    assert sums.tolist() == values
+    assert [sums.prefix_sum(k) for k in range(4)] == [
+        0,
+        2**30,
+        3 * 2**29,
+        3 * 2**29 + 1,
+    ]
+
+
+def test_random_updates_appends_and_ranges():
+    rng = random.Random(0)
+    values = [rng.randint(-50, 50) for _ in range(50)]
+    sums = RunningSum(values, typecode="q")
+    for _ in range(500):
+        action = rng.random()
+        if action < 0.4:
+            i = rng.randrange(len(values))
+            values[i] = rng.randint(-50, 50)
+            sums[i] = values[i]
+        elif action < 0.6:
+            values.append(rng.randint(-50, 50))
+            sums.append(values[-1])
+        else:
+            start = rng.randint(-len(values), len(values))
+            stop = rng.randint(-len(values), len(values))
+            assert sums.range_sum(start, stop) == sum(values[start:stop])
+    assert sums.tolist() == values
+    assert sums.total() == sum(values)
+
+
+def test_append_to_empty_and_extend():
+    sums = RunningSum(typecode="q")
+    sums.extend(range(10))
+    assert sums.total() == 45
+    assert sums.range_sum(3, 6) == 12
+    assert sums.range_sum(6, 3) == 0
+
+
+def test_add_and_negative_index():
+    sums = RunningSum([1.5, 2.5, 3.0])
+    sums.add(-1, 1.0)
+    assert sums[-1] == 4.0
+    assert sums.total() == 8.0
+    with pytest.raises(IndexError):
+        sums.add(3, 1.0)
+
+
+def test_typecode_follows_buffer_input():
+    assert RunningSum(array.array("i", [1, 2])).typecode == "i"
+    from_numpy = RunningSum(np.arange(5, dtype=np.int64))
+    assert from_numpy.typecode == np.dtype(np.int64).char
+    assert from_numpy.range_sum(1, 4) == 6
+    assert RunningSum([1, 2]).typecode == "d"
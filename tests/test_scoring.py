@@ -0,0 +1,56 @@
+import pytest
+
+from simple_calculator_exl.scoring import (
+    SimilarityScorer,
+    jaccard,
+    score_frame,
+    tokenize,
+)
+
+CORPUS = [
+    "EcoFresh Stainless Steel Water Bottle",
+    "EcoFresh Thermal Bottle",
+    "GlowTech LED Desk Lamp",
+    "GlowTech Smart LED Lamp",
+]
+
+
+def test_tokenize_and_jaccard():
+    assert tokenize("Sun&Sky Women's Flip-Flop") == [
+        "sun",
+        "sky",
+        "women",
+        "s",
+        "flip",
+        "flop",
+    ]
+    assert jaccard(["a", "b"], ["b", "c"]) == pytest.approx(1 / 3)
+
+
+def test_score_ranks_related_texts_higher():
+    scorer = SimilarityScorer().fit(CORPUS)
+    assert scorer.score(CORPUS[0], CORPUS[0]) == pytest.approx(1.0)
+    related = scorer.score(CORPUS[0], CORPUS[1])
+    unrelated = scorer.score(CORPUS[0], CORPUS[2])
+    assert 0.0 == unrelated < related < 1.0
+
+
+def test_scores_are_cached():
+    scorer = SimilarityScorer().fit(CORPUS)
+    scorer.score(CORPUS[2], CORPUS[3])
+    assert scorer.cached_score(CORPUS[2], CORPUS[3]) is not None
+    assert scorer.vector(CORPUS[2]) is scorer.vector(CORPUS[2])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_score_frame(workers):
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame(
+        {"STIBO_Data": CORPUS[::2] * 3, "Recommended_Value": CORPUS[1::2] * 3},
+        index=list("abcdef"),
+    )
+    scorer = SimilarityScorer(max_cached=1).fit(CORPUS)
+    scores = score_frame(df, scorer=scorer, chunk_size=1, workers=workers)
+    assert list(scores.index) == list("abcdef")
+    expected = [scorer.score(a, b) for a, b in zip(CORPUS[::2], CORPUS[1::2])] * 3
+    assert scores.tolist() == expected
@@ -0,0 +1,91 @@
+import pytest
+
+from simple_calculator_exl.catalog import CATALOG, load_catalog_store
+from simple_calculator_exl.search import QuickFilterIndex, SkuSearch, tokenize
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def frame():
+    return load_catalog_store().frame
+
+
+def _brute_force(frame, query):
+    words = tokenize(query)
+    rows = []
+    for position, values in enumerate(
+        zip(frame["Product_Name"], frame["STIBO_Data"], frame["Recommended_Value"])
+    ):
+        text = {t for value in values for t in tokenize(value)}
+        if all(any(t.startswith(w) for t in text) for w in words):
+            rows.append(position)
+    return rows
+
+
+def test_tokenize_splits_on_punctuation():
+    assert tokenize("Sun&Sky Women's Flip-Flop, LED_lamp") == [
+        "sun",
+        "sky",
+        "women",
+        "s",
+        "flip",
+        "flop",
+        "led",
+        "lamp",
+    ]
+
+
+@pytest.mark.parametrize(
+    "query", ["lamp", "LAMP led", "conc", "flip fl", "sun&sky", "eco bott", "zzz", ""]
+)
+def test_search_matches_brute_force(frame, query):
+    index = QuickFilterIndex(frame)
+    assert index.search(query).tolist() == _brute_force(frame, query)
+
+
+def test_whole_word_search(frame):
+    index = QuickFilterIndex(frame)
+    assert len(index.search("lam", prefix=False)) == 0
+    assert len(index.search("lamp", prefix=False)) > 0
+
+
+def test_group_by_sku(frame):
+    index = QuickFilterIndex(frame)
+    groups = index.group_by_sku(index.search("concealer"))
+    assert list(groups) == ["S08231"]
+    assert groups["S08231"].tolist() == [0, 1, 2]
+    assert index.sku_count(index.search("bottle")) == 1
+
+
+def test_sku_search_combines_attribute_rows(frame):
+    index = QuickFilterIndex(frame)
+    # "adjustable" and "workspaces" sit on different rows of the same SKU.
+    assert len(index.search("adjustable workspaces")) == 0
+    assert index.search_skus("adjustable workspaces") == ["812450"]
+    wide = pd.Series(["700321", "812450", "S08231"])
+    assert SkuSearch(index, wide).search("adjustable workspaces").tolist() == [1]
+
+
+def test_update_reindexes_edited_and_appended_rows(frame):
+    index = QuickFilterIndex(frame)
+    edited = frame.iloc[[0]].astype(object)
+    edited["STIBO_Data"] = "Vegan cushion"
+    added = pd.DataFrame(
+        {
+            "SKU_NBR": ["999999"],
+            "Product_Name": ["Vegan Mug"],
+            "STIBO_Data": ["Ceramic"],
+            "Recommended_Value": [""],
+        },
+        index=[len(CATALOG["SKU_NBR"])],
+    )
+    index.update(pd.concat([edited, added]))
+    assert index.search("vegan").tolist() == [0, 12]
+    assert 0 not in index.search("palette").tolist()
+    assert 0 in index.search("nyx").tolist()
+    assert index.search_skus("vegan") == ["S08231", "999999"]
+    edited["STIBO_Data"] = "Plain"
+    index.update(edited)
+    assert index.search("vegan").tolist() == [12]
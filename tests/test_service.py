@@ -0,0 +1,132 @@
+import asyncio
+
+import pytest
+
+from simple_calculator_exl.service import CalcClient, CalcService, load_test
+
+
+def run_with_service(scenario, path=None, **options):
+    async def main():
+        service = CalcService(**options)
+        server = await service.start("127.0.0.1", 0, path)
+        if path is None:
+            port = server.sockets[0].getsockname()[1]
+            client = await CalcClient.connect("127.0.0.1", port)
+        else:
+            port = None
+            client = await CalcClient.connect(path=path)
+        try:
+            return await scenario(service, client, port)
+        finally:
+            await client.close()
+            await service.close()
+
+    return asyncio.run(main())
+
+
+def test_concurrent_adds_are_coalesced():
+    async def scenario(service, client, _):
+        results = await asyncio.gather(
+            *(client.call("add", a=n, b=1) for n in range(200))
+        )
+        return results, service.coalescer.batches
+
+    results, batches = run_with_service(scenario, window=0.01)
+    assert results == [n + 1 for n in range(200)]
+    assert batches < 10
+
+
+def test_batch_operations_and_expressions():
+    async def scenario(_, client, __):
+        return await asyncio.gather(
+            client.call("add_many", a=[1, 2], b=[10, 20]),
+            client.call("evaluate", expression="x * 2 + 1", bindings={"x": 4}),
+            client.call("evaluate", expression="x * 2 + 1", bindings={"x": 0.5}),
+            client.call(
+                "evaluate_many", expression="x + y", bindings={"x": [1, 2], "y": 3}
+            ),
+        )
+
+    assert run_with_service(scenario) == [[11, 22], 9, 2.0, [4, 5]]
+
+
+def test_failing_request_does_not_fail_its_batch():
+    async def scenario(_, client, __):
+        return await asyncio.gather(
+            client.call("evaluate", expression="1 / x", bindings={"x": 2}),
+            client.call("evaluate", expression="1 / x", bindings={"x": 0}),
+            client.call("evaluate", expression="1 / x", bindings={}),
+            client.call("nope"),
+            return_exceptions=True,
+        )
+
+    half, divide_by_zero, missing, unknown = run_with_service(scenario)
+    assert half == 0.5
+    assert "ZeroDivisionError" in str(divide_by_zero)
+    assert "missing binding" in str(missing)
+    assert "unknown op" in str(unknown)
+
+
+def test_unencodable_results_and_unexpected_errors_are_answered():
+    deep = "x+" * 50_000 + "x"
+
+    async def scenario(_, client, __):
+        calls = [
+            client.call("evaluate", expression="x ** 0.5", bindings={"x": -1}),
+            client.call("evaluate", expression=deep, bindings={"x": 1}),
+            client.call("evaluate", expression=deep, bindings={"x": 2}),
+            client.call("evaluate_many", expression=deep, bindings={"x": [1]}),
+            client.call("evaluate", expression="x ** 0.5", bindings={"x": 4}),
+        ]
+        return await asyncio.wait_for(
+            asyncio.gather(*calls, return_exceptions=True), 10
+        )
+
+    complex_result, *recursion, root = run_with_service(scenario)
+    assert "TypeError" in str(complex_result)
+    assert all("RecursionError" in str(error) for error in recursion)
+    assert root == 2.0
+
+
+def test_unexpected_errors_fail_every_request_of_the_batch():
+    def broken(key, items):
+        raise RuntimeError("bug")
+
+    async def scenario(service, client, __):
+        service.coalescer.run = broken
+        calls = [client.call("add", a=n, b=1) for n in range(3)]
+        return await asyncio.wait_for(
+            asyncio.gather(*calls, return_exceptions=True), 10
+        )
+
+    errors = run_with_service(scenario, window=0.01)
+    assert [str(error) for error in errors] == ["RuntimeError: bug"] * 3
+
+
+def test_backpressure_limits_still_answer_everything():
+    async def scenario(_, client, __):
+        return await asyncio.gather(*(client.call("add", a=n, b=n) for n in range(50)))
+
+    results = run_with_service(scenario, max_inflight=2, max_pending=3)
+    assert results == [2 * n for n in range(50)]
+
+
+def test_unix_socket(tmp_path):
+    if not hasattr(asyncio, "start_unix_server"):
+        pytest.skip("no Unix sockets on this platform")
+
+    async def scenario(_, client, __):
+        return await client.call("add", a=1.5, b=2)
+
+    assert run_with_service(scenario, path=str(tmp_path / "calc.sock")) == 3.5
+
+
+def test_load_test_reports_latency_percentiles():
+    async def scenario(_, __, port):
+        return await load_test(port=port, connections=2, concurrency=4, requests=200)
+
+    stats = run_with_service(scenario)
+    assert stats["requests"] == 200
+    assert stats["errors"] == 0
+    assert 0 < stats["p50_ms"] <= stats["p99_ms"]
+    assert stats["throughput"] > 0
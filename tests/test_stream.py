@@ -0,0 +1,51 @@
+import io
+import math
+import random
+
+import pytest
+
+from simple_calculator_exl import sum_stream
+
+
+@pytest.mark.parametrize("algorithm", ["neumaier", "pairwise", "exact"])
+def test_sum_stream_matches_fsum(algorithm):
+    rng = random.Random(7)
+    values = [rng.uniform(-1, 1) * 10 ** rng.randint(-8, 8) for _ in range(5000)]
+    result = sum_stream(iter(values), chunk_size=333, algorithm=algorithm)
+    assert result.count == len(values)
+    assert result.total == pytest.approx(math.fsum(values), rel=1e-12, abs=1e-9)
+
+
+def test_sum_stream_exact_is_correctly_rounded():
+    values = [1e100, 1.0, -1e100, 1e-100] * 50
+    assert sum_stream(values, chunk_size=7, algorithm="exact").total == math.fsum(
+        values
+    )
+
+
+def test_sum_stream_reads_csv_column():
+    handle = io.StringIO("sku,price\na,1.5\nb,2.5\nc,\n")
+    result = sum_stream(handle, column="price")
+    assert (result.total, result.count) == (4.0, 2)
+    assert result.throughput > 0
+
+
+def test_sum_stream_skips_header_for_column_index():
+    text = "sku,price\na,1.5\nb,2.5\n"
+    assert sum_stream(io.StringIO(text), column=1).total == 4.0
+    assert sum_stream(io.StringIO("1\n2\n"), column=0).total == 3.0
+    assert sum_stream(io.StringIO("1\n2\n"), header=True).total == 2.0
+    with pytest.raises(ValueError):
+        sum_stream(io.StringIO(text), column=1, header=False)
+
+
+def test_sum_stream_workers_are_deterministic():
+    values = [0.1] * 10000
+    serial = sum_stream(values, chunk_size=1000, algorithm="exact")
+    parallel = sum_stream(values, chunk_size=1000, workers=2, algorithm="exact")
+    assert parallel.total == serial.total == math.fsum(values)
+
+
+def test_sum_stream_rejects_unknown_algorithm():
+    with pytest.raises(ValueError):
+        sum_stream([1.0], algorithm="kahan")
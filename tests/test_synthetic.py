@@ -0,0 +1,22 @@
+import pytest
+
+from simple_calculator_exl.catalog import CATALOG
+from simple_calculator_exl.synthetic import generate_catalog
+
+
+def test_generate_catalog_shape():
+    columns = generate_catalog(50, attributes=4, images=3)
+    assert list(columns) == list(CATALOG)
+    assert all(len(values) == 200 for values in columns.values())
+    assert len(set(columns["SKU_NBR"])) == 50
+    assert all(1 <= len(urls) <= 3 for urls in columns["Images"])
+
+
+def test_generate_catalog_is_deterministic():
+    assert generate_catalog(5, seed=1) == generate_catalog(5, seed=1)
+    assert generate_catalog(5, seed=1) != generate_catalog(5, seed=2)
+
+
+def test_generate_catalog_rejects_too_many_attributes():
+    with pytest.raises(ValueError):
+        generate_catalog(1, attributes=9)
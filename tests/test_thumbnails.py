@@ -0,0 +1,110 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pytest
+
+from simple_calculator_exl.thumbnails import ThumbnailCache, fetch_url
+
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture(scope="module")
+def image_server():
+    """Stand-in for the remote image host, serving 800x600 PNGs."""
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            if self.path.startswith("/missing"):
+                self.send_error(404)
+                return
+            buffer = BytesIO()
+            shade = sum(self.path.encode()) % 256
+            Image.new("RGB", (800, 600), (shade, 80, 160)).save(buffer, "PNG")
+            self.send_response(200)
+            self.send_header("Content-Type", "image/png")
+            self.end_headers()
+            self.wfile.write(buffer.getvalue())
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", requests
+    server.shutdown()
+
+
+def test_thumbnail_is_downsized_and_fetched_once(tmp_path, image_server):
+    base, requests = image_server
+    cache = ThumbnailCache(tmp_path, size=(200, 100))
+    url = f"{base}/id/1/800/600"
+
+    path = cache.thumbnail_path(url)
+    assert cache.thumbnail_path(url) == path
+    assert requests.count("/id/1/800/600") == 1
+    with Image.open(path) as thumb:
+        assert thumb.size == (133, 100)
+
+
+def test_rewrite_images_keeps_originals_for_click(tmp_path, image_server):
+    base, _ = image_server
+    cache = ThumbnailCache(tmp_path, url_prefix="/thumbs/")
+    images = json.dumps([f"{base}/id/2/800/600", f"{base}/missing.png"])
+
+    entries = json.loads(cache.rewrite_images(images))
+    assert entries[0]["thumb"].startswith("/thumbs/")
+    assert entries[0]["src"] == f"{base}/id/2/800/600"
+    assert entries[1] == {"thumb": f"{base}/missing.png", "src": f"{base}/missing.png"}
+
+
+def test_size_cap_evicts_least_recently_used(tmp_path, image_server):
+    base, _ = image_server
+    cache = ThumbnailCache(tmp_path, size=(200, 100))
+    first = cache.thumbnail_path(f"{base}/id/3/800/600")
+    cache.max_bytes = first.stat().st_size * 2
+    cache.thumbnail_path(f"{base}/id/4/800/600")
+    cache.thumbnail_path(f"{base}/id/5/800/600")
+    assert not first.exists()
+    assert len(list(tmp_path.glob("*.jpg"))) == 2
+
+
+def test_rewrite_many_fetches_each_url_once(tmp_path, image_server):
+    base, requests = image_server
+    cache = ThumbnailCache(tmp_path, url_prefix="/thumbs/")
+    shared = f"{base}/id/6/800/600"
+    cells = [json.dumps([shared]), json.dumps([shared, f"{base}/id/7/800/600"])]
+    before = len(requests)
+    first, second = (json.loads(cell) for cell in cache.rewrite_many(cells))
+    assert len(requests) - before == 2
+    assert first[0] == second[0]
+    assert second[1]["thumb"].startswith("/thumbs/")
+
+
+def test_unwritable_directory_keeps_original_urls(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = ThumbnailCache(blocker / "thumbs")
+    assert not cache.writable
+    images = json.dumps(["https://example.com/a.jpg"])
+    assert json.loads(cache.rewrite_images(images)) == [
+        {"thumb": "https://example.com/a.jpg", "src": "https://example.com/a.jpg"}
+    ]
+
+
+def test_directory_from_environment(tmp_path, monkeypatch):
+    monkeypatch.setenv("CATALOG_THUMBNAIL_DIR", str(tmp_path / "thumbs"))
+    monkeypatch.setenv("CATALOG_THUMBNAIL_URL", "/thumbs/")
+    cache = ThumbnailCache()
+    assert cache.writable and cache.directory == tmp_path / "thumbs"
+    assert cache.url_prefix == "/thumbs/"
+
+
+def test_fetch_url_caps_download_size(image_server):
+    base, _ = image_server
+    with pytest.raises(ValueError):
+        fetch_url(f"{base}/id/8/800/600", max_bytes=100)
+    assert len(fetch_url(f"{base}/id/8/800/600")) > 100